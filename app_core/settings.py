@@ -329,11 +329,25 @@ DATA_UPLOAD_MAX_NUMBER_FIELDS = 15000
 CRONJOBS = [
     ('0 19 * * *', 'apps.common.utils.cron.generate_and_send_gea_code'),
     ('*/3 * * * *', 'apps.common.utils.cron.warm_gea_app'),
+    # Cola de trabajos: respaldo si no hay un `run_workers` permanente
+    ('* * * * *', 'django.core.management.call_command', ['run_workers'], {'burst': True}),
+    # PDF de OC/OS cacheados sin uso reciente
+    ('30 3 * * *', 'django.core.management.call_command', ['prune_offer_documents']),
+    # Bandeja de salida de correos: respaldo si no hay un `send_outbox` permanente
+    ('* * * * *', 'django.core.management.call_command', ['send_outbox'], {'burst': True}),
+    ('45 3 * * *', 'django.core.management.call_command', ['prune_email_outbox']),
 ]
 
 # ChatGPT API Key
 CHAT_GPT_API_KEY = os.getenv('CHAT_GPT_API_KEY')
 
+# Translation client: openai | fake | noop (default: openai if there is an API key and
+# DEBUG is off; in development set TRANSLATION_BACKEND=fake or openai explicitly)
+TRANSLATION_BACKEND = os.getenv('TRANSLATION_BACKEND') or (
+    'openai' if CHAT_GPT_API_KEY and not DEBUG else 'noop'
+)
+TRANSLATION_TIMEOUT = float(os.getenv('TRANSLATION_TIMEOUT', '20'))
+
 # Block suspicious request settings
 IP_BLOCKED_TIME_IN_MINUTES = int(os.getenv('IP_BLOCKED_TIME_IN_MINUTES'))
 
@@ -1,11 +1,17 @@
 import json
 
 from django.contrib import admin, messages
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from import_export.admin import ImportExportActionModelAdmin
 
-from .models import GeaDailyUniqueCode, IPBlockedModel, WhiteListedIPModel
+from .jobs import requeue
+from .models import (BackgroundJobModel, DeadLetterJobModel, EmailOutboxModel,
+                     GeaDailyUniqueCode, IPBlockedModel, TranslationMemoryModel,
+                     WhiteListedIPModel)
+from .outbox import requeue_emails
+from .translation_memory import translation_memory
 
 
 class GeneralAdminModel(ImportExportActionModelAdmin, admin.ModelAdmin):
@@ -117,3 +123,261 @@ class WhiteListedIPModelAdmin(GeneralAdminModel):
     list_display = ('current_ip', 'reason', 'is_active', 'created', 'updated')
     list_filter = ('is_active', 'reason')
     search_fields = ('current_ip', 'reason')
+
+
+@admin.action(description=_("Requeue selected jobs"))
+def requeue_jobs_action(modeladmin, request, queryset):
+    count = requeue(queryset)
+    messages.success(request, _("%(count)s job(s) requeued.") % {"count": count})
+
+
+@admin.register(BackgroundJobModel)
+class BackgroundJobModelAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "max_attempts",
+                    "run_after", "locked_by", "finished_at", "created")
+    list_filter = ("status", "name")
+    search_fields = ("name", "dedupe_key", "last_error")
+    date_hierarchy = "created"
+    ordering = ("-created",)
+    actions = [requeue_jobs_action]
+    readonly_fields = (
+        "name", "status", "dedupe_key", "attempts", "run_after",
+        "locked_at", "locked_by", "finished_at", "pretty_payload",
+        "pretty_last_error", "created", "updated",
+    )
+    fieldsets = (
+        (
+            _('Job'), {
+                'fields': (
+                    'name',
+                    'status',
+                    'dedupe_key',
+                    'pretty_payload',
+                )
+            }
+        ),
+        (
+            _('Execution'), {
+                'fields': (
+                    'attempts',
+                    'max_attempts',
+                    'run_after',
+                    'locked_at',
+                    'locked_by',
+                    'finished_at',
+                    'pretty_last_error',
+                )
+            }
+        ),
+        (
+            _('Times'), {
+                'fields': (
+                    'created',
+                    'updated',
+                ),
+                'classes': (
+                    'collapse',
+                )
+            }
+        ),
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description=_("Payload"))
+    def pretty_payload(self, obj):
+        return format_html("<pre>{}</pre>", json.dumps(obj.payload, indent=4, ensure_ascii=False))
+
+    @admin.display(description=_("Last error"))
+    def pretty_last_error(self, obj):
+        return format_html("<pre>{}</pre>", obj.last_error or "-")
+
+
+@admin.register(DeadLetterJobModel)
+class DeadLetterJobModelAdmin(BackgroundJobModelAdmin):
+    list_display = ("id", "name", "attempts", "finished_at",
+                    "last_error_summary", "created")
+    list_filter = ("name",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(
+            status=BackgroundJobModel.StatusChoices.DEAD
+        )
+
+    @admin.display(description=_("Last error"))
+    def last_error_summary(self, obj):
+        lines = (obj.last_error or "").strip().splitlines()
+        return lines[-1][:200] if lines else "-"
+
+
+@admin.action(description=_("Requeue selected emails"))
+def requeue_emails_action(modeladmin, request, queryset):
+    count = requeue_emails(queryset)
+    messages.success(request, _("%(count)s email(s) requeued.") % {"count": count})
+
+
+@admin.register(EmailOutboxModel)
+class EmailOutboxModelAdmin(admin.ModelAdmin):
+    list_display = ("id", "subject", "category", "status", "recipient_count",
+                    "size_kb", "attempts", "send_after", "sent_at", "created")
+    list_filter = ("status", "category")
+    search_fields = ("idempotency_key", "subject", "message_id", "last_error")
+    date_hierarchy = "created"
+    ordering = ("-created",)
+    actions = [requeue_emails_action]
+    readonly_fields = (
+        "idempotency_key", "category", "subject", "from_email", "recipients",
+        "message_id", "size", "status", "attempts", "max_attempts", "send_after",
+        "locked_at", "locked_by", "sent_at", "pretty_last_error", "created", "updated",
+    )
+    fieldsets = (
+        (
+            _('Email'), {
+                'fields': (
+                    'subject',
+                    'category',
+                    'from_email',
+                    'recipients',
+                    'message_id',
+                    'size',
+                    'idempotency_key',
+                )
+            }
+        ),
+        (
+            _('Delivery'), {
+                'fields': (
+                    'status',
+                    'attempts',
+                    'max_attempts',
+                    'send_after',
+                    'locked_at',
+                    'locked_by',
+                    'sent_at',
+                    'pretty_last_error',
+                )
+            }
+        ),
+        (
+            _('Times'), {
+                'fields': (
+                    'created',
+                    'updated',
+                ),
+                'classes': (
+                    'collapse',
+                )
+            }
+        ),
+    )
+
+    def get_queryset(self, request):
+        # El MIME completo (con adjuntos) no se carga en el listado
+        return super().get_queryset(request).defer("raw_message")
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description=_("Recipients"))
+    def recipient_count(self, obj):
+        return len(obj.recipients or [])
+
+    @admin.display(description=_("Size (KB)"), ordering="size")
+    def size_kb(self, obj):
+        return f"{obj.size / 1024:.1f}"
+
+    @admin.display(description=_("Last error"))
+    def pretty_last_error(self, obj):
+        return format_html("<pre>{}</pre>", obj.last_error or "-")
+
+
+@admin.action(description=_("Retranslate selected texts on next use"))
+def deactivate_translations_action(modeladmin, request, queryset):
+    # Sin `corrected`: la próxima traducción de la API puede reemplazarla
+    count = queryset.update(is_active=False, corrected=False)
+    translation_memory.clear()
+    messages.success(request, _("%(count)s translation(s) deactivated.") % {"count": count})
+
+
+@admin.register(TranslationMemoryModel)
+class TranslationMemoryModelAdmin(admin.ModelAdmin):
+    list_display = ("short_source", "short_translation", "src_lang", "dst_lang",
+                    "model", "hits", "last_hit_at", "corrected", "is_active")
+    list_filter = ("src_lang", "dst_lang", "model", "corrected", "is_active")
+    search_fields = ("source_text", "translated_text", "source_hash")
+    ordering = ("-hits",)
+    actions = [deactivate_translations_action]
+    readonly_fields = (
+        "src_lang", "dst_lang", "model", "source_hash", "source_text",
+        "hits", "last_hit_at", "created", "updated",
+    )
+    fieldsets = (
+        (
+            _('Translation'), {
+                'fields': (
+                    'source_text',
+                    'translated_text',
+                    'corrected',
+                    'is_active',
+                )
+            }
+        ),
+        (
+            _('Key'), {
+                'fields': (
+                    'src_lang',
+                    'dst_lang',
+                    'model',
+                    'source_hash',
+                )
+            }
+        ),
+        (
+            _('Usage'), {
+                'fields': (
+                    'hits',
+                    'last_hit_at',
+                    'created',
+                    'updated',
+                ),
+                'classes': (
+                    'collapse',
+                )
+            }
+        ),
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        stats = translation_memory.stats()
+        messages.info(
+            request,
+            _("This process: %(memory_hits)s memory hits, %(db_hits)s database hits, "
+              "%(misses)s misses (hit ratio %(hit_ratio)s).") % stats
+        )
+        return super().changelist_view(request, extra_context=extra_context)
+
+    def save_model(self, request, obj, form, change):
+        if "translated_text" in form.changed_data:
+            obj.corrected = True
+        super().save_model(request, obj, form, change)
+        translation_memory.forget(obj.src_lang, obj.dst_lang, obj.source_hash, obj.model)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        translation_memory.forget(obj.src_lang, obj.dst_lang, obj.source_hash, obj.model)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        translation_memory.clear()
+
+    @admin.display(description=_("Source text"), ordering="source_text")
+    def short_source(self, obj):
+        return obj.source_text[:80]
+
+    @admin.display(description=_("Translated text"), ordering="translated_text")
+    def short_translation(self, obj):
+        return obj.translated_text[:80]
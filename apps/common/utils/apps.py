@@ -1,6 +1,20 @@
 from django.apps import AppConfig
 from django.conf import settings
+from django.utils.module_loading import autodiscover_modules
 
 class UtilsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = f'{settings.UTILS_PATH}'
+
+    def ready(self):
+        # Registra los handlers de la cola de trabajos (<app>/jobs.py)
+        autodiscover_modules("jobs")
+
+        # Entrega real de los correos de la bandeja de salida
+        from .outbox import email_sent
+        from .signals import mark_daily_code_sent
+        email_sent.connect(mark_daily_code_sent, dispatch_uid="utils.mark_daily_code_sent")
+
+        # Imágenes inline de los correos: se leen una vez desde staticfiles
+        from .email_assets import email_assets
+        email_assets.load()
@@ -0,0 +1,103 @@
+# apps/common/utils/email_assets.py
+"""
+Registro en memoria de imágenes inline para correos (logos, etc.).
+
+Los archivos se resuelven con los finders de staticfiles una sola vez (al arrancar,
+desde UtilsConfig.ready) y se guardan como bytes + MIMEImage ya construido.
+Las plantillas los referencian con `cid:<nombre>`; `attach_inline` los adjunta
+sin ningún acceso a red.
+
+    email_assets.attach_inline(email, "gea_logo")
+"""
+
+import copy
+import logging
+import mimetypes
+import os
+import threading
+from dataclasses import dataclass
+from email.mime.image import MIMEImage
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+logger = logging.getLogger(__name__)
+
+# cid -> ruta relativa a static (se puede ampliar con settings.EMAIL_INLINE_ASSETS)
+DEFAULT_EMAIL_ASSETS = {
+    "gea_logo": "assets/imgs/logos/gea_logo.webp",
+}
+
+
+@dataclass(frozen=True)
+class EmailAsset:
+    cid: str
+    path: str
+    content: bytes
+    subtype: str
+    part: MIMEImage
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+
+class EmailAssetRegistry:
+    def __init__(self, assets: dict):
+        self._paths = dict(assets)
+        self._assets = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> dict:
+        """Lee y prepara todos los assets registrados. Los faltantes se registran en el log."""
+        with self._lock:
+            assets = {}
+            for cid, path in self._paths.items():
+                found = finders.find(path)
+                if not found:
+                    logger.warning("Email asset '%s' not found in static files: %s", cid, path)
+                    continue
+                with open(found, "rb") as fh:
+                    content = fh.read()
+
+                mime_type = mimetypes.guess_type(path)[0] or "image/png"
+                subtype = mime_type.split("/", 1)[1]
+                part = MIMEImage(content, _subtype=subtype)
+                part.add_header("Content-ID", f"<{cid}>")
+                part.add_header("Content-Disposition", "inline",
+                                filename=os.path.basename(path))
+                assets[cid] = EmailAsset(cid, path, content, subtype, part)
+
+            self._assets = assets
+            self._loaded = True
+            return assets
+
+    def get(self, cid: str):
+        """EmailAsset registrado bajo `cid`, o None si no existe / no se encontró."""
+        if not self._loaded:
+            self.load()
+        return self._assets.get(cid)
+
+    def attach_inline(self, message, *cids) -> list:
+        """
+        Adjunta los assets indicados como partes inline (multipart/related).
+        Devuelve los cids adjuntados; los que falten se omiten (el correo se envía igual).
+        """
+        attached = []
+        for cid in cids:
+            asset = self.get(cid)
+            if asset is None:
+                continue
+            # Copia de la parte precalculada: cada mensaje tiene sus propias cabeceras
+            message.attach(copy.deepcopy(asset.part))
+            attached.append(cid)
+        if attached:
+            message.mixed_subtype = "related"
+        return attached
+
+
+email_assets = EmailAssetRegistry({
+    **DEFAULT_EMAIL_ASSETS,
+    **getattr(settings, "EMAIL_INLINE_ASSETS", {}),
+})
@@ -0,0 +1,217 @@
+# apps/common/utils/email_builder.py
+"""
+Construcción de correos con adjuntos controlados.
+
+    builder = EmailBuilder(subject, "texto", html=html, to=[...], bcc=[...])
+    builder.inline_asset("gea_logo")
+    builder.inline_image("offer_img", image_preview(img_bytes), "preview.jpg")
+    builder.attach("orden.pdf", pdf_bytes, "application/pdf")
+    builder.attach("imagen_full.webp", img_bytes, "image/webp", optional=True)
+    email = builder.build()
+
+- Cada binario se adjunta una sola vez (sha256): si el mismo contenido ya va
+  inline o como adjunto, no se repite.
+- Presupuesto de tamaño por mensaje (EMAIL_MAX_MESSAGE_BYTES): si el correo lo
+  supera se quitan los adjuntos `optional`, de mayor a menor.
+- `builder.report` (y el log) indican el tamaño final y el de cada parte.
+"""
+
+import copy
+import hashlib
+import io
+import logging
+import mimetypes
+from dataclasses import dataclass, field
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.image import MIMEImage
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from PIL import Image, ImageOps
+
+from .email_assets import email_assets
+
+logger = logging.getLogger(__name__)
+
+# Un correo normal (HTML + logo + PDF + vista previa) ronda 1 MB; por encima
+# de esto se quitan los adjuntos opcionales
+DEFAULT_MAX_MESSAGE_BYTES = 2 * 1024 * 1024
+
+EMAIL_PREVIEW_MAX_SIZE = (480, 480)
+EMAIL_PREVIEW_QUALITY = 75
+
+
+def encoded_size(size: int) -> int:
+    """Bytes que ocupa un binario de `size` bytes en base64 (líneas de 76 + CRLF)."""
+    b64 = (size + 2) // 3 * 4
+    return b64 + (b64 // 76) * 2
+
+
+def image_preview(content: bytes, max_size=EMAIL_PREVIEW_MAX_SIZE,
+                  quality=EMAIL_PREVIEW_QUALITY) -> bytes:
+    """JPEG reducido (máx. `max_size`) para mostrar una imagen dentro del HTML del correo."""
+    img = ImageOps.exif_transpose(Image.open(io.BytesIO(content)))
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, "white")
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    img.thumbnail(max_size, Image.Resampling.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=quality, optimize=True)
+    return out.getvalue()
+
+
+@dataclass
+class EmailPart:
+    name: str
+    content: bytes
+    mimetype: str
+    inline: bool = False
+    cid: str = ""
+    optional: bool = False
+    part: MIMEBase = field(default=None, repr=False)
+
+    @property
+    def size(self) -> int:
+        return encoded_size(len(self.content))
+
+    def to_mime(self) -> MIMEBase:
+        if self.part is not None:
+            # Parte precalculada (email_assets): cada mensaje lleva su copia
+            return copy.deepcopy(self.part)
+        maintype, subtype = self.mimetype.split("/", 1)
+        if maintype == "image":
+            part = MIMEImage(self.content, _subtype=subtype)
+        else:
+            part = MIMEBase(maintype, subtype)
+            part.set_payload(self.content)
+            encoders.encode_base64(part)
+        if self.inline:
+            part.add_header("Content-ID", f"<{self.cid}>")
+            part.add_header("Content-Disposition", "inline", filename=self.name)
+        else:
+            part.add_header("Content-Disposition", "attachment", filename=self.name)
+        return part
+
+
+class EmailBuilder:
+    def __init__(self, subject, body, *, html=None, from_email=None, to=None,
+                 cc=None, bcc=None, reply_to=None, max_bytes=None):
+        self.subject = subject
+        self.body = body
+        self.html = html
+        self.from_email = from_email
+        self.to = list(to or [])
+        self.cc = list(cc or [])
+        self.bcc = list(bcc or [])
+        self.reply_to = list(reply_to or [])
+        self.max_bytes = max_bytes or getattr(
+            settings, "EMAIL_MAX_MESSAGE_BYTES", DEFAULT_MAX_MESSAGE_BYTES
+        )
+        self.parts = []
+        self.report = {}
+        self._digests = {}
+
+    def _add(self, part: EmailPart):
+        """Agrega la parte si su contenido no está ya en el mensaje. Devuelve la parte que lo lleva."""
+        digest = hashlib.sha256(part.content).hexdigest()
+        existing = self._digests.get(digest)
+        if existing is not None:
+            return existing
+        self._digests[digest] = part
+        self.parts.append(part)
+        return part
+
+    def inline_image(self, cid: str, content: bytes, filename: str, mimetype: str = None):
+        """
+        Imagen inline referenciada en el HTML como `cid:<cid>`. Devuelve el cid con
+        el que quedó (si el mismo contenido ya iba inline, el de esa parte) o None.
+        """
+        if not content:
+            return None
+        mimetype = mimetype or mimetypes.guess_type(filename)[0] or "image/jpeg"
+        part = self._add(EmailPart(filename, content, mimetype, inline=True, cid=cid))
+        return part.cid or None
+
+    def inline_asset(self, cid: str):
+        """Imagen del registro email_assets (logos...). Devuelve el cid o None si no existe."""
+        asset = email_assets.get(cid)
+        if asset is None:
+            return None
+        self._add(EmailPart(asset.filename, asset.content, f"image/{asset.subtype}",
+                            inline=True, cid=cid, part=asset.part))
+        return cid
+
+    def attach(self, filename: str, content: bytes, mimetype: str = None, *,
+               optional: bool = False) -> bool:
+        """
+        Adjunto normal. `optional`: se puede quitar si el mensaje supera el presupuesto.
+        Devuelve False si el mismo contenido ya estaba en el mensaje.
+        """
+        if not content:
+            return False
+        mimetype = mimetype or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        part = EmailPart(filename, content, mimetype, optional=optional)
+        return self._add(part) is part
+
+    def _base_size(self) -> int:
+        size = len(str(self.subject or "")) + len((self.body or "").encode())
+        if self.html:
+            size += len(self.html.encode())
+        return size + 2048  # cabeceras y separadores MIME
+
+    def _apply_budget(self) -> list:
+        total = self._base_size() + sum(part.size for part in self.parts)
+        dropped = []
+        for part in sorted((p for p in self.parts if p.optional), key=lambda p: p.size, reverse=True):
+            if total <= self.max_bytes:
+                break
+            self.parts.remove(part)
+            total -= part.size
+            dropped.append(part.name)
+        return dropped
+
+    def build(self) -> EmailMultiAlternatives:
+        dropped = self._apply_budget()
+
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.to,
+            cc=self.cc,
+            bcc=self.bcc,
+            reply_to=self.reply_to,
+        )
+        if self.html:
+            message.attach_alternative(self.html, "text/html")
+        if any(part.inline for part in self.parts):
+            message.mixed_subtype = "related"  # HTML + imágenes inline
+        for part in self.parts:
+            message.attach(part.to_mime())
+
+        total = len(message.message().as_bytes())
+        self.report = {
+            "subject": str(self.subject),
+            "total": total,
+            "budget": self.max_bytes,
+            "parts": [
+                {"name": p.name, "inline": p.inline, "bytes": len(p.content), "encoded": p.size}
+                for p in self.parts
+            ],
+            "dropped": dropped,
+        }
+        if dropped:
+            logger.warning("Email '%s' over budget: dropped %s", self.subject, ", ".join(dropped))
+        if total > self.max_bytes:
+            logger.error("Email '%s' is %s bytes, over the %s bytes budget", self.subject, total, self.max_bytes)
+        logger.info(
+            "Email '%s': %.1f KB (%s)", self.subject, total / 1024,
+            ", ".join(f"{p.name} {p.size / 1024:.1f} KB" for p in self.parts) or "no attachments",
+        )
+        return message
@@ -1,36 +1,65 @@
+import json
 import logging
 import re
-from typing import Literal, Optional
+from typing import Optional
 
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from openai import APIConnectionError, OpenAI, OpenAIError, RateLimitError
 
-logger = logging.getLogger(__name__)
+from ..translation_clients import Language
+from ..translation_memory import TranslationMemory, translation_memory
 
-Language = Literal["es", "en"]
+logger = logging.getLogger(__name__)
 
 
 class ChatGPTAPI:
     """
     Encapsula el cliente de OpenAI y provee un método translate()
     que rellena el campo vacío con traducción.
+
+    Las traducciones pasan por la memoria de traducción (LRU del proceso + BD):
+    solo los textos que no están en ella llegan a la API.
+
+    No se instancia directamente: `translation_clients.get_translator()` crea uno
+    por proceso (su cliente HTTP reutiliza las conexiones entre llamadas).
     """
+    enabled = True
 
-    def __init__(self, model: Optional[str] = "gpt-4o-mini", timeout: Optional[int] = None):
+    def __init__(
+        self,
+        model: Optional[str] = "gpt-4o-mini",
+        timeout: Optional[int] = None,
+        memory: Optional[TranslationMemory] = None,
+    ):
         self.api_key = settings.CHAT_GPT_API_KEY
         if not self.api_key:
             raise ValueError(_("CHAT_GPT_API_KEY not configured"))
 
         self.model = model
 
-        self.timeout = timeout or 20
+        # Presupuesto por llamada; los reintentos del SDK van dentro del trabajo que traduce
+        self.timeout = timeout or getattr(settings, "TRANSLATION_TIMEOUT", 20)
+
+        self.client = OpenAI(
+            api_key=self.api_key,
+            timeout=self.timeout,
+            max_retries=getattr(settings, "TRANSLATION_MAX_RETRIES", 0),
+        )
 
-        self.client = OpenAI(api_key=self.api_key)
+        self.memory = memory if memory is not None else translation_memory
+
+    def close(self):
+        self.client.close()
 
     def _sanitize(self, s: str) -> str:
         return re.sub(r"\s+", " ", (s or "").strip())
 
+    def _clean(self, out: str) -> str:
+        # limpieza por si el modelo añade prefijos
+        out = (out or "").strip()
+        return re.sub(r"^\s*(translated\s*[:\-–]\s*)", "", out, flags=re.I)
+
     def translate(
         self,
         text: str,
@@ -48,9 +77,6 @@ class ChatGPTAPI:
         Traduce un texto de src → dst usando el Responses API.
         Solo devuelve el texto traducido (sin extras).
         """
-        if settings.DEBUG:
-            return src
-
         if not text:
             return ""
 
@@ -58,6 +84,10 @@ class ChatGPTAPI:
         if max_chars:
             text = text[:max_chars]
 
+        cached = self.memory.get(src, dst, text, self.model)
+        if cached is not None:
+            return cached
+
         try:
             resp = self.client.responses.create(
                 model=self.model,
@@ -80,9 +110,8 @@ class ChatGPTAPI:
                 ],
                 timeout=self.timeout,
             )
-            out = (resp.output_text or "").strip()
-            # limpieza por si el modelo añade prefijos
-            out = re.sub(r"^\s*(translated\s*[:\-–]\s*)", "", out, flags=re.I)
+            out = self._clean(resp.output_text)
+            self.memory.set(src, dst, text, self.model, out)
             return out
         except (APIConnectionError, RateLimitError) as e:
             logger.warning("OpenAI temporary error: %s", e)
@@ -93,3 +122,109 @@ class ChatGPTAPI:
         except Exception as e:
             logger.exception("Unexpected error in translation")
             return ""
+
+    def translate_batch(
+        self,
+        items: dict,
+        *,
+        system_hint: str = (
+            "You are a professional, concise translator. Keep meaning and tone. "
+            "You receive a JSON list of fields, each with an id, a source language, "
+            "a target language and a text. Translate each text independently and return "
+            'ONLY a JSON object of the form {"translations": {"<id>": "<translated text>"}}, '
+            "with one entry per id. "
+            "Remember that the context is about historical assets, such as German bonds, "
+            "gold objects, high-denomination banknotes, among others."
+        ),
+    ) -> dict:
+        """
+        Traduce varios campos de una misma instancia en una sola petición.
+
+        `items`: {clave: TranslationItem(texto, src, dst, max_chars)}. Devuelve
+        {clave: traducción} ("" si no se pudo traducir, como translate()).
+
+        Los textos que ya están en la memoria de traducción no se envían. Si la
+        respuesta no trae un campo (o no es JSON válido) ese campo se traduce
+        por separado con translate().
+        """
+        if len(items) < 2:
+            return {
+                key: self.translate(item.text, item.src, item.dst, max_chars=item.max_chars)
+                for key, item in items.items()
+            }
+
+        results, pending = {}, {}
+        for key, item in items.items():
+            text = self._sanitize(item.text)
+            if item.max_chars:
+                text = text[:item.max_chars]
+            if not text:
+                results[key] = ""
+                continue
+            cached = self.memory.get(item.src, item.dst, text, self.model)
+            if cached is not None:
+                results[key] = cached
+                continue
+            pending[str(key)] = (key, item._replace(text=text))
+
+        if len(pending) == 1:
+            (key, item), = pending.values()
+            results[key] = self.translate(item.text, item.src, item.dst)
+            return results
+        if not pending:
+            return results
+
+        payload = [
+            {"id": field_id, "source_language": item.src, "target_language": item.dst, "text": item.text}
+            for field_id, (_key, item) in pending.items()
+        ]
+        try:
+            resp = self.client.responses.create(
+                model=self.model,
+                instructions=system_hint,
+                input=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "input_text", "text": json.dumps(payload, ensure_ascii=False)}
+                        ],
+                    }
+                ],
+                text={"format": {"type": "json_object"}},
+                timeout=self.timeout,
+            )
+            translations = self._parse_batch(resp.output_text)
+        except (APIConnectionError, RateLimitError) as e:
+            logger.warning("OpenAI temporary error: %s", e)
+            return {**results, **{key: "" for key, _item in pending.values()}}
+        except OpenAIError as e:
+            logger.error("OpenAI error: %s", e)
+            return {**results, **{key: "" for key, _item in pending.values()}}
+        except Exception:
+            logger.exception("Unexpected error in batch translation")
+            translations = {}
+
+        for field_id, (key, item) in pending.items():
+            out = translations.get(field_id)
+            out = self._clean(out) if isinstance(out, str) else ""
+            if out:
+                self.memory.set(item.src, item.dst, item.text, self.model, out)
+                results[key] = out
+            else:
+                logger.warning("Batch translation missing field %s; translating it alone", field_id)
+                results[key] = self.translate(item.text, item.src, item.dst)
+        return results
+
+    def _parse_batch(self, output: str) -> dict:
+        """{"translations": {...}} de la respuesta; {} si no es JSON válido."""
+        output = (output or "").strip()
+        # por si el modelo envuelve el JSON en un bloque ```json
+        output = re.sub(r"^```(?:json)?\s*|\s*```$", "", output)
+        try:
+            data = json.loads(output)
+        except ValueError:
+            logger.warning("Malformed batch translation response: %.200s", output)
+            return {}
+        if isinstance(data, dict) and isinstance(data.get("translations"), dict):
+            return data["translations"]
+        return data if isinstance(data, dict) else {}
@@ -0,0 +1,237 @@
+# apps/common/utils/images.py
+"""
+Versiones (renditions) de las imágenes subidas, generadas en segundo plano.
+
+El modelo dueño declara su campo de imagen, un `processing_state` y un modelo
+concreto de ImageRenditionModel con FK a él (related_name="renditions"):
+
+    IMAGE_FIELD = "offer_img"
+    IMAGE_RENDITION_BUILDERS = {"print": build_offer_print_image}  # opcional
+
+- La imagen subida se guarda tal cual (sin procesar en la petición).
+- pre_save (`mark_image_pending`): si la imagen cambió, processing_state=PENDING.
+- post_save (`queue_image_processing`): encola PROCESS_IMAGE_JOB al confirmar.
+- El worker genera RENDITIONS (miniatura, tarjeta, completa 1600px e impresión),
+  guarda cada una con sus dimensiones y tamaño y deja processing_state=READY
+  (también actualiza `updated`, que invalida los fragmentos cacheados).
+- La UI usa `rendition_url()` / el filtro `|rendition`, que devuelve la versión
+  pedida de la imagen actual o, si aún no existe, la original.
+"""
+
+import io
+import logging
+import os
+from typing import NamedTuple
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .jobs import enqueue, job
+from .models import ImageProcessingState
+from .signals import fields_changed
+
+logger = logging.getLogger(__name__)
+
+PROCESS_IMAGE_JOB = "utils.process_image"
+
+
+class RenditionSpec(NamedTuple):
+    max_size: tuple
+    format: str
+    quality: int
+
+
+# De menor a mayor
+RENDITIONS = {
+    "thumb": RenditionSpec((240, 240), "WEBP", 80),
+    "card": RenditionSpec((640, 640), "WEBP", 82),
+    "full": RenditionSpec((1600, 1600), "WEBP", 85),
+    "print": RenditionSpec((2400, 2400), "JPEG", 90),
+}
+
+EXTENSIONS = {"WEBP": ".webp", "JPEG": ".jpg", "PNG": ".png"}
+
+
+def render(img: Image.Image, spec: RenditionSpec) -> bytes:
+    """Reduce `img` (ya orientada por EXIF) a `spec.max_size` y la codifica."""
+    img = img.copy()
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    if spec.format == "JPEG" and has_alpha:
+        # JPEG no tiene transparencia: se aplana sobre blanco
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, "white")
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    elif img.mode not in ("RGB", "RGBA") or (spec.format == "JPEG" and img.mode != "RGB"):
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+    img.thumbnail(spec.max_size, Image.Resampling.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, format=spec.format, quality=spec.quality, optimize=True)
+    return out.getvalue()
+
+
+def build_renditions(Model, content: bytes) -> dict:
+    """
+    {nombre: (bytes, extensión)} con todas las versiones de `content`.
+    IMAGE_RENDITION_BUILDERS del modelo reemplaza la de un nombre: recibe un
+    archivo y devuelve bytes en el formato de su RenditionSpec (o None).
+    """
+    builders = getattr(Model, "IMAGE_RENDITION_BUILDERS", {})
+    img = ImageOps.exif_transpose(Image.open(io.BytesIO(content)))
+    img.load()
+
+    built = {}
+    for name, spec in RENDITIONS.items():
+        if name in builders:
+            data = builders[name](io.BytesIO(content))
+        else:
+            data = render(img, spec)
+        if data:
+            built[name] = (data, EXTENSIONS[spec.format])
+    return built
+
+
+def _matching(instance, name: str):
+    """Versión `name` de la imagen actual (usa las renditions precargadas si las hay)."""
+    field_name = getattr(instance, "IMAGE_FIELD", None)
+    if field_name is None:
+        return None
+    f = getattr(instance, field_name, None)
+    if not f or not f.name:
+        return None
+    for rendition in instance.renditions.all():
+        if rendition.rendition == name and rendition.source_name == f.name:
+            return rendition
+    return None
+
+
+def rendition_file(instance, name: str):
+    """FieldFile de la versión `name` o None (aún no generada / sin imagen)."""
+    rendition = _matching(instance, name)
+    return rendition.file if rendition is not None else None
+
+
+def rendition_url(instance, name: str) -> str:
+    """URL de la versión `name`; si no existe, la de la imagen original ("" si no hay)."""
+    if instance is None:
+        return ""
+    rendition = _matching(instance, name)
+    if rendition is not None:
+        return rendition.file.url
+    f = getattr(instance, instance.IMAGE_FIELD, None)
+    return f.url if f else ""
+
+
+# ---------------- Señales ----------------
+def mark_image_pending(sender, instance, **kwargs):
+    """pre_save: la imagen cambió -> hay que generar sus versiones."""
+    if not fields_changed(instance, kwargs, sender.IMAGE_FIELD):
+        return
+    f = getattr(instance, sender.IMAGE_FIELD, None)
+    instance.processing_state = ImageProcessingState.PENDING if f else ImageProcessingState.NONE
+
+
+def queue_image_processing(sender, instance, **kwargs):
+    """post_save: encola el procesamiento de las imágenes pendientes."""
+    if instance.processing_state != ImageProcessingState.PENDING:
+        return
+
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "processing_state" not in update_fields:
+        # save(update_fields=...) no incluye el estado: se persiste aparte
+        sender.objects.filter(pk=instance.pk).update(processing_state=ImageProcessingState.PENDING)
+
+    label = sender._meta.label_lower
+    enqueue(
+        PROCESS_IMAGE_JOB,
+        {"model": label, "pk": str(instance.pk)},
+        dedupe_key=f"image:{label}:{instance.pk}",
+    )
+
+
+def _delete_files(storage, names):
+    for name in names:
+        try:
+            if storage.exists(name):
+                storage.delete(name)
+        except Exception as e:
+            logger.error(f"Error deleting image rendition '{name}': {e}")
+
+
+def delete_rendition_file(sender, instance, **kwargs):
+    """
+    post_delete de las renditions: elimina el archivo del storage al confirmar
+    la transacción (si se revierte, la fila vuelve y su archivo sigue ahí).
+    """
+    f = instance.file
+    if f and f.name:
+        storage, name = f.storage, f.name
+        transaction.on_commit(lambda: _delete_files(storage, [name]))
+
+
+# ---------------- Worker ----------------
+@job(PROCESS_IMAGE_JOB)
+def process_image(model, pk):
+    """Genera las versiones de la imagen actual de la fila y deja processing_state=READY."""
+    Model = apps.get_model(model)
+    instance = Model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+
+    f = getattr(instance, Model.IMAGE_FIELD, None)
+    if not f:
+        with transaction.atomic():
+            instance.renditions.all().delete()
+            Model.objects.filter(pk=pk).update(processing_state=ImageProcessingState.NONE, updated=timezone.now())
+        return
+
+    source_name = f.name
+    Model.objects.filter(pk=pk).update(processing_state=ImageProcessingState.PROCESSING)
+    try:
+        with f.open("rb") as fh:
+            built = build_renditions(Model, fh.read())
+    except Exception:
+        Model.objects.filter(pk=pk).update(processing_state=ImageProcessingState.FAILED)
+        raise
+
+    base_name = os.path.splitext(os.path.basename(source_name))[0]
+    written = []
+    try:
+        with transaction.atomic():
+            current = Model.objects.select_for_update().get(pk=pk)
+            if getattr(current, Model.IMAGE_FIELD).name != source_name:
+                # La imagen se reemplazó mientras se procesaba: se reintenta con la nueva
+                raise RuntimeError(f"Image of {model} #{pk} changed while processing.")
+
+            # Versiones anteriores (otra imagen o un procesamiento previo): se reemplazan;
+            # sus archivos se borran al confirmar (delete_rendition_file)
+            current.renditions.all().delete()
+            for name, (data, ext) in built.items():
+                with Image.open(io.BytesIO(data)) as img:
+                    width, height = img.size
+                rendition = current.renditions.create(
+                    rendition=name,
+                    file=ContentFile(data, name=f"{base_name}_{name}{ext}"),
+                    source_name=source_name,
+                    width=width,
+                    height=height,
+                    size=len(data),
+                )
+                written.append((rendition.file.storage, rendition.file.name))
+
+            # `updated` cambia: los fragmentos cacheados (su clave lo incluye) pasan a usar las versiones
+            Model.objects.filter(pk=pk).update(processing_state=ImageProcessingState.READY, updated=timezone.now())
+    except Exception:
+        # Se revirtieron las filas nuevas: sus archivos ya escritos sobran
+        for storage, name in written:
+            _delete_files(storage, [name])
+        raise
+
+    logger.info(
+        "Image renditions for %s #%s: %s", model, pk,
+        ", ".join(f"{name} {len(data) / 1024:.1f} KB" for name, (data, _ext) in built.items()),
+    )
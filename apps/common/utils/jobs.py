@@ -0,0 +1,176 @@
+# apps/common/utils/jobs.py
+"""
+Cola de trabajos en segundo plano sobre la base de datos (sin Redis/Celery).
+
+- `@job("app.nombre")` registra un handler; recibe el payload como kwargs.
+- `enqueue("app.nombre", {...})` crea el trabajo al confirmar la transacción.
+- `manage.py run_workers` reclama trabajos con un UPDATE condicional (compare-and-set),
+  así varios workers/procesos pueden convivir sin SELECT ... FOR UPDATE SKIP LOCKED.
+- Los fallos se reintentan con backoff exponencial; al agotar `max_attempts`
+  el trabajo pasa a dead letter (visible en el admin).
+
+Los módulos `jobs.py` de cada app se importan en UtilsConfig.ready().
+"""
+
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import BackgroundJobModel
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+Status = BackgroundJobModel.StatusChoices
+
+
+def _setting(name, default):
+    return getattr(settings, f"BACKGROUND_JOBS_{name}", default)
+
+
+def job(name: str):
+    """Registra la función decorada como handler del trabajo `name`."""
+    def decorator(func):
+        if name in _registry and _registry[name] is not func:
+            raise ValueError(f"Background job '{name}' is already registered.")
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_job_handler(name: str):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"Unknown background job '{name}'.") from None
+
+
+def registered_jobs() -> list:
+    return sorted(_registry)
+
+
+def enqueue(name: str, payload: dict = None, *, delay: timedelta = None,
+            max_attempts: int = None, dedupe_key: str = ""):
+    """
+    Encola el trabajo `name` cuando la transacción actual se confirme
+    (o de inmediato si no hay transacción abierta).
+
+    `dedupe_key`: si ya existe un trabajo pendiente o en curso con la misma clave, no se duplica.
+    """
+    get_job_handler(name)  # falla pronto si el nombre no existe
+    payload = payload or {}
+
+    def _create():
+        if dedupe_key and BackgroundJobModel.objects.filter(
+            dedupe_key=dedupe_key,
+            status__in=[Status.PENDING, Status.RUNNING],
+        ).exists():
+            logger.info("Job %s skipped: %s already queued", name, dedupe_key)
+            return
+        BackgroundJobModel.objects.create(
+            name=name,
+            payload=payload,
+            dedupe_key=dedupe_key,
+            run_after=timezone.now() + (delay or timedelta()),
+            max_attempts=max_attempts or _setting("MAX_ATTEMPTS", 5),
+        )
+
+    transaction.on_commit(_create)
+
+
+def backoff(attempts: int) -> timedelta:
+    """Espera antes del reintento `attempts` (1, 2, ...): exponencial con tope y jitter del 10%."""
+    base = _setting("BACKOFF_BASE_SECONDS", 30)
+    cap = _setting("BACKOFF_MAX_SECONDS", 3600)
+    seconds = min(cap, base * (2 ** max(attempts - 1, 0)))
+    return timedelta(seconds=seconds * random.uniform(0.9, 1.1))
+
+
+def _claimable(now) -> Q:
+    stale_before = now - timedelta(seconds=_setting("STALE_AFTER_SECONDS", 900))
+    # RUNNING con lock viejo: el worker murió a mitad del trabajo
+    return (
+        Q(status=Status.PENDING, run_after__lte=now) |
+        Q(status=Status.RUNNING, locked_at__lt=stale_before)
+    )
+
+
+def claim_next(worker_id: str, *, batch: int = 10):
+    """
+    Reclama el siguiente trabajo disponible para `worker_id` o devuelve None.
+    Cada candidato se toma con un UPDATE condicional: si otro worker ganó, se prueba el siguiente.
+    """
+    now = timezone.now()
+    candidates = list(
+        BackgroundJobModel.objects
+        .filter(_claimable(now))
+        .order_by("run_after", "pk")
+        .values_list("pk", flat=True)[:batch]
+    )
+    for pk in candidates:
+        claimed = (
+            BackgroundJobModel.objects
+            .filter(_claimable(now), pk=pk)
+            .update(
+                status=Status.RUNNING,
+                locked_at=now,
+                locked_by=worker_id,
+                attempts=F("attempts") + 1,
+                updated=now,
+            )
+        )
+        if claimed:
+            return BackgroundJobModel.objects.get(pk=pk)
+    return None
+
+
+def run_job(job_obj: BackgroundJobModel) -> bool:
+    """
+    Ejecuta un trabajo ya reclamado y registra el resultado.
+    Devuelve True si terminó bien.
+    """
+    try:
+        handler = get_job_handler(job_obj.name)
+        handler(**(job_obj.payload or {}))
+    except Exception as exc:
+        now = timezone.now()
+        error = "".join(traceback.format_exception(exc))[-10000:]
+        if isinstance(exc, LookupError) or job_obj.attempts >= job_obj.max_attempts:
+            values = {"status": Status.DEAD, "finished_at": now}
+            logger.exception("Job %s #%s moved to dead letter", job_obj.name, job_obj.pk)
+        else:
+            values = {"status": Status.PENDING, "run_after": now + backoff(job_obj.attempts)}
+            logger.warning("Job %s #%s failed (attempt %s/%s): %s",
+                           job_obj.name, job_obj.pk, job_obj.attempts, job_obj.max_attempts, exc)
+        _finish(job_obj, last_error=error, **values)
+        return False
+
+    _finish(job_obj, status=Status.DONE, finished_at=timezone.now(), last_error="")
+    return True
+
+
+def _finish(job_obj, **values):
+    # Solo si el lock sigue siendo nuestro (un trabajo "stale" pudo ser reclamado por otro)
+    BackgroundJobModel.objects.filter(
+        pk=job_obj.pk, status=Status.RUNNING, locked_by=job_obj.locked_by,
+    ).update(locked_at=None, updated=timezone.now(), **values)
+
+
+def requeue(queryset) -> int:
+    """Devuelve a la cola los trabajos indicados (p.ej. desde dead letter), con intentos a cero."""
+    return queryset.exclude(status=Status.RUNNING).update(
+        status=Status.PENDING,
+        attempts=0,
+        run_after=timezone.now(),
+        finished_at=None,
+        locked_at=None,
+        locked_by="",
+        updated=timezone.now(),
+    )
@@ -0,0 +1,259 @@
+# apps/common/utils/management/commands/backfill_translations.py
+import json
+import logging
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.common.utils.translation import missing_translations, translate_missing
+from apps.common.utils.translation_clients import get_translator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT = Path(tempfile.gettempdir()) / "backfill_translations.checkpoint.json"
+
+DEFAULT_MODELS = (
+    "assets.AssetCategoryModel",
+    "assets.AssetsNamesModel",
+    "assets.AssetModel",
+    "buyers.OfferModel",
+)
+
+
+class TokenBucket:
+    """Limita a `rate` peticiones por segundo con ráfagas de hasta `capacity` (hilos seguros)."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _empty(field_name) -> Q:
+    return Q(**{f"{field_name}__isnull": True}) | Q(**{field_name: ""})
+
+
+def one_sided(Model) -> Q:
+    """Filas con algún par es_/en_ que tiene un solo idioma."""
+    query = Q()
+    for base in Model.TRANSLATABLE_FIELDS:
+        es_empty, en_empty = _empty(f"es_{base}"), _empty(f"en_{base}")
+        query |= (~es_empty & en_empty) | (es_empty & ~en_empty)
+    return query
+
+
+class Command(BaseCommand):
+    help = (
+        "Completa el idioma que falta (es/en) en las filas existentes de categorías, "
+        "nombres de activos, activos y ofertas. Traduce con concurrencia limitada y un "
+        "límite de peticiones por minuto, escribe con bulk_update (sin señales) y guarda "
+        "un punto de control para continuar donde quedó. Las filas que fallan quedan "
+        "detrás del punto de control: se reintentan solo con --restart."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--models",
+            nargs="+",
+            default=list(DEFAULT_MODELS),
+            help="Modelos a completar, como app_label.Modelo (default: todos).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Traducciones simultáneas (default: 4).",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=60,
+            help="Máximo de peticiones a la API por minuto (default: 60).",
+        )
+        parser.add_argument(
+            "--burst",
+            type=int,
+            default=5,
+            help="Peticiones que se pueden hacer seguidas antes de aplicar --rate (default: 5).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Filas por lote; el punto de control se guarda tras cada lote (default: 100).",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=0,
+            help="Máximo de filas por modelo en esta ejecución (default: sin límite).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=str(DEFAULT_CHECKPOINT),
+            help=f"Archivo del punto de control (default: {DEFAULT_CHECKPOINT}).",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignora el punto de control y empieza desde el principio (reintenta las filas que fallaron).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo cuenta las filas pendientes, sin traducir.",
+        )
+
+    # ---------------- Punto de control ----------------
+    def _load_checkpoint(self, path: Path, restart: bool) -> dict:
+        if restart or not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as e:
+            raise CommandError(f"Invalid checkpoint file {path}: {e}")
+
+    def _save_checkpoint(self, path: Path, checkpoint: dict):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(checkpoint, indent=2), encoding="utf-8")
+        tmp.replace(path)
+
+    # ---------------- Traducción ----------------
+    def _translate(self, bucket, instance):
+        bucket.acquire()
+        try:
+            return instance, translate_missing(instance)
+        except Exception:
+            logger.exception("Backfill translation of %s #%s failed", instance._meta.label, instance.pk)
+            return instance, {}
+        finally:
+            # Cada hilo del pool abre su propia conexión (memoria de traducción)
+            connections.close_all()
+
+    def _write(self, Model, fields, results) -> int:
+        """Guarda las traducciones si el origen no cambió y el destino sigue vacío."""
+        with transaction.atomic():
+            current = (
+                Model.objects.select_for_update()
+                .only("pk", "translation_pending", *fields)
+                .in_bulk([instance.pk for instance, _translations in results])
+            )
+            # `updated` a mano: bulk_update no aplica auto_now y es parte de la clave
+            # de los fragmentos cacheados de las órdenes
+            now = timezone.now()
+            changed, update_fields = [], {"translation_pending", "updated"}
+            for instance, translations in results:
+                row = current.get(instance.pk)
+                if row is None:
+                    continue
+                touched = False
+                for dst_field, (src_field, source, translated) in translations.items():
+                    if translated and getattr(row, src_field) == source and not getattr(row, dst_field):
+                        setattr(row, dst_field, translated)
+                        update_fields.add(dst_field)
+                        touched = True
+                if touched:
+                    row.translation_pending = bool(missing_translations(row))
+                    row.updated = now
+                    changed.append(row)
+            if changed:
+                # bulk_update: sin pre_save/post_save (no vuelve a encolar traducciones)
+                Model.objects.bulk_update(changed, sorted(update_fields))
+        return len(changed)
+
+    def _backfill(self, Model, options, checkpoint, checkpoint_path, bucket, pool):
+        label = Model._meta.label
+        fields = [f"{lang}_{base}" for base in Model.TRANSLATABLE_FIELDS for lang in ("es", "en")]
+        queryset = Model.objects.filter(one_sided(Model)).order_by("pk")
+        if checkpoint.get(label):
+            queryset = queryset.filter(pk__gt=checkpoint[label])
+
+        if options["dry_run"]:
+            self.stdout.write(f"{label}: {queryset.count()} row(s) to translate.")
+            return {"rows": 0, "updated": 0, "failed": 0}
+
+        totals = {"rows": 0, "updated": 0, "failed": 0}
+        limit = options["limit"]
+        while not limit or totals["rows"] < limit:
+            size = options["batch_size"] if not limit else min(options["batch_size"], limit - totals["rows"])
+            chunk = list(queryset.only("pk", *fields)[:size])
+            if not chunk:
+                break
+
+            results = list(pool.map(lambda instance: self._translate(bucket, instance), chunk))
+            updated = self._write(Model, fields, results)
+            failed = sum(
+                1 for _instance, translations in results
+                if not translations or not all(t for _src, _source, t in translations.values())
+            )
+
+            totals["rows"] += len(chunk)
+            totals["updated"] += updated
+            totals["failed"] += failed
+
+            checkpoint[label] = str(chunk[-1].pk)
+            self._save_checkpoint(checkpoint_path, checkpoint)
+            queryset = queryset.filter(pk__gt=chunk[-1].pk)
+            self.stdout.write(
+                f"{label}: {totals['rows']} row(s) processed, {totals['updated']} updated, "
+                f"{totals['failed']} failed."
+            )
+        return totals
+
+    def handle(self, *args, **options):
+        try:
+            models = [apps.get_model(label) for label in options["models"]]
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+        for Model in models:
+            if not hasattr(Model, "TRANSLATABLE_FIELDS"):
+                raise CommandError(f"{Model._meta.label} has no TRANSLATABLE_FIELDS.")
+
+        if not options["dry_run"] and not get_translator().enabled:
+            raise CommandError("The translation backend is disabled (TRANSLATION_BACKEND=noop).")
+
+        checkpoint_path = Path(options["checkpoint"])
+        checkpoint = self._load_checkpoint(checkpoint_path, options["restart"])
+        rate = max(options["rate"], 1) / 60
+        bucket = TokenBucket(rate, max(options["burst"], 1))
+        concurrency = max(1, options["concurrency"])
+
+        totals = {"rows": 0, "updated": 0, "failed": 0}
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="backfill") as pool:
+            for Model in models:
+                result = self._backfill(Model, options, checkpoint, checkpoint_path, bucket, pool)
+                for key in totals:
+                    totals[key] += result[key]
+
+        if options["dry_run"]:
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfill finished: {totals['rows']} row(s) processed, {totals['updated']} updated, "
+            f"{totals['failed']} failed."
+        ))
+        if totals["failed"]:
+            self.stdout.write(self.style.WARNING(
+                "Rows that failed are behind the checkpoint; run again with --restart to retry them."
+            ))
@@ -0,0 +1,302 @@
+# apps/common/utils/management/commands/benchmark_email.py
+import io
+import json
+import math
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import RequestFactory, override_settings
+from django.test.utils import setup_databases, teardown_databases
+from django.utils import timezone
+from PIL import Image
+
+from apps.common.utils.images import build_renditions
+from apps.common.utils.models import GeaDailyUniqueCode, ImageProcessingState
+from apps.common.utils.outbox import claim_batch, send_batch
+from apps.common.utils.smtp_sink import SMTPSink
+
+FLOWS = ("purchase_order", "service_order", "otp", "password_reset", "daily_code")
+
+
+def _percentile(values, pct):
+    """Percentil con interpolación lineal (values ya ordenados)."""
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * pct / 100
+    low, high = math.floor(k), math.ceil(k)
+    return values[low] + (values[high] - values[low]) * (k - low)
+
+
+def _summary_ms(samples):
+    values = sorted(s * 1000 for s in samples)
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 3) if values else 0.0,
+        "p50": round(_percentile(values, 50), 3),
+        "p95": round(_percentile(values, 95), 3),
+        "p99": round(_percentile(values, 99), 3),
+        "max": round(values[-1], 3) if values else 0.0,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide los flujos de correo salientes (OC, OS, OTP, restablecer contraseña, "
+        "código diario) contra un servidor SMTP local, sobre una base de datos de "
+        "prueba temporal con datos sembrados. Imprime el resultado en JSON: latencia "
+        "de encolado (p50/p95/p99), mensajes por segundo en la entrega y bytes por mensaje."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Correos por flujo (default: 20).",
+        )
+        parser.add_argument(
+            "--flows",
+            nargs="+",
+            choices=FLOWS,
+            default=list(FLOWS),
+            help="Flujos a medir (default: todos).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Correos por conexión SMTP en la entrega (default: 50).",
+        )
+        parser.add_argument(
+            "--smtp-latency-ms",
+            type=float,
+            default=0,
+            help="Espera simulada del servidor SMTP por mensaje (default: 0).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Archivo donde escribir el JSON (default: stdout).",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Conserva la base de datos de prueba entre ejecuciones.",
+        )
+
+    # ---------------- Datos sembrados ----------------
+    def _seed(self, iterations):
+        from apps.project.common.users.models import UserModel
+        from apps.project.specific.assets_management.assets.models import (
+            AssetCategoryModel, AssetModel, AssetsNamesModel)
+        from apps.project.specific.assets_management.assets_location.models import \
+            AssetCountryModel
+        from apps.project.specific.assets_management.buyers.models import (
+            OfferImageRendition, OfferModel, ServiceOrderRecipient)
+
+        suffix = uuid.uuid4().hex[:8]
+
+        def _user(name, **extra):
+            # save() (no bulk_create): el modelo calcula los hashes de los campos cifrados
+            user = UserModel(
+                username=f"{name}-{suffix}", email=f"{name}-{suffix}@example.com",
+                first_name="Bench", last_name=name.title(), **extra,
+            )
+            user.save()
+            return user
+
+        buyer = _user("buyer", user_type=UserModel.UserTypeChoices.BUYER)
+        recipients = [_user(f"so{i}") for i in range(3)]
+        reset_users = [_user(f"reset{i}") for i in range(iterations)]
+
+        country = AssetCountryModel.objects.create(es_country_name="Colombia", en_country_name="Colombia")
+        category = AssetCategoryModel.objects.create(es_name="Bench", en_name="Bench")
+        asset = AssetModel.objects.create(
+            asset_name=AssetsNamesModel.objects.create(es_name=f"Bench {suffix}", en_name=f"Bench {suffix}"),
+            category=category,
+        )
+
+        # Una imagen de 1600x1200 compartida por todas las órdenes (con sus versiones)
+        image = io.BytesIO()
+        Image.effect_noise((1600, 1200), 32).convert("RGB").save(image, "JPEG", quality=90)
+        template = OfferModel(asset=asset, created_by=buyer)
+        template.offer_img.save("bench.jpg", ContentFile(image.getvalue()), save=False)
+        renditions = []
+        for name, (data, ext) in build_renditions(OfferModel, image.getvalue()).items():
+            rendition = OfferImageRendition(rendition=name, source_name=template.offer_img.name, size=len(data))
+            with Image.open(io.BytesIO(data)) as img:
+                rendition.width, rendition.height = img.size
+            rendition.file.save(f"bench_{name}{ext}", ContentFile(data), save=False)
+            renditions.append(rendition)
+
+        # bulk_create: sin señales (traducción, procesamiento de imagen)
+        offers = OfferModel.objects.bulk_create([
+            OfferModel(
+                asset=asset,
+                created_by=buyer,
+                buyer_country=country,
+                offer_quantity=10 + i,
+                es_description="Descripción de prueba",
+                en_description="Benchmark description",
+                es_observation="Observación de prueba",
+                en_observation="Benchmark observation",
+                offer_img=template.offer_img.name,
+                processing_state=ImageProcessingState.READY,
+            )
+            for i in range(iterations)
+        ])
+        OfferImageRendition.objects.bulk_create([
+            OfferImageRendition(
+                offer=offer, rendition=r.rendition, file=r.file.name, source_name=r.source_name,
+                width=r.width, height=r.height, size=r.size,
+            )
+            for offer in offers for r in renditions
+        ])
+        ServiceOrderRecipient.objects.bulk_create([
+            ServiceOrderRecipient(offer=offer, user=user, added_by=buyer)
+            for offer in offers for user in recipients
+        ])
+        return {"buyer": buyer, "offers": offers, "reset_users": reset_users}
+
+    # ---------------- Flujos ----------------
+    def _producers(self, fixtures):
+        from apps.project.common.account.views import ForgotPasswordFormView
+        from apps.project.specific.assets_management.buyers.jobs import \
+            send_service_order_notification
+        from apps.project.specific.assets_management.buyers.views import \
+            PurchaseOrderCreateView
+        from apps.project.specific.documents.certificates.functions import \
+            generate_otp
+        from apps.project.specific.documents.certificates.utils import \
+            send_otp_email
+
+        buyer = fixtures["buyer"]
+        offers = fixtures["offers"]
+
+        def _request():
+            request = RequestFactory().post("/", HTTP_HOST="localhost")
+            request.user = buyer
+            request.LANGUAGE_CODE = "es"
+            return request
+
+        def purchase_order(i):
+            view = PurchaseOrderCreateView()
+            view.request = _request()
+            view.send_email_notification({}, offers[i])
+
+        def service_order(i):
+            send_service_order_notification(
+                str(offers[i].pk), str(buyer.pk), "http://localhost/",
+                notification_id=uuid.uuid4().hex,
+            )
+
+        def otp(i):
+            send_otp_email(f"otp{i}@example.com", generate_otp())
+
+        def password_reset(i):
+            ForgotPasswordFormView()._send_password_reset_email(_request(), fixtures["reset_users"][i])
+
+        def daily_code(i):
+            # BD temporal: se borra el código de hoy para generar y enviar uno nuevo
+            GeaDailyUniqueCode.objects.filter(valid_on=timezone.localdate()).delete()
+            GeaDailyUniqueCode.send_today(kind=GeaDailyUniqueCode.KindChoices.GENERAL)
+
+        return {
+            "purchase_order": purchase_order,
+            "service_order": service_order,
+            "otp": otp,
+            "password_reset": password_reset,
+            "daily_code": daily_code,
+        }
+
+    def _run_flow(self, name, producer, iterations, sink, batch_size):
+        # Encolado: lo que paga la petición / el trabajo
+        enqueue = []
+        for i in range(iterations):
+            start = time.perf_counter()
+            producer(i)
+            enqueue.append(time.perf_counter() - start)
+
+        # Entrega: send_outbox contra el servidor local
+        before = sink.stats()
+        outbox = {"sent": 0, "failed": 0}
+        start = time.perf_counter()
+        while True:
+            batch = claim_batch(f"benchmark:{name}", size=batch_size)
+            if not batch:
+                break
+            result = send_batch(batch)
+            outbox["sent"] += result["sent"]
+            outbox["failed"] += result["failed"]
+        elapsed = time.perf_counter() - start
+        after = sink.stats()
+
+        messages = after["messages"] - before["messages"]
+        wire_bytes = after["bytes"] - before["bytes"]
+        return {
+            "iterations": iterations,
+            "enqueue_ms": _summary_ms(enqueue),
+            "delivery": {
+                "messages": messages,
+                "failed": outbox["failed"],
+                "connections": after["connections"] - before["connections"],
+                "seconds": round(elapsed, 4),
+                "messages_per_second": round(messages / elapsed, 2) if elapsed else 0.0,
+            },
+            "bytes_per_message": {
+                "mean": round(wire_bytes / messages) if messages else 0,
+                "total": wire_bytes,
+            },
+        }
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        log = sys.stderr  # stdout queda solo para el JSON
+
+        with tempfile.TemporaryDirectory() as media_root, \
+                SMTPSink(latency=options["smtp_latency_ms"] / 1000) as sink, \
+                override_settings(
+                    DEBUG=False,
+                    MEDIA_ROOT=media_root,
+                    EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+                    EMAIL_HOST=sink.host,
+                    EMAIL_PORT=sink.port,
+                    EMAIL_HOST_USER="",
+                    EMAIL_HOST_PASSWORD="",
+                    EMAIL_USE_TLS=False,
+                    EMAIL_USE_SSL=False,
+                ):
+            log.write("Creating the benchmark database...\n")
+            old_config = setup_databases(verbosity=0, interactive=False, keepdb=options["keepdb"])
+            try:
+                fixtures = self._seed(iterations)
+                producers = self._producers(fixtures)
+                results = {}
+                for name in options["flows"]:
+                    log.write(f"  {name}...\n")
+                    results[name] = self._run_flow(
+                        name, producers[name], iterations, sink, options["batch_size"]
+                    )
+            finally:
+                teardown_databases(old_config, verbosity=0, keepdb=options["keepdb"])
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "config": {
+                "iterations": iterations,
+                "batch_size": options["batch_size"],
+                "smtp_latency_ms": options["smtp_latency_ms"],
+            },
+            "flows": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(output + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Benchmark written to {options['output']}."))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,75 @@
+# apps/common/utils/management/commands/build_image_renditions.py
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.common.utils.images import PROCESS_IMAGE_JOB, process_image
+from apps.common.utils.jobs import enqueue
+from apps.common.utils.models import ImageProcessingState
+
+DEFAULT_MODELS = (
+    "assets.AssetModel",
+    "buyers.OfferModel",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera las versiones (miniatura, tarjeta, completa, impresión) de las imágenes "
+        "que aún no las tienen, encolando el trabajo de procesamiento de cada fila. "
+        "Con --all las regenera para todas; con --inline las procesa en este proceso."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--models",
+            nargs="+",
+            default=list(DEFAULT_MODELS),
+            help="Modelos a procesar, como app_label.Modelo (default: todos).",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenera también las que ya están listas.",
+        )
+        parser.add_argument(
+            "--inline",
+            action="store_true",
+            help="Procesa aquí en lugar de encolar (sin run_workers).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            models = [apps.get_model(label) for label in options["models"]]
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+
+        queued = built = failed = 0
+        for Model in models:
+            if not hasattr(Model, "IMAGE_FIELD"):
+                raise CommandError(f"{Model._meta.label} has no IMAGE_FIELD.")
+
+            field = Model.IMAGE_FIELD
+            rows = Model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+            if not options["all"]:
+                rows = rows.exclude(processing_state=ImageProcessingState.READY)
+
+            label = Model._meta.label_lower
+            for pk in rows.values_list("pk", flat=True).iterator(chunk_size=500):
+                if not options["inline"]:
+                    Model.objects.filter(pk=pk).update(processing_state=ImageProcessingState.PENDING)
+                    enqueue(PROCESS_IMAGE_JOB, {"model": label, "pk": str(pk)},
+                            dedupe_key=f"image:{label}:{pk}")
+                    queued += 1
+                    continue
+                try:
+                    process_image(model=label, pk=str(pk))
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{label} {pk}: {e}")
+                    continue
+                built += 1
+
+        if options["inline"]:
+            self.stdout.write(self.style.SUCCESS(f"Image renditions built: {built}, failed: {failed}."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Image processing jobs queued: {queued}."))
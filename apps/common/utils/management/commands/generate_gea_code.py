@@ -15,11 +15,11 @@ class Command(BaseCommand):
         
         self.stdout.write(
             self.style.SUCCESS(
-                f"GEA code for BUYER {obj_buyer.valid_on}: {obj_buyer.code} sent to {obj_buyer.sent_to}"
+                f"GEA code for BUYER {obj_buyer.valid_on}: {obj_buyer.code} queued for delivery"
             )
         )
         self.stdout.write(
             self.style.SUCCESS(
-                f"GEA code for GENERAL {obj.valid_on}: {obj.code} sent to {obj.sent_to}"
+                f"GEA code for GENERAL {obj.valid_on}: {obj.code} queued for delivery"
             )
         )
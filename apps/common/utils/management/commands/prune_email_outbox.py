@@ -0,0 +1,30 @@
+# apps/common/utils/management/commands/prune_email_outbox.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.common.utils.outbox import prune_email_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Elimina de la bandeja de salida los correos enviados hace más de N días "
+        "(default: settings.EMAIL_OUTBOX_KEEP_DAYS, 30)."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Antigüedad máxima (días desde el envío).",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        deleted = prune_email_outbox(
+            timedelta(days=days) if days is not None else None
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent emails pruned: {deleted} deleted."
+        ))
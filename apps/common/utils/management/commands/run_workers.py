@@ -0,0 +1,88 @@
+# apps/common/utils/management/commands/run_workers.py
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections, connection
+
+from apps.common.utils.jobs import claim_next, registered_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta los trabajos en segundo plano encolados en la base de datos. "
+        "Con --burst procesa lo pendiente y termina (útil desde cron)."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Número de hilos worker (default: 1).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Segundos de espera cuando la cola está vacía (default: 2).",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Termina cuando no quedan trabajos disponibles.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        poll_interval = max(0.1, options["poll_interval"])
+        burst = options["burst"]
+
+        stop = threading.Event()
+        counters = {"done": 0, "failed": 0}
+        lock = threading.Lock()
+
+        def _stop(signum, frame):
+            self.stdout.write("Stopping workers after the current jobs...")
+            stop.set()
+
+        signal.signal(signal.SIGINT, _stop)
+        signal.signal(signal.SIGTERM, _stop)
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+        def _worker(index):
+            worker_id = f"{prefix}:{index}"
+            try:
+                while not stop.is_set():
+                    close_old_connections()
+                    job_obj = claim_next(worker_id)
+                    if job_obj is None:
+                        if burst:
+                            break
+                        stop.wait(poll_interval)
+                        continue
+                    ok = run_job(job_obj)
+                    with lock:
+                        counters["done" if ok else "failed"] += 1
+            finally:
+                connection.close()
+
+        self.stdout.write(
+            f"Starting {concurrency} worker(s) for: {', '.join(registered_jobs()) or '-'}"
+        )
+        threads = [
+            threading.Thread(target=_worker, args=(i,), name=f"job-worker-{i}", daemon=True)
+            for i in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Workers stopped. Done: {counters['done']}, failed: {counters['failed']}."
+        ))
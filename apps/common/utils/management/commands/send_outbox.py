@@ -0,0 +1,68 @@
+# apps/common/utils/management/commands/send_outbox.py
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from apps.common.utils.outbox import claim_batch, send_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Envía los correos de la bandeja de salida (EmailOutboxModel), un lote por "
+        "conexión SMTP. Con --burst envía lo pendiente y termina (útil desde cron)."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Correos por lote / conexión SMTP (default: EMAIL_OUTBOX_BATCH_SIZE o 50).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Segundos de espera cuando la bandeja está vacía (default: 2).",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Termina cuando no quedan correos disponibles.",
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = max(0.1, options["poll_interval"])
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:outbox"
+
+        stop = threading.Event()
+        totals = {"sent": 0, "failed": 0}
+
+        def _stop(signum, frame):
+            self.stdout.write("Stopping after the current batch...")
+            stop.set()
+
+        signal.signal(signal.SIGINT, _stop)
+        signal.signal(signal.SIGTERM, _stop)
+
+        while not stop.is_set():
+            close_old_connections()
+            batch = claim_batch(worker_id, size=options["batch_size"])
+            if not batch:
+                if options["burst"]:
+                    break
+                stop.wait(poll_interval)
+                continue
+
+            result = send_batch(batch)
+            for key in totals:
+                totals[key] += result[key]
+            self.stdout.write(f"  Batch of {len(batch)}: sent {result['sent']}, failed {result['failed']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox stopped. Sent: {totals['sent']}, failed: {totals['failed']}."
+        ))
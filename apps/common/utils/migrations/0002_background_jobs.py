@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:49
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundJobModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(blank=True, choices=[('es', 'Spanish'), ('en', 'English')], default='es', max_length=4, null=True, verbose_name='language')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='updated')),
+                ('is_active', models.BooleanField(default=True, verbose_name='is active')),
+                ('default_order', models.PositiveIntegerField(blank=True, default=1, null=True, verbose_name='priority')),
+                ('name', models.CharField(db_index=True, max_length=120, verbose_name='job name')),
+                ('payload', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='payload')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('dead', 'Dead letter')], default='pending', max_length=10, verbose_name='status')),
+                ('dedupe_key', models.CharField(blank=True, db_index=True, default='', max_length=190, verbose_name='deduplication key')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='attempts')),
+                ('max_attempts', models.PositiveIntegerField(default=5, verbose_name='max attempts')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='run after')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='locked at')),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100, verbose_name='locked by')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='finished at')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='last error')),
+            ],
+            options={
+                'verbose_name': 'Background job',
+                'verbose_name_plural': 'Background jobs',
+                'db_table': 'apps_common_utils_backgroundjob',
+                'ordering': ['run_after'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DeadLetterJobModel',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'Dead letter job',
+                'verbose_name_plural': 'Dead letter jobs',
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('utils.backgroundjobmodel',),
+        ),
+    ]
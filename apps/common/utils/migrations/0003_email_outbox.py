@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0002_background_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutboxModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(blank=True, choices=[('es', 'Spanish'), ('en', 'English')], default='es', max_length=4, null=True, verbose_name='language')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='updated')),
+                ('is_active', models.BooleanField(default=True, verbose_name='is active')),
+                ('default_order', models.PositiveIntegerField(blank=True, default=1, null=True, verbose_name='priority')),
+                ('idempotency_key', models.CharField(max_length=190, unique=True, verbose_name='idempotency key')),
+                ('category', models.CharField(blank=True, db_index=True, default='', max_length=100, verbose_name='category')),
+                ('subject', models.CharField(blank=True, default='', max_length=255, verbose_name='subject')),
+                ('from_email', models.CharField(max_length=254, verbose_name='from email')),
+                ('recipients', models.JSONField(blank=True, default=list, verbose_name='recipients')),
+                ('message_id', models.CharField(blank=True, default='', max_length=255, verbose_name='message id')),
+                ('raw_message', models.BinaryField(verbose_name='raw message')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='size (bytes)')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='status')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='attempts')),
+                ('max_attempts', models.PositiveIntegerField(default=8, verbose_name='max attempts')),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='send after')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='locked at')),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100, verbose_name='locked by')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='sent at')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='last error')),
+            ],
+            options={
+                'verbose_name': 'Outgoing email',
+                'verbose_name_plural': 'Email outbox',
+                'db_table': 'apps_common_utils_emailoutbox',
+                'ordering': ['send_after'],
+                'indexes': [models.Index(fields=['status', 'send_after'], name='outbox_status_send_after_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utils', '0003_email_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationMemoryModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(blank=True, choices=[('es', 'Spanish'), ('en', 'English')], default='es', max_length=4, null=True, verbose_name='language')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='updated')),
+                ('is_active', models.BooleanField(default=True, verbose_name='is active')),
+                ('default_order', models.PositiveIntegerField(blank=True, default=1, null=True, verbose_name='priority')),
+                ('src_lang', models.CharField(max_length=5, verbose_name='source language')),
+                ('dst_lang', models.CharField(max_length=5, verbose_name='target language')),
+                ('source_hash', models.CharField(max_length=64, verbose_name='source hash')),
+                ('model', models.CharField(max_length=100, verbose_name='model')),
+                ('source_text', models.TextField(verbose_name='source text')),
+                ('translated_text', models.TextField(verbose_name='translated text')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='hits')),
+                ('last_hit_at', models.DateTimeField(blank=True, null=True, verbose_name='last hit at')),
+                ('corrected', models.BooleanField(default=False, help_text='Translation reviewed or edited by hand.', verbose_name='corrected')),
+            ],
+            options={
+                'verbose_name': 'Cached translation',
+                'verbose_name_plural': 'Translation memory',
+                'db_table': 'apps_common_utils_translationmemory',
+                'ordering': ['-hits'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='translationmemorymodel',
+            constraint=models.UniqueConstraint(fields=('src_lang', 'dst_lang', 'source_hash', 'model'), name='translation_memory_key_uniq'),
+        ),
+    ]
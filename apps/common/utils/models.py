@@ -1,7 +1,11 @@
+
 from auditlog.models import AuditlogHistoryField
 from django.conf import settings
+from django.core.files import File
 from django.core.mail import EmailMultiAlternatives
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models, transaction
+from django.db.models.fields.files import FieldFile
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.utils.translation import gettext_lazy as _
@@ -58,6 +62,96 @@ class TimeStampedModel(models.Model):
         abstract = True
         ordering = ['default_order']
 
+    # -------- Seguimiento de cambios (dirty fields) --------
+    # Valores cargados desde la BD (por attname) para saber qué cambió sin volver a consultar.
+    # Los campos binarios y JSON no se copian (MIME de la bandeja de salida, payloads de
+    # trabajos...): para ellos has_changed() responde siempre que sí.
+    UNTRACKED_FIELD_TYPES = (models.BinaryField, models.JSONField)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_loaded_values()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_loaded_values(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot_loaded_values(fields)
+
+    @staticmethod
+    def _tracked_value(field, value):
+        if isinstance(field, models.FileField):
+            if isinstance(value, FieldFile) and value._committed:
+                value = value.name
+            elif isinstance(value, File):
+                return object()  # archivo nuevo aún sin guardar: siempre distinto
+            return value or None  # "" y None: sin archivo
+        return value
+
+    def _snapshot_loaded_values(self, update_fields=None):
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        if update_fields is None:
+            loaded.clear()
+        concrete = self._meta.concrete_fields
+        if update_fields is not None:
+            names = set(update_fields)
+            concrete = [f for f in concrete if f.name in names or f.attname in names]
+        for field in concrete:
+            if isinstance(field, self.UNTRACKED_FIELD_TYPES):
+                continue
+            if field.attname in self.__dict__:  # los campos diferidos no se tocan
+                loaded[field.attname] = self._tracked_value(field, self.__dict__[field.attname])
+
+    def is_tracking_changes(self) -> bool:
+        """True si la instancia viene de la BD (o ya se guardó) y tiene valores de referencia."""
+        return not self._state.adding and bool(self.__dict__.get("_loaded_values"))
+
+    def get_loaded_value(self, field_name, default=None):
+        """Valor (attname) que tenía el campo al cargarse/guardarse por última vez."""
+        attname = self._meta.get_field(field_name).attname
+        return self.__dict__.get("_loaded_values", {}).get(attname, default)
+
+    def get_loaded_state(self, *field_names):
+        """{attname: valor cargado} para los campos pedidos, o None si alguno no se cargó."""
+        if not self.is_tracking_changes():
+            return None
+        loaded = self.__dict__["_loaded_values"]
+        attnames = [self._meta.get_field(name).attname for name in field_names]
+        if any(attname not in loaded for attname in attnames):
+            return None
+        return {attname: loaded[attname] for attname in attnames}
+
+    def has_changed(self, *field_names) -> bool:
+        """
+        ¿Alguno de los campos cambió desde que se cargó? Sin consultas a la BD.
+        En instancias nuevas o sin valores de referencia se asume que sí.
+        """
+        if not self.is_tracking_changes():
+            return True
+        loaded = self.__dict__["_loaded_values"]
+        for name in field_names:
+            field = self._meta.get_field(name)
+            attname = field.attname
+            if attname not in self.__dict__:
+                continue  # diferido y nunca asignado: no cambió
+            if attname not in loaded:
+                return True
+            if self._tracked_value(field, self.__dict__[attname]) != loaded[attname]:
+                return True
+        return False
+
+    @property
+    def changed_fields(self) -> set:
+        """Nombres de los campos concretos que cambiaron desde la carga."""
+        return {
+            field.name for field in self._meta.concrete_fields
+            if self.has_changed(field.name)
+        }
+
 
 class GeaDailyUniqueCodeManager(models.Manager):
     def today(self, *, kind: str):
@@ -149,6 +243,10 @@ class GeaDailyUniqueCode(TimeStampedModel):
     def __str__(self):
         return f"{self.valid_on} [{self.get_kind_display()}] -> {self.code}"
 
+    @property
+    def email_idempotency_key(self) -> str:
+        return f"gea-daily-code:{self.kind}:{self.valid_on}:{self.code}"
+
     def mark_sent(self, to_list, message_id=None):
         self.sent_to = list(to_list or [])
         self.sent_at = timezone.now()
@@ -164,7 +262,7 @@ class GeaDailyUniqueCode(TimeStampedModel):
     @classmethod
     def send_today(cls, *, kind: str):
         """
-        Crea (si no existe) y envía el código de hoy al grupo definido según el kind.
+        Crea (si no existe) y encola el correo del código de hoy al grupo definido según el kind.
         """
         obj, _created = cls.objects.get_or_create_for_today(kind=kind)
 
@@ -198,9 +296,14 @@ class GeaDailyUniqueCode(TimeStampedModel):
 
         msg.attach_alternative(html_body, "text/html")
 
-        message_id = msg.send()
-
-        obj.mark_sent(recipients, message_id=str(message_id))
+        # Se entrega desde la bandeja de salida; un cron repetido el mismo día no duplica el correo.
+        # sent_at se registra al entregarlo (signals.mark_daily_code_sent), no al encolarlo
+        from .outbox import queue_email
+        queue_email(
+            msg,
+            idempotency_key=obj.email_idempotency_key,
+            category="utils.daily_code",
+        )
         return obj
 
 
@@ -252,6 +355,356 @@ class WhiteListedIPModel(TimeStampedModel):
         verbose_name_plural = 'WhiteListed IPs'
 
 
+class BackgroundJobModel(TimeStampedModel):
+    """
+    Trabajo en segundo plano persistido en la base de datos.
+    Se encola con `apps.common.utils.jobs.enqueue` y lo ejecuta `manage.py run_workers`.
+    """
+    class StatusChoices(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        RUNNING = "running", _("Running")
+        DONE = "done", _("Done")
+        DEAD = "dead", _("Dead letter")
+
+    name = models.CharField(
+        _("job name"),
+        max_length=120,
+        db_index=True
+    )
+
+    payload = models.JSONField(
+        _("payload"),
+        default=dict,
+        blank=True,
+        encoder=DjangoJSONEncoder
+    )
+
+    status = models.CharField(
+        _("status"),
+        max_length=10,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING
+    )
+
+    dedupe_key = models.CharField(
+        _("deduplication key"),
+        max_length=190,
+        blank=True,
+        default="",
+        db_index=True
+    )
+
+    attempts = models.PositiveIntegerField(
+        _("attempts"),
+        default=0
+    )
+
+    max_attempts = models.PositiveIntegerField(
+        _("max attempts"),
+        default=5
+    )
+
+    run_after = models.DateTimeField(
+        _("run after"),
+        default=timezone.now
+    )
+
+    locked_at = models.DateTimeField(
+        _("locked at"),
+        blank=True,
+        null=True
+    )
+
+    locked_by = models.CharField(
+        _("locked by"),
+        max_length=100,
+        blank=True,
+        default=""
+    )
+
+    finished_at = models.DateTimeField(
+        _("finished at"),
+        blank=True,
+        null=True
+    )
+
+    last_error = models.TextField(
+        _("last error"),
+        blank=True,
+        default=""
+    )
+
+    def __str__(self):
+        return f"{self.name} [{self.get_status_display()}] #{self.pk}"
+
+    class Meta:
+        db_table = "apps_common_utils_backgroundjob"
+        verbose_name = _("Background job")
+        verbose_name_plural = _("Background jobs")
+        ordering = ["run_after"]
+        indexes = [
+            models.Index(fields=["status", "run_after"],
+                         name="job_status_run_after_idx"),
+        ]
+
+
+class DeadLetterJobModel(BackgroundJobModel):
+    """Vista de los trabajos que agotaron sus reintentos (status=dead)."""
+
+    class Meta:
+        proxy = True
+        verbose_name = _("Dead letter job")
+        verbose_name_plural = _("Dead letter jobs")
+
+
+class EmailOutboxModel(TimeStampedModel):
+    """
+    Correo pendiente de envío. Se guarda ya serializado (MIME completo) con
+    `apps.common.utils.outbox.queue_email` y lo entrega `manage.py send_outbox`.
+    """
+    class StatusChoices(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENDING = "sending", _("Sending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    idempotency_key = models.CharField(
+        _("idempotency key"),
+        max_length=190,
+        unique=True
+    )
+
+    category = models.CharField(
+        _("category"),
+        max_length=100,
+        blank=True,
+        default="",
+        db_index=True
+    )
+
+    subject = models.CharField(
+        _("subject"),
+        max_length=255,
+        blank=True,
+        default=""
+    )
+
+    from_email = models.CharField(
+        _("from email"),
+        max_length=254
+    )
+
+    recipients = models.JSONField(
+        _("recipients"),
+        default=list,
+        blank=True
+    )
+
+    message_id = models.CharField(
+        _("message id"),
+        max_length=255,
+        blank=True,
+        default=""
+    )
+
+    raw_message = models.BinaryField(
+        _("raw message")
+    )
+
+    size = models.PositiveIntegerField(
+        _("size (bytes)"),
+        default=0
+    )
+
+    status = models.CharField(
+        _("status"),
+        max_length=10,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING
+    )
+
+    attempts = models.PositiveIntegerField(
+        _("attempts"),
+        default=0
+    )
+
+    max_attempts = models.PositiveIntegerField(
+        _("max attempts"),
+        default=8
+    )
+
+    send_after = models.DateTimeField(
+        _("send after"),
+        default=timezone.now
+    )
+
+    locked_at = models.DateTimeField(
+        _("locked at"),
+        blank=True,
+        null=True
+    )
+
+    locked_by = models.CharField(
+        _("locked by"),
+        max_length=100,
+        blank=True,
+        default=""
+    )
+
+    sent_at = models.DateTimeField(
+        _("sent at"),
+        blank=True,
+        null=True
+    )
+
+    last_error = models.TextField(
+        _("last error"),
+        blank=True,
+        default=""
+    )
+
+    def __str__(self):
+        return f"{self.subject} [{self.get_status_display()}] #{self.pk}"
+
+    class Meta:
+        db_table = "apps_common_utils_emailoutbox"
+        verbose_name = _("Outgoing email")
+        verbose_name_plural = _("Email outbox")
+        ordering = ["send_after"]
+        indexes = [
+            models.Index(fields=["status", "send_after"],
+                         name="outbox_status_send_after_idx"),
+        ]
+
+
+class TranslationMemoryModel(TimeStampedModel):
+    """
+    Memoria de traducción de ChatGPTAPI.translate: una fila por
+    (idioma origen, idioma destino, sha256 del texto normalizado, modelo).
+    Ver `apps.common.utils.translation_memory`.
+    """
+    src_lang = models.CharField(
+        _("source language"),
+        max_length=5
+    )
+
+    dst_lang = models.CharField(
+        _("target language"),
+        max_length=5
+    )
+
+    source_hash = models.CharField(
+        _("source hash"),
+        max_length=64
+    )
+
+    model = models.CharField(
+        _("model"),
+        max_length=100
+    )
+
+    source_text = models.TextField(
+        _("source text")
+    )
+
+    translated_text = models.TextField(
+        _("translated text")
+    )
+
+    hits = models.PositiveIntegerField(
+        _("hits"),
+        default=0
+    )
+
+    last_hit_at = models.DateTimeField(
+        _("last hit at"),
+        blank=True,
+        null=True
+    )
+
+    corrected = models.BooleanField(
+        _("corrected"),
+        default=False,
+        help_text=_("Translation reviewed or edited by hand.")
+    )
+
+    def __str__(self):
+        return f"{self.src_lang}→{self.dst_lang}: {self.source_text[:60]}"
+
+    class Meta:
+        db_table = "apps_common_utils_translationmemory"
+        verbose_name = _("Cached translation")
+        verbose_name_plural = _("Translation memory")
+        ordering = ["-hits"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["src_lang", "dst_lang", "source_hash", "model"],
+                name="translation_memory_key_uniq",
+            ),
+        ]
+
+
+class ImageProcessingState(models.TextChoices):
+    """Estado de las versiones (renditions) de la imagen de un modelo."""
+    NONE = "none", _("No image")
+    PENDING = "pending", _("Pending")
+    PROCESSING = "processing", _("Processing")
+    READY = "ready", _("Ready")
+    FAILED = "failed", _("Failed")
+
+
+def rendition_upload_path(instance, filename):
+    return f"renditions/{instance._meta.model_name}/{timezone.now():%Y/%m}/{filename}"
+
+
+class ImageRenditionModel(TimeStampedModel):
+    """
+    Versión reducida de la imagen de un modelo (ver `apps.common.utils.images`).
+    Cada app define el modelo concreto con la FK al dueño (related_name="renditions").
+    """
+    class RenditionChoices(models.TextChoices):
+        THUMB = "thumb", _("Thumbnail")
+        CARD = "card", _("Card")
+        FULL = "full", _("Full")
+        PRINT = "print", _("Print")
+
+    rendition = models.CharField(
+        _("rendition"),
+        max_length=10,
+        choices=RenditionChoices.choices
+    )
+
+    file = models.ImageField(
+        _("file"),
+        max_length=255,
+        upload_to=rendition_upload_path
+    )
+
+    # Nombre del archivo original del que salió (si no coincide, la versión es vieja)
+    source_name = models.CharField(
+        _("source name"),
+        max_length=255
+    )
+
+    width = models.PositiveIntegerField(
+        _("width")
+    )
+
+    height = models.PositiveIntegerField(
+        _("height")
+    )
+
+    size = models.PositiveIntegerField(
+        _("size (bytes)")
+    )
+
+    def __str__(self):
+        return f"{self.get_rendition_display()} {self.width}x{self.height}"
+
+    class Meta:
+        abstract = True
+
+
 auditlog.register(
     IPBlockedModel,
     serialize_data=True
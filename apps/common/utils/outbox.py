@@ -0,0 +1,234 @@
+# apps/common/utils/outbox.py
+"""
+Bandeja de salida de correos (transactional outbox).
+
+Las vistas no hablan con el servidor SMTP: el mensaje se serializa (MIME completo,
+con adjuntos) y se guarda en EmailOutboxModel al confirmar la transacción.
+
+    queue_email(email, idempotency_key=f"po-created:{offer.pk}", category="buyers.purchase_order")
+
+- `idempotency_key`: un mismo correo lógico se guarda una sola vez (reintentos de
+  trabajos, dobles envíos del formulario, cron repetido...).
+- `manage.py send_outbox` reclama lotes con un UPDATE condicional (como la cola de
+  trabajos) y los entrega por una sola conexión SMTP por lote.
+- Errores temporales (conexión, 4xx) se reintentan con backoff exponencial; los
+  permanentes (5xx) o al agotar `max_attempts` el correo queda en FAILED (admin).
+- `manage.py prune_email_outbox` borra los enviados hace más de EMAIL_OUTBOX_KEEP_DAYS.
+- `email_sent` (señal, sender=EmailOutboxModel, outbox=...) se emite tras entregar
+  cada correo: para registrar la entrega real, no el encolado.
+"""
+
+import logging
+import smtplib
+import traceback
+from datetime import timedelta
+from email import message_from_bytes
+from email.message import Message
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.message import MIMEMixin
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .jobs import backoff
+from .models import EmailOutboxModel
+
+logger = logging.getLogger(__name__)
+
+Status = EmailOutboxModel.StatusChoices
+
+email_sent = Signal()
+
+
+def _setting(name, default):
+    return getattr(settings, f"EMAIL_OUTBOX_{name}", default)
+
+
+# ---------------- Serialización ----------------
+class StoredMIMEMessage(MIMEMixin, Message):
+    """Mensaje MIME leído de la base de datos; se vuelve a generar byte a byte."""
+
+
+class OutboxEmailMessage(EmailMessage):
+    """
+    EmailMessage que entrega un MIME ya serializado (los backends de Django solo
+    necesitan from_email, recipients() y message()).
+    """
+
+    def __init__(self, outbox: EmailOutboxModel):
+        super().__init__(
+            subject=outbox.subject,
+            from_email=outbox.from_email,
+            to=list(outbox.recipients or []),
+        )
+        self.outbox = outbox
+
+    def message(self):
+        return message_from_bytes(bytes(self.outbox.raw_message), _class=StoredMIMEMessage)
+
+
+def queue_email(message: EmailMessage, *, idempotency_key: str, category: str = "",
+                delay: timedelta = None, max_attempts: int = None) -> str:
+    """
+    Guarda `message` en la bandeja de salida cuando la transacción actual se confirme
+    (o de inmediato si no hay transacción abierta). Devuelve su Message-ID.
+
+    Si ya existe un correo con la misma `idempotency_key` no se guarda de nuevo.
+    """
+    mime = message.message()
+    raw = mime.as_bytes(linesep="\n")
+    values = {
+        "category": category,
+        "subject": str(message.subject or "")[:255],
+        "from_email": message.from_email or settings.DEFAULT_FROM_EMAIL or "",
+        "recipients": list(message.recipients()),
+        "message_id": mime["Message-ID"] or "",
+        "raw_message": raw,
+        "size": len(raw),
+        "send_after": timezone.now() + (delay or timedelta()),
+        "max_attempts": max_attempts or _setting("MAX_ATTEMPTS", 8),
+    }
+
+    def _create():
+        if EmailOutboxModel.objects.filter(idempotency_key=idempotency_key).exists():
+            logger.info("Email %s skipped: already in the outbox", idempotency_key)
+            return
+        try:
+            with transaction.atomic():
+                EmailOutboxModel.objects.create(idempotency_key=idempotency_key, **values)
+        except IntegrityError:
+            # Otro proceso guardó el mismo correo a la vez
+            if not EmailOutboxModel.objects.filter(idempotency_key=idempotency_key).exists():
+                raise
+            logger.info("Email %s skipped: already in the outbox", idempotency_key)
+
+    transaction.on_commit(_create)
+    return values["message_id"]
+
+
+# ---------------- Envío ----------------
+def _claimable(now) -> Q:
+    stale_before = now - timedelta(seconds=_setting("STALE_AFTER_SECONDS", 600))
+    # SENDING con lock viejo: el proceso murió a mitad del lote
+    return (
+        Q(status=Status.PENDING, send_after__lte=now) |
+        Q(status=Status.SENDING, locked_at__lt=stale_before)
+    )
+
+
+def claim_batch(worker_id: str, *, size: int = None) -> list:
+    """Reclama hasta `size` correos listos para enviar (UPDATE condicional) y los devuelve."""
+    now = timezone.now()
+    candidates = list(
+        EmailOutboxModel.objects
+        .filter(_claimable(now))
+        .order_by("send_after", "pk")
+        .values_list("pk", flat=True)[:size or _setting("BATCH_SIZE", 50)]
+    )
+    if not candidates:
+        return []
+
+    EmailOutboxModel.objects.filter(_claimable(now), pk__in=candidates).update(
+        status=Status.SENDING,
+        locked_at=now,
+        locked_by=worker_id,
+        attempts=F("attempts") + 1,
+        updated=now,
+    )
+    return list(
+        EmailOutboxModel.objects
+        .filter(pk__in=candidates, status=Status.SENDING, locked_by=worker_id, locked_at=now)
+        .order_by("send_after", "pk")
+    )
+
+
+def _is_permanent(exc: Exception) -> bool:
+    """Errores 5xx del servidor: reintentar no va a cambiar la respuesta."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _msg in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code >= 500
+    return False
+
+
+def _is_connection_error(exc: Exception) -> bool:
+    # SMTPException hereda de OSError: solo la desconexión o errores de socket invalidan la conexión
+    return isinstance(exc, smtplib.SMTPServerDisconnected) or (
+        isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+    )
+
+
+def _finish(outbox, **values):
+    # Solo si el lock sigue siendo nuestro (un lote "stale" pudo ser reclamado por otro)
+    return EmailOutboxModel.objects.filter(
+        pk=outbox.pk, status=Status.SENDING, locked_by=outbox.locked_by,
+    ).update(locked_at=None, updated=timezone.now(), **values)
+
+
+def _record_failure(outbox, exc):
+    now = timezone.now()
+    error = "".join(traceback.format_exception(exc))[-10000:]
+    if _is_permanent(exc) or outbox.attempts >= outbox.max_attempts:
+        logger.error("Email #%s (%s) failed permanently: %s", outbox.pk, outbox.idempotency_key, exc)
+        _finish(outbox, status=Status.FAILED, last_error=error)
+    else:
+        logger.warning("Email #%s failed (attempt %s/%s): %s",
+                       outbox.pk, outbox.attempts, outbox.max_attempts, exc)
+        _finish(outbox, status=Status.PENDING, send_after=now + backoff(outbox.attempts),
+                last_error=error)
+
+
+def send_batch(batch: list, *, connection=None) -> dict:
+    """
+    Entrega `batch` (correos ya reclamados) por una sola conexión SMTP.
+    Si la conexión se cae se reabre para el resto del lote.
+    Devuelve {"sent": n, "failed": n}.
+    """
+    counters = {"sent": 0, "failed": 0}
+    if not batch:
+        return counters
+
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        for outbox in batch:
+            try:
+                connection.open()
+                connection.send_messages([OutboxEmailMessage(outbox)])
+            except Exception as exc:
+                counters["failed"] += 1
+                _record_failure(outbox, exc)
+                if _is_connection_error(exc):
+                    connection.close()
+                continue
+            counters["sent"] += 1
+            _finish(outbox, status=Status.SENT, sent_at=timezone.now(), last_error="")
+            for receiver, result in email_sent.send_robust(sender=EmailOutboxModel, outbox=outbox):
+                if isinstance(result, Exception):
+                    logger.error("email_sent receiver %r failed for %s: %s", receiver, outbox.pk, result)
+    finally:
+        connection.close()
+    return counters
+
+
+def requeue_emails(queryset) -> int:
+    """Devuelve a la cola los correos indicados (p.ej. los FAILED), con intentos a cero."""
+    return queryset.exclude(status__in=[Status.SENDING, Status.SENT]).update(
+        status=Status.PENDING,
+        attempts=0,
+        send_after=timezone.now(),
+        locked_at=None,
+        locked_by="",
+        updated=timezone.now(),
+    )
+
+
+def prune_email_outbox(max_age: timedelta = None) -> int:
+    """Borra los correos enviados hace más de `max_age` (EMAIL_OUTBOX_KEEP_DAYS). Devuelve cuántos."""
+    max_age = max_age if max_age is not None else timedelta(days=_setting("KEEP_DAYS", 30))
+    deleted, _by_model = EmailOutboxModel.objects.filter(
+        status=Status.SENT, sent_at__lt=timezone.now() - max_age,
+    ).delete()
+    return deleted
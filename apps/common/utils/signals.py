@@ -0,0 +1,29 @@
+# apps/common/utils/signals.py
+
+
+def fields_changed(instance, signal_kwargs, *field_names) -> bool:
+    """
+    Para receptores de pre_save: ¿vale la pena procesar estos campos?
+
+    - save(update_fields=...) que no incluye ninguno -> False
+    - instancias de TimeStampedModel -> has_changed() (sin consultas a la BD)
+    - cualquier otro caso -> True
+    """
+    update_fields = signal_kwargs.get("update_fields")
+    if update_fields is not None and not set(field_names) & set(update_fields):
+        return False
+    has_changed = getattr(instance, "has_changed", None)
+    return has_changed(*field_names) if has_changed else True
+
+
+def mark_daily_code_sent(sender, outbox, **kwargs):
+    """email_sent: se entregó el correo de un código diario -> sent_at/sent_to del código."""
+    if outbox.category != "utils.daily_code":
+        return
+    from .models import GeaDailyUniqueCode
+
+    # idempotency_key = GeaDailyUniqueCode.email_idempotency_key (el código va al final)
+    code = outbox.idempotency_key.rsplit(":", 1)[-1]
+    for obj in GeaDailyUniqueCode.objects.filter(code=code):
+        if obj.email_idempotency_key == outbox.idempotency_key:
+            obj.mark_sent(outbox.recipients, message_id=outbox.message_id)
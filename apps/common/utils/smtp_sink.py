@@ -0,0 +1,124 @@
+# apps/common/utils/smtp_sink.py
+"""
+Servidor SMTP local que acepta y descarta todo (para benchmarks y pruebas manuales).
+
+    with SMTPSink() as sink:
+        settings.EMAIL_HOST, settings.EMAIL_PORT = sink.host, sink.port
+        ...
+        sink.stats()  # {"connections": ..., "messages": ..., "bytes": ...}
+
+Solo librería estándar: hilo por conexión, sin TLS ni AUTH. Implementa lo que usa
+smtplib (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT).
+"""
+
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def _read_data(self) -> int:
+        size = 0
+        while True:
+            line = self.rfile.readline()
+            if not line or line == b".\r\n":
+                return size
+            size += len(line) - 1 if line.startswith(b"..") else len(line)
+
+    def handle(self):
+        sink = self.server.sink
+        sink._count("connections")
+        self._reply("220 localhost SMTP sink ready")
+        recipients = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip().split(" ", 1)[0].upper()
+            if command in ("EHLO", "HELO"):
+                self._reply("250-localhost" if command == "EHLO" else "250 localhost")
+                if command == "EHLO":
+                    self._reply("250-8BITMIME")
+                    self._reply("250 SIZE 52428800")
+            elif command == "MAIL":
+                recipients = 0
+                self._reply("250 OK")
+            elif command == "RCPT":
+                recipients += 1
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                size = self._read_data()
+                if sink.latency:
+                    time.sleep(sink.latency)
+                sink._record(size, recipients)
+                self._reply("250 OK queued")
+            elif command in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SMTPSink:
+    """
+    Servidor SMTP en un hilo del proceso actual. `latency`: segundos de espera
+    tras cada DATA (simula un servidor remoto).
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0):
+        self.latency = latency
+        self._server = _Server((host, port), _SMTPHandler)
+        self._server.sink = self
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {"connections": 0, "messages": 0, "recipients": 0, "bytes": 0}
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _record(self, size: int, recipients: int):
+        with self._lock:
+            self._stats["messages"] += 1
+            self._stats["recipients"] += recipients
+            self._stats["bytes"] += size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="smtp-sink", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -2,6 +2,9 @@ from django import template
 from django.urls import resolve
 from django.utils.safestring import mark_safe
 
+from apps.common.utils.images import rendition_url
+from apps.common.utils.translation import localized_value
+
 register = template.Library()
 
 
@@ -42,6 +45,18 @@ def currency(value):
         return value
 
 
+@register.filter
+def localized(obj, base: str):
+    """
+    Campo bilingüe en el idioma activo, con el otro idioma como respaldo
+    (p.ej. mientras la traducción está pendiente).
+
+    Ejemplo de uso:
+    {{ asset.category|localized:"name" }}
+    """
+    return localized_value(obj, base) if obj else ""
+
+
 def _current_url_name(request):
     try:
         return resolve(request.path_info).url_name
@@ -114,3 +129,15 @@ def trim(value):
     if value is None:
         return ''
     return str(value).strip()
+
+
+@register.filter
+def rendition(obj, name: str):
+    """
+    URL de la versión `name` (thumb, card, full, print) de la imagen del objeto;
+    la original mientras no se haya generado.
+
+    Ejemplo de uso:
+    <img src="{{ offer|rendition:"card" }}">
+    """
+    return rendition_url(obj, name)
@@ -0,0 +1,161 @@
+# apps/common/utils/translation.py
+"""
+Traducción diferida de los campos bilingües (es_<campo> / en_<campo>).
+
+El modelo declara sus pares y un BooleanField `translation_pending`:
+
+    TRANSLATABLE_FIELDS = {"name": 50, "description": 100}  # campo base -> max_chars
+
+- pre_save (`mark_translation_pending`): si un par cambió y solo tiene un idioma,
+  la fila se guarda con translation_pending=True. No se llama a OpenAI en la petición.
+- post_save (`queue_pending_translation`): encola TRANSLATE_FIELDS_JOB al confirmar.
+- El worker (`manage.py run_workers`) traduce los idiomas que faltan (todos los
+  campos de la fila en una sola petición, `ChatGPTAPI.translate_batch`), los guarda si
+  el texto de origen no cambió mientras tanto y limpia la marca. Si la API falla el
+  trabajo se reintenta con backoff (la marca sigue puesta). El cliente lo da
+  `translation_clients.get_translator()` (TRANSLATION_BACKEND openai/fake/noop).
+- Mientras tanto la UI usa `localized_value()` / el filtro `|localized`, que cae al
+  idioma de origen.
+"""
+
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.utils.translation import get_language
+
+from .jobs import enqueue, job
+from .signals import fields_changed
+from .translation_clients import TranslationItem, get_translator
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ("es", "en")
+
+TRANSLATE_FIELDS_JOB = "utils.translate_fields"
+
+
+def _other(language: str) -> str:
+    return "en" if language == "es" else "es"
+
+
+def missing_translations(instance, fields: dict = None) -> list:
+    """
+    Pares con un solo idioma: lista de (origen, destino, max_chars) con los
+    nombres de campo, p.ej. ("es_name", "en_name", 50).
+    """
+    fields = fields if fields is not None else instance.TRANSLATABLE_FIELDS
+    missing = []
+    for base, max_chars in fields.items():
+        es_value = getattr(instance, f"es_{base}", None)
+        en_value = getattr(instance, f"en_{base}", None)
+        if es_value and not en_value:
+            missing.append((f"es_{base}", f"en_{base}", max_chars))
+        elif en_value and not es_value:
+            missing.append((f"en_{base}", f"es_{base}", max_chars))
+    return missing
+
+
+def localized_value(obj, base: str, language: str = None) -> str:
+    """
+    Valor de `<idioma>_<base>` en el idioma activo; si está vacío (p.ej. traducción
+    pendiente) el del otro idioma.
+    """
+    language = (language or get_language() or "es")[:2]
+    if language not in LANGUAGES:
+        language = "en"
+    return (
+        getattr(obj, f"{language}_{base}", None)
+        or getattr(obj, f"{_other(language)}_{base}", None)
+        or ""
+    )
+
+
+def translate_missing(instance) -> dict:
+    """
+    Traduce en una sola petición todos los idiomas que le faltan a `instance`.
+    Devuelve {campo destino: (campo origen, texto origen, traducción)}; la
+    traducción es "" si falló.
+    """
+    missing = missing_translations(instance)
+    if not missing:
+        return {}
+    items = {
+        dst_field: TranslationItem(getattr(instance, src_field), src_field[:2], dst_field[:2], max_chars)
+        for src_field, dst_field, max_chars in missing
+    }
+    translated = get_translator().translate_batch(items)
+    return {
+        dst_field: (src_field, getattr(instance, src_field), translated.get(dst_field, ""))
+        for src_field, dst_field, _max_chars in missing
+    }
+
+
+# ---------------- Señales ----------------
+def mark_translation_pending(sender, instance, **kwargs):
+    """pre_save: marca la fila si algún par que cambió quedó con un solo idioma."""
+    changed = {
+        base: max_chars
+        for base, max_chars in sender.TRANSLATABLE_FIELDS.items()
+        if fields_changed(instance, kwargs, f"es_{base}", f"en_{base}")
+    }
+    if changed and missing_translations(instance, changed):
+        instance.translation_pending = True
+
+
+def queue_pending_translation(sender, instance, **kwargs):
+    """post_save: encola la traducción de las filas marcadas."""
+    if not instance.translation_pending:
+        return
+
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "translation_pending" not in update_fields:
+        # save(update_fields=...) no incluye la marca: se persiste aparte
+        sender.objects.filter(pk=instance.pk).update(translation_pending=True)
+
+    label = sender._meta.label_lower
+    enqueue(
+        TRANSLATE_FIELDS_JOB,
+        {"model": label, "pk": str(instance.pk)},
+        dedupe_key=f"translate:{label}:{instance.pk}",
+    )
+
+
+# ---------------- Worker ----------------
+@job(TRANSLATE_FIELDS_JOB)
+def translate_fields(model, pk):
+    """Completa los idiomas que faltan de la fila y limpia translation_pending."""
+    Model = apps.get_model(model)
+    instance = Model.objects.filter(pk=pk).first()
+    if instance is None or not instance.translation_pending:
+        return
+    if not get_translator().enabled:
+        # TRANSLATION_BACKEND "noop": la fila queda pendiente (backfill_translations)
+        logger.info("Translation backend disabled: %s #%s left pending", model, pk)
+        return
+
+    translations = translate_missing(instance)
+    failed = [dst_field for dst_field, (_src, _source, translated) in translations.items() if not translated]
+    if failed:
+        # ChatGPTAPI devuelve "" ante errores de la API: se reintenta más tarde
+        raise RuntimeError(f"Translation of {model} #{pk} failed: {', '.join(failed)}.")
+
+    with transaction.atomic():
+        current = Model.objects.select_for_update().get(pk=pk)
+        update_fields = []
+        for dst_field, (src_field, source, translated) in translations.items():
+            # Solo si nadie cambió el origen ni llenó el destino mientras se traducía
+            if getattr(current, src_field) == source and not getattr(current, dst_field):
+                setattr(current, dst_field, translated)
+                update_fields.append(dst_field)
+
+        current.translation_pending = bool(missing_translations(current))
+        if update_fields:
+            # `updated` (auto_now) forma parte de la clave de los fragmentos cacheados
+            update_fields.append("updated")
+        current.save(update_fields=[*update_fields, "translation_pending"])
+
+    if current.translation_pending:
+        # El texto cambió durante la traducción (su encolado se descartó por este
+        # trabajo en curso): se reintenta con el valor nuevo
+        raise RuntimeError(f"Source text of {model} #{pk} changed while translating.")
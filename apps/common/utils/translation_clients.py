@@ -0,0 +1,120 @@
+# apps/common/utils/translation_clients.py
+"""
+Cliente de traducción compartido por el proceso, creado al primer uso.
+
+    from apps.common.utils.translation_clients import get_translator
+    get_translator().translate("Oro fino", "es", "en")
+    get_translator().translate_batch({"en_name": TranslationItem("Oro", "es", "en", 50)})
+
+TRANSLATION_BACKEND elige la implementación:
+
+- "openai": ChatGPTAPI (requiere CHAT_GPT_API_KEY). Un solo cliente HTTP por
+  proceso reutiliza las conexiones entre llamadas.
+- "fake": traducción determinista sin red ("[en] Oro fino"), para pruebas y demos.
+- "noop": no traduce (enabled=False); los trabajos dejan la marca pendiente.
+
+Por defecto "openai" si hay CHAT_GPT_API_KEY y "noop" si no, de modo que importar
+los modelos o arrancar sin clave no falla ni crea el cliente de OpenAI. En
+desarrollo (DEBUG) settings usa "noop" salvo que TRANSLATION_BACKEND diga otra cosa.
+TRANSLATION_TIMEOUT: segundos por llamada (incluidos los reintentos del SDK,
+TRANSLATION_MAX_RETRIES).
+"""
+
+import logging
+import threading
+from typing import Literal, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+Language = Literal["es", "en"]
+
+BACKENDS = {
+    "openai": "apps.common.utils.functions.chatgpt_api.ChatGPTAPI",
+    "fake": "apps.common.utils.translation_clients.FakeTranslator",
+    "noop": "apps.common.utils.translation_clients.NoopTranslator",
+}
+
+
+class TranslationItem(NamedTuple):
+    """Un campo a traducir en translate_batch()."""
+    text: str
+    src: Language
+    dst: Language
+    max_chars: Optional[int] = None
+
+
+class FakeTranslator:
+    """Traducción determinista y sin red: antepone el idioma destino."""
+    enabled = True
+
+    def translate(self, text: str, src: Language, dst: Language, *,
+                  max_chars: Optional[int] = None, **kwargs) -> str:
+        text = " ".join((text or "").split())
+        if max_chars:
+            text = text[:max_chars]
+        return f"[{dst}] {text}" if text else ""
+
+    def translate_batch(self, items: dict, **kwargs) -> dict:
+        return {
+            key: self.translate(item.text, item.src, item.dst, max_chars=item.max_chars)
+            for key, item in items.items()
+        }
+
+
+class NoopTranslator:
+    """No traduce: devuelve "" como ChatGPTAPI ante un error."""
+    enabled = False
+
+    def translate(self, text: str, src: Language, dst: Language, **kwargs) -> str:
+        return ""
+
+    def translate_batch(self, items: dict, **kwargs) -> dict:
+        return {key: "" for key in items}
+
+
+def default_backend() -> str:
+    return getattr(settings, "TRANSLATION_BACKEND", None) or (
+        "openai" if getattr(settings, "CHAT_GPT_API_KEY", None) else "noop"
+    )
+
+
+_translator = None
+_lock = threading.Lock()
+
+
+def get_translator():
+    """Cliente de traducción del proceso (se crea al primer uso, no al importar)."""
+    global _translator
+    if _translator is None:
+        with _lock:
+            if _translator is None:
+                name = default_backend()
+                if name not in BACKENDS:
+                    raise ValueError(f"Unknown TRANSLATION_BACKEND '{name}'. Options: {', '.join(BACKENDS)}.")
+                if name == "noop":
+                    logger.warning("Translation backend is 'noop': bilingual fields will not be translated.")
+                _translator = import_string(BACKENDS[name])()
+    return _translator
+
+
+def reset_translator():
+    """Descarta el cliente actual (el siguiente get_translator() crea uno nuevo)."""
+    global _translator
+    with _lock:
+        if _translator is not None and hasattr(_translator, "close"):
+            _translator.close()
+        _translator = None
+
+
+def _reset_on_setting_changed(setting, **kwargs):
+    # override_settings en pruebas
+    if setting in ("TRANSLATION_BACKEND", "CHAT_GPT_API_KEY", "TRANSLATION_TIMEOUT",
+                   "TRANSLATION_MAX_RETRIES"):
+        reset_translator()
+
+
+setting_changed.connect(_reset_on_setting_changed)
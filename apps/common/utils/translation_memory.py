@@ -0,0 +1,169 @@
+# apps/common/utils/translation_memory.py
+"""
+Memoria de traducción de ChatGPTAPI.translate, en dos niveles.
+
+    translation_memory.get("es", "en", "Oro fino", "gpt-4o-mini")  # -> "Fine gold" | None
+    translation_memory.set("es", "en", "Oro fino", "gpt-4o-mini", "Fine gold")
+
+- Clave: (idioma origen, idioma destino, sha256 del texto normalizado, modelo).
+  Normalizar = espacios colapsados + Unicode NFC.
+- Nivel 1: LRU en memoria del proceso (TRANSLATION_MEMORY_LRU_SIZE entradas,
+  cada una válida TRANSLATION_MEMORY_LRU_TTL segundos).
+- Nivel 2: TranslationMemoryModel. Las filas inactivas (is_active=False) se ignoran
+  y se vuelven a traducir; las corregidas en el admin (corrected=True) no se
+  sobrescriben: para retraducirlas se desactivan con la acción del admin.
+- `stats()`: aciertos en memoria / en BD, fallos (llamadas a la API) y guardados
+  del proceso. El admin muestra además los aciertos acumulados por fila.
+
+Un error de base de datos no impide traducir: se registra y cuenta como fallo.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TranslationMemoryModel
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFC", re.sub(r"\s+", " ", (text or "").strip()))
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(normalize(text).encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    def __init__(self, max_entries: int = None, ttl: float = None):
+        self.max_entries = max_entries or getattr(settings, "TRANSLATION_MEMORY_LRU_SIZE", 2048)
+        self.ttl = ttl if ttl is not None else getattr(settings, "TRANSLATION_MEMORY_LRU_TTL", 600)
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, "TRANSLATION_MEMORY_ENABLED", True)
+
+    # ---------------- LRU ----------------
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] += 1
+
+    def _remember(self, key: tuple, value: str):
+        with self._lock:
+            self._lru[key] = (value, time.monotonic() + self.ttl)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _recall(self, key: tuple):
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            self._counters["memory_hits"] += 1
+            return value
+
+    def forget(self, src: str, dst: str, digest: str, model: str):
+        """Quita una entrada del LRU de este proceso (p.ej. tras corregirla en el admin)."""
+        with self._lock:
+            self._lru.pop((src, dst, digest, model), None)
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+    # ---------------- API ----------------
+    def get(self, src: str, dst: str, text: str, model: str):
+        """Traducción guardada de `text` o None (memoria -> BD)."""
+        if not self.enabled or not text:
+            return None
+
+        key = (src, dst, source_hash(text), model)
+        value = self._recall(key)
+        if value is not None:
+            return value
+
+        try:
+            row = (
+                TranslationMemoryModel.objects
+                .filter(src_lang=src, dst_lang=dst, source_hash=key[2], model=model, is_active=True)
+                .values_list("pk", "translated_text")
+                .first()
+            )
+            if row is not None:
+                TranslationMemoryModel.objects.filter(pk=row[0]).update(
+                    hits=F("hits") + 1, last_hit_at=timezone.now()
+                )
+        except DatabaseError:
+            logger.exception("Translation memory lookup failed")
+            row = None
+
+        if row is None or not row[1]:
+            self._count("misses")
+            return None
+
+        self._count("db_hits")
+        self._remember(key, row[1])
+        return row[1]
+
+    def set(self, src: str, dst: str, text: str, model: str, translated: str):
+        """Guarda la traducción devuelta por la API (memoria y BD)."""
+        if not self.enabled or not text or not translated:
+            return
+
+        key = (src, dst, source_hash(text), model)
+        lookup = {"src_lang": src, "dst_lang": dst, "source_hash": key[2], "model": model}
+        try:
+            with transaction.atomic():
+                row = TranslationMemoryModel.objects.select_for_update().filter(**lookup).first()
+                if row is None:
+                    TranslationMemoryModel.objects.create(
+                        source_text=normalize(text), translated_text=translated, **lookup
+                    )
+                elif row.corrected:
+                    # Corregida en el admin: se conserva (si está activa, vale la corrección)
+                    if row.is_active and row.translated_text:
+                        self._remember(key, row.translated_text)
+                    return
+                else:
+                    row.source_text = normalize(text)
+                    row.translated_text = translated
+                    row.is_active = True
+                    row.save(update_fields=["source_text", "translated_text", "is_active", "updated"])
+        except IntegrityError:
+            # Otro proceso la guardó a la vez: vale la suya
+            pass
+        except DatabaseError:
+            logger.exception("Translation memory store failed")
+            return
+
+        self._count("stores")
+        self._remember(key, translated)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters, entries=len(self._lru))
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+translation_memory = TranslationMemory()
@@ -5,7 +5,7 @@ from collections import OrderedDict
 from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.sites.shortcuts import get_current_site
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, EmailMultiAlternatives
 from django.db import IntegrityError
 from django.http import HttpResponseRedirect
 from django.shortcuts import redirect, render
@@ -23,6 +23,7 @@ from django.utils.crypto import get_random_string
 from formtools.wizard.views import SessionWizardView
 
 from apps.common.utils.models import GeaDailyUniqueCode
+from apps.common.utils.outbox import queue_email
 from apps.project.common.users.models import UserModel
 
 
@@ -164,12 +165,11 @@ class GeaUserRegisterWizardView(SessionWizardView):
             "This code expires in %(minutes)s minutes."
         ) % {"code": code, "minutes": int(self.BUYER_CODE_TTL_SECONDS / 60)}
 
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=None,
-            recipient_list=[email],
-            fail_silently=False,
+        # Se entrega desde la bandeja de salida (manage.py send_outbox)
+        queue_email(
+            EmailMessage(subject=subject, body=message, to=[email]),
+            idempotency_key=f"buyer-code:{email}:{code}",
+            category="account.buyer_code",
         )
 
     def process_step(self, form):
@@ -454,14 +454,18 @@ class ForgotPasswordFormView(View):
         message = render_to_string(
             'account/password_reset_email.html', context)
 
-        # Send email
-        send_mail(
+        # Send email (desde la bandeja de salida, manage.py send_outbox)
+        email = EmailMultiAlternatives(
             subject=subject,
-            message=message,
+            body=message,
             from_email=None,  # Use DEFAULT_FROM_EMAIL
-            recipient_list=[user.email],
-            html_message=message,
-            fail_silently=False,
+            to=[user.email],
+        )
+        email.attach_alternative(message, "text/html")
+        queue_email(
+            email,
+            idempotency_key=f"password-reset:{user.pk}:{token}",
+            category="account.password_reset",
         )
 
 
@@ -359,6 +359,7 @@ class AssetModelAdmin(ImportExportModelAdmin, GeneralAdminModel):
         'created',
         'updated',
         'get_asset_total_quantity_by_type',
+        'processing_state',
     )
 
     ordering = (
@@ -372,6 +373,7 @@ class AssetModelAdmin(ImportExportModelAdmin, GeneralAdminModel):
                 (
                     'id',
                     'asset_img',
+                    'processing_state',
                     'asset_name',
                     'category',
                     'is_active',
@@ -413,6 +415,11 @@ class AssetModelAdmin(ImportExportModelAdmin, GeneralAdminModel):
         )
     )
 
+    # -------- performance ----------
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('asset_name', 'category').with_stock_totals()
+
     def get_asset_es_name(self, obj):
         return obj.asset_name.es_name
     get_asset_es_name.short_description = _('Asset Name (ES)')
@@ -433,6 +440,7 @@ class AssetModelAdmin(ImportExportModelAdmin, GeneralAdminModel):
 
     get_asset_total_quantity_by_type.short_description = _(
         'Total Quantity by Type')
+    get_asset_total_quantity_by_type.admin_order_field = 'stock_total'
 
     def default_order_fmt(self, obj):
         return self._fmt_int(obj.default_order)
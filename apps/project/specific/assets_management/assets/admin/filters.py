@@ -30,9 +30,16 @@ class QuantityTypeFilter(admin.SimpleListFilter):
         return AssetLocationModel.QuantityTypeChoices.choices
 
     def queryset(self, request, queryset):
-        # Filtra el queryset según el tipo seleccionado
+        # Filtra el queryset según el tipo seleccionado.
+        # Exists evita un segundo JOIN que duplicaría las sumas de with_stock_totals()
         if self.value():
+            from apps.project.specific.assets_management.assets_location.models import AssetLocationModel
             return queryset.filter(
-                assetlocation_assetlocation_asset__quantity_type=self.value()
-            ).distinct()  # Asegurarse de que los registros no se dupliquen
+                models.Exists(
+                    AssetLocationModel.objects.filter(
+                        asset=models.OuterRef('pk'),
+                        quantity_type=self.value()
+                    )
+                )
+            )
         return queryset
@@ -0,0 +1,126 @@
+# apps/project/specific/assets_management/assets/management/commands/benchmark_inventory.py
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.db.models import Sum
+
+from apps.project.specific.assets_management.assets.models import (
+    AssetCategoryModel, AssetModel, AssetsNamesModel)
+from apps.project.specific.assets_management.assets_location.models import (
+    AssetLocationModel, AssetStockSnapshot)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Compara la agregación de inventario por activo (una consulta GROUP BY sobre los
+    registros de ubicación por activo) contra AssetModel.objects.with_stock_totals()
+    (una sola consulta sobre AssetStockSnapshot).
+    Los datos sembrados se revierten al terminar cada tamaño.
+    """
+    help = "Benchmark: per-asset inventory totals vs single-query aggregation (rolled back)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "-s", "--sizes",
+            default="100,1000,10000",
+            help="Comma separated number of assets to seed (default: 100,1000,10000).",
+        )
+        parser.add_argument(
+            "-l", "--locations-per-asset",
+            type=int,
+            default=4,
+            help="Location registrations seeded per asset (default: 4).",
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+        per_asset = max(1, options["locations_per_asset"])
+
+        self.stdout.write(
+            f"{'assets':>8} | {'legacy queries':>14} | {'legacy ms':>10} | "
+            f"{'single queries':>14} | {'single ms':>10}"
+        )
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    self._seed(size, per_asset)
+                    legacy = self._measure(self._legacy)
+                    single = self._measure(self._single)
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+            self.stdout.write(
+                f"{size:>8} | {legacy[0]:>14} | {legacy[1]:>10.1f} | "
+                f"{single[0]:>14} | {single[1]:>10.1f}"
+            )
+
+    def _seed(self, size: int, per_asset: int) -> None:
+        tag = f"bench-{uuid.uuid4().hex[:8]}"
+        category = AssetCategoryModel.objects.create(es_name=tag, en_name=tag)
+
+        AssetsNamesModel.objects.bulk_create(
+            [AssetsNamesModel(es_name=f"{tag}-{i}", en_name=f"{tag}-{i}")
+             for i in range(size)],
+            batch_size=1000,
+        )
+        # Se re-consultan para no depender de que el backend devuelva PKs en bulk_create
+        names = AssetsNamesModel.objects.filter(es_name__startswith=f"{tag}-")
+
+        assets = AssetModel.objects.bulk_create(
+            [AssetModel(asset_name=name, category=category) for name in names],
+            batch_size=1000,
+        )
+
+        quantity_types = AssetLocationModel.QuantityTypeChoices.values
+        AssetLocationModel.objects.bulk_create(
+            [
+                AssetLocationModel(
+                    asset=asset,
+                    quantity_type=quantity_types[i % len(quantity_types)],
+                    amount=i + 1,
+                    is_active=(i % 3 != 2),
+                )
+                for asset in assets
+                for i in range(per_asset)
+            ],
+            batch_size=1000,
+        )
+        # bulk_create no pasa por save(): el snapshot se reconstruye para lo sembrado
+        AssetStockSnapshot.objects.rebuild(asset_ids=[asset.pk for asset in assets])
+
+    def _measure(self, fn) -> tuple[int, float]:
+        executed = []
+
+        def counter(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - start) * 1000
+        return len(executed), elapsed
+
+    def _legacy(self) -> None:
+        for asset in AssetModel.objects.select_related("asset_name", "category"):
+            list(
+                asset.assetlocation_assetlocation_asset
+                .filter(is_active=True)
+                .values("quantity_type")
+                .annotate(total=Sum("amount"))
+            )
+
+    def _single(self) -> None:
+        list(
+            AssetModel.objects
+            .with_localized_names("es")
+            .with_stock_totals()
+            .values("display_name", "display_category", "stock_boxes", "stock_units", "stock_total")
+        )
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetcategorymodel',
+            name='translation_pending',
+            field=models.BooleanField(default=False, editable=False, verbose_name='translation pending'),
+        ),
+        migrations.AddField(
+            model_name='assetmodel',
+            name='translation_pending',
+            field=models.BooleanField(default=False, editable=False, verbose_name='translation pending'),
+        ),
+        migrations.AddField(
+            model_name='assetsnamesmodel',
+            name='translation_pending',
+            field=models.BooleanField(default=False, editable=False, verbose_name='translation pending'),
+        ),
+    ]
@@ -6,24 +6,32 @@ from datetime import date
 from auditlog.registry import auditlog
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.db.models.signals import post_delete, pre_save
+from django.db.models import F, Q, Sum, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
 from apps.common.utils.functions import sha256_hex
-from apps.common.utils.models import TimeStampedModel
+from apps.common.utils.images import (delete_rendition_file,
+                                      mark_image_pending,
+                                      queue_image_processing)
+from apps.common.utils.models import (ImageProcessingState,
+                                      ImageRenditionModel, TimeStampedModel)
+from apps.common.utils.translation import (mark_translation_pending,
+                                           queue_pending_translation)
 
 from .signals import (auto_delete_asset_img_on_change,
-                      auto_delete_asset_img_on_delete,
-                      auto_fill_asset_category_translation,
-                      auto_fill_asset_name_translation,
-                      auto_fill_asset_translation_fields)
+                      auto_delete_asset_img_on_delete)
 
 logger = logging.getLogger(__name__)
 UserModel = get_user_model()
 
 
 class AssetCategoryModel(TimeStampedModel):
+    # Pares es_/en_ que se traducen en segundo plano (campo base -> max_chars)
+    TRANSLATABLE_FIELDS = {"name": 50, "description": 100}
+
     es_name = models.CharField(
         _("category (ES)"),
         max_length=50,
@@ -50,6 +58,12 @@ class AssetCategoryModel(TimeStampedModel):
         null=True
     )
 
+    translation_pending = models.BooleanField(
+        _("translation pending"),
+        default=False,
+        editable=False
+    )
+
     created_by = models.ForeignKey(
         UserModel,
         on_delete=models.CASCADE,
@@ -77,6 +91,9 @@ class AssetCategoryModel(TimeStampedModel):
 
 
 class AssetsNamesModel(TimeStampedModel):
+    # Pares es_/en_ que se traducen en segundo plano (campo base -> max_chars)
+    TRANSLATABLE_FIELDS = {"name": 50}
+
     es_name = models.CharField(
         _("asset (es)"),
         max_length=255,
@@ -91,6 +108,12 @@ class AssetsNamesModel(TimeStampedModel):
         null=True
     )
 
+    translation_pending = models.BooleanField(
+        _("translation pending"),
+        default=False,
+        editable=False
+    )
+
     def __str__(self) -> str:
         return self.en_name or self.es_name or str(self.pk)
 
@@ -109,7 +132,65 @@ class AssetsNamesModel(TimeStampedModel):
         ordering = ["default_order", "-created"]
 
 
+class AssetQuerySet(models.QuerySet):
+    STOCK_RELATION = "assetlocation_stocksnapshot_asset"
+
+    def with_stock_totals(self):
+        """
+        Annotate stock_boxes, stock_units and stock_total for every asset from
+        AssetStockSnapshot (at most one row per asset and quantity type).
+        """
+        from apps.project.specific.assets_management.assets_location.models import \
+            AssetLocationModel
+
+        rel = self.STOCK_RELATION
+
+        def total_for(quantity_type):
+            return Coalesce(
+                Sum(
+                    f"{rel}__total",
+                    filter=Q(**{f"{rel}__quantity_type": quantity_type})
+                ),
+                0
+            )
+
+        return self.annotate(
+            stock_boxes=total_for(AssetLocationModel.QuantityTypeChoices.BOXES),
+            stock_units=total_for(AssetLocationModel.QuantityTypeChoices.UNITS),
+        ).annotate(
+            stock_total=F("stock_boxes") + F("stock_units")
+        )
+
+    def with_localized_names(self, lang):
+        """
+        Annotate display_name, display_category, display_description and
+        display_observations in the requested language, falling back to the other one.
+        """
+        primary, fallback = ("es", "en") if (lang or "").startswith("es") else ("en", "es")
+
+        def pick(field_fmt):
+            return Coalesce(
+                NullIf(field_fmt.format(primary), Value("")),
+                NullIf(field_fmt.format(fallback), Value("")),
+                Value(""),
+                output_field=models.TextField()
+            )
+
+        return self.annotate(
+            display_name=pick("asset_name__{}_name"),
+            display_category=pick("category__{}_name"),
+            display_description=pick("{}_description"),
+            display_observations=pick("{}_observations"),
+        )
+
+
 class AssetModel(TimeStampedModel):
+    # Pares es_/en_ que se traducen en segundo plano (campo base -> max_chars)
+    TRANSLATABLE_FIELDS = {"description": 200, "observations": 200}
+
+    # Imagen con versiones generadas en segundo plano (AssetImageRendition)
+    IMAGE_FIELD = "asset_img"
+
     def assets_directory_path(instance, filename) -> str:
         """
         Generate a file path for an asset image.
@@ -150,6 +231,14 @@ class AssetModel(TimeStampedModel):
         null=True
     )
 
+    processing_state = models.CharField(
+        _("image processing state"),
+        max_length=10,
+        choices=ImageProcessingState.choices,
+        default=ImageProcessingState.NONE,
+        editable=False
+    )
+
     asset_name = models.OneToOneField(
         AssetsNamesModel,
         on_delete=models.CASCADE,
@@ -190,18 +279,36 @@ class AssetModel(TimeStampedModel):
         null=True
     )
 
+    translation_pending = models.BooleanField(
+        _("translation pending"),
+        default=False,
+        editable=False
+    )
+
+    objects = AssetQuerySet.as_manager()
+
     def asset_total_quantity_by_type(self):
         """
         Calculate the total quantity grouped by quantity_type with readable labels.
+        Reads AssetStockSnapshot, or the with_stock_totals() annotations when present.
         """
         from collections import defaultdict
 
         related_model = self.assetlocation_assetlocation_asset.model
         quantity_type_display = dict(related_model.QuantityTypeChoices.choices)
 
-        totals_by_type = self.assetlocation_assetlocation_asset.filter(is_active=True).values('quantity_type').annotate(
-            total=models.Sum('amount')
-        )
+        if hasattr(self, "stock_boxes") and hasattr(self, "stock_units"):
+            totals = defaultdict(int)
+            annotated = (
+                (related_model.QuantityTypeChoices.BOXES, self.stock_boxes),
+                (related_model.QuantityTypeChoices.UNITS, self.stock_units),
+            )
+            for quantity_type, total in annotated:
+                if total:
+                    totals[quantity_type_display[quantity_type]] = total
+            return totals
+
+        totals_by_type = self.assetlocation_stocksnapshot_asset.exclude(total=0).values('quantity_type', 'total')
 
         totals = defaultdict(int)
 
@@ -223,6 +330,26 @@ class AssetModel(TimeStampedModel):
         unique_together = ['asset_name', 'category']
 
 
+class AssetImageRendition(ImageRenditionModel):
+    asset = models.ForeignKey(
+        AssetModel,
+        on_delete=models.CASCADE,
+        related_name="renditions",
+        verbose_name=_("asset")
+    )
+
+    class Meta:
+        db_table = "apps_assets_asset_image_rendition"
+        verbose_name = _("Asset image rendition")
+        verbose_name_plural = _("Asset image renditions")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["asset", "rendition"],
+                name="asset_image_rendition_uniq",
+            ),
+        ]
+
+
 post_delete.connect(
     auto_delete_asset_img_on_delete,
     sender=AssetModel
@@ -234,17 +361,47 @@ pre_save.connect(
 )
 
 pre_save.connect(
-    auto_fill_asset_category_translation,
+    mark_image_pending,
+    sender=AssetModel
+)
+
+post_save.connect(
+    queue_image_processing,
+    sender=AssetModel
+)
+
+post_delete.connect(
+    delete_rendition_file,
+    sender=AssetImageRendition
+)
+
+pre_save.connect(
+    mark_translation_pending,
+    sender=AssetCategoryModel
+)
+
+post_save.connect(
+    queue_pending_translation,
     sender=AssetCategoryModel
 )
 
 pre_save.connect(
-    auto_fill_asset_name_translation,
+    mark_translation_pending,
+    sender=AssetsNamesModel
+)
+
+post_save.connect(
+    queue_pending_translation,
     sender=AssetsNamesModel
 )
 
 pre_save.connect(
-    auto_fill_asset_translation_fields,
+    mark_translation_pending,
+    sender=AssetModel
+)
+
+post_save.connect(
+    queue_pending_translation,
     sender=AssetModel
 )
 
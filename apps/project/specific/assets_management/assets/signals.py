@@ -2,9 +2,7 @@
 import logging
 import os
 
-from django.utils.translation import gettext_lazy as _
-
-from apps.common.utils.functions.chatgpt_api import ChatGPTAPI
+from apps.common.utils.signals import fields_changed
 
 logger = logging.getLogger(__name__)
 
@@ -28,140 +26,28 @@ def auto_delete_asset_img_on_change(sender, instance, *args, **kwargs):
     """
     Delete old image file from filesystem when the corresponding AssetModel instance is updated with a new file.
     """
-    if not instance.pk:
+    if not instance.pk or instance._state.adding:
         return
 
-    try:
-        old_instance = sender.objects.get(pk=instance.pk)
-    except sender.DoesNotExist:
+    # La imagen no cambió (o el save no la incluye): nada que borrar, sin consultar la BD
+    if not fields_changed(instance, kwargs, "asset_img"):
         return
-    
-    old_f = getattr(old_instance, "asset_img", None)
+
+    if instance.is_tracking_changes():
+        old_name = instance.get_loaded_value("asset_img")
+    else:
+        try:
+            old_name = sender.objects.only("asset_img").get(pk=instance.pk).asset_img.name
+        except sender.DoesNotExist:
+            return
+
     new_f = getattr(instance, "asset_img", None)
+    storage = sender._meta.get_field("asset_img").storage
 
     try:
-        if old_f and old_f.name and (not new_f or old_f.name != getattr(new_f, "name", None)):
-            old_f.storage.delete(old_f.name)
+        if old_name and (not new_f or old_name != getattr(new_f, "name", None)):
+            storage.delete(old_name)
     except Exception as e:
         logger.error(
-            f"Error deleting old image {old_instance.asset_img.path}: {e}"
+            f"Error deleting old image {old_name}: {e}"
         )
-
-
-translator = ChatGPTAPI()
-
-
-def auto_fill_asset_category_translation(sender, instance, *args, **kwargs):
-    """
-    Automatically fill the asset category translation fields when a new AssetModel instance is created.
-    """
-
-    try:
-        # Name
-        if instance.es_name and not instance.en_name:
-            instance.en_name = translator.translate(
-                instance.es_name,
-                src="es",
-                dst="en",
-                max_chars=50
-            )
-
-        elif instance.en_name and not instance.es_name:
-            instance.es_name = translator.translate(
-                instance.en_name,
-                src="en",
-                dst="es",
-                max_chars=50
-            )
-
-        # Description
-        if instance.es_description and not instance.en_description:
-            instance.en_description = translator.translate(
-                instance.es_description,
-                src="es",
-                dst="en",
-                max_chars=100
-            )
-
-        elif instance.en_description and not instance.es_description:
-            instance.es_description = translator.translate(
-                instance.en_description,
-                src="en",
-                dst="es",
-                max_chars=100
-            )
-
-    except Exception as e:
-        logger.exception(
-            _(f"Error filling asset category translation fields: {e}"))
-
-
-def auto_fill_asset_name_translation(sender, instance, *args, **kwargs):
-    """
-    Automatically fill the asset name translation fields when a new AssetModel instance is created.
-    """
-    try:
-        # Name
-        if instance.es_name and not instance.en_name:
-            instance.en_name = translator.translate(
-                instance.es_name,
-                src="es",
-                dst="en",
-                max_chars=50
-            )
-
-        elif instance.en_name and not instance.es_name:
-            instance.es_name = translator.translate(
-                instance.en_name,
-                src="en",
-                dst="es",
-                max_chars=50
-            )
-        
-    except Exception as e:
-        logger.exception(
-            _(f"Error filling asset name translation fields: {e}"))
-
-
-def auto_fill_asset_translation_fields(sender, instance, *args, **kwargs):
-    """
-    Automatically fill the asset translation fields when a new AssetModel instance is created.
-    """
-
-    try:
-        # Description
-        if instance.es_description and not instance.en_description:
-            instance.en_description = translator.translate(
-                instance.es_description,
-                src="es",
-                dst="en",
-                max_chars=200
-            )
-
-        elif instance.en_description and not instance.es_description:
-            instance.es_description = translator.translate(
-                instance.en_description,
-                src="en",
-                dst="es",
-                max_chars=200
-            )
-
-        # Observations
-        if instance.es_observations and not instance.en_observations:
-            instance.en_observations = translator.translate(
-                instance.es_observations,
-                src="es",
-                dst="en",
-                max_chars=200
-            )
-
-        elif instance.en_observations and not instance.es_observations:
-            instance.es_observations = translator.translate(
-                instance.en_observations,
-                src="en",
-                dst="es",
-                max_chars=200
-            )
-            
-    except Exception as e:
-        logger.exception(_(f"Error filling asset translation fields: {e}"))
@@ -28,18 +28,19 @@ class HolderTemplateview(HolderRequiredMixin, TemplateView):
             asset__is_active=True,
             is_active=True,
             created_by=self.request.user
-        )
+        ).prefetch_related("asset__renditions")
 
         locations = LocationModel.objects.filter(
             is_active=True,
             created_by=self.request.user
         )
 
-        offers = OfferModel.objects.filter(
-            is_active=True,
-            is_approved=True,
-            payment_order_created_at__isnull=True,
-        )
+        # Aprobadas y aún sin orden de pago, por la columna de estado indexada
+        offers = OfferModel.objects.filter(is_active=True).with_status(
+            OfferModel.StatusChoices.APPROVED,
+            OfferModel.StatusChoices.SO_CREATED,
+            OfferModel.StatusChoices.SO_SENT,
+        ).prefetch_related("asset__renditions")
 
         context['assets'] = assets
         context['locations'] = locations
@@ -66,6 +67,7 @@ class AssetNameWithInlineAssetCreateView(BuyerRequiredMixin, View):
                 "category__es_name", "category__en_name",
                 "created",
             )
+            .prefetch_related("renditions")
             .order_by("-created")
         )
         context = {
@@ -97,6 +99,7 @@ class AssetNameWithInlineAssetCreateView(BuyerRequiredMixin, View):
         assets = (
             AssetModel.objects
             .select_related("asset_name", "category")
+            .prefetch_related("renditions")
             .order_by("-created")
         )
 
@@ -3,7 +3,8 @@ from django.utils.translation import gettext_lazy as _
 
 from apps.common.utils.admin import GeneralAdminModel
 
-from ..models import AssetCountryModel, AssetLocationModel, LocationModel
+from ..models import (AssetCountryModel, AssetLocationModel,
+                      AssetStockSnapshot, LocationModel)
 
 
 @admin.register(AssetCountryModel)
@@ -267,3 +268,41 @@ class LocationModelAdmin(GeneralAdminModel):
             }
         )
     )
+
+
+@admin.register(AssetStockSnapshot)
+class AssetStockSnapshotAdmin(admin.ModelAdmin):
+    # Tabla derivada: se mantiene desde AssetLocationModel, no se edita a mano
+    list_display = (
+        'asset',
+        'quantity_type',
+        'total',
+        'updated',
+    )
+
+    list_filter = (
+        'quantity_type',
+        'asset__category',
+    )
+
+    search_fields = (
+        'asset__asset_name__es_name',
+        'asset__asset_name__en_name',
+    )
+
+    list_select_related = (
+        'asset__asset_name',
+    )
+
+    readonly_fields = (
+        'asset',
+        'quantity_type',
+        'total',
+        'updated',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,43 @@
+# apps/project/specific/assets_management/assets_location/management/commands/check_stock_snapshot.py
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.project.specific.assets_management.assets_location.models import \
+    AssetStockSnapshot
+
+
+class Command(BaseCommand):
+    help = "Report drift between AssetStockSnapshot and the active location registrations."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rebuild the snapshot rows of the drifted assets.",
+        )
+        parser.add_argument(
+            "--fail-on-drift",
+            action="store_true",
+            help="Exit with an error status when drift is found (useful in cron/CI).",
+        )
+
+    def handle(self, *args, **options):
+        drifted = AssetStockSnapshot.objects.drift()
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("Stock snapshot is consistent."))
+            return
+
+        for asset_id, quantity_type, expected, actual in drifted:
+            self.stdout.write(self.style.WARNING(
+                f"{asset_id} [{quantity_type}] expected={expected} snapshot={actual}"
+            ))
+
+        if options["fix"]:
+            written = AssetStockSnapshot.objects.rebuild(
+                asset_ids={asset_id for asset_id, *_ in drifted}
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt {written} snapshot rows for {len(drifted)} drifted entries."
+            ))
+        elif options["fail_on_drift"]:
+            raise CommandError(f"{len(drifted)} drifted stock snapshot entries.")
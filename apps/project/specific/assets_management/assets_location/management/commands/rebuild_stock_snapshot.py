@@ -0,0 +1,23 @@
+# apps/project/specific/assets_management/assets_location/management/commands/rebuild_stock_snapshot.py
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.project.specific.assets_management.assets_location.models import \
+    AssetStockSnapshot
+
+
+class Command(BaseCommand):
+    help = "Rebuild AssetStockSnapshot from the active location registrations."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "-a", "--asset",
+            action="append",
+            dest="assets",
+            help="Asset ID to rebuild (repeatable). Rebuilds every asset when omitted.",
+        )
+
+    def handle(self, *args, **options):
+        written = AssetStockSnapshot.objects.rebuild(asset_ids=options["assets"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Stock snapshot rebuilt: {written} rows written."
+        ))
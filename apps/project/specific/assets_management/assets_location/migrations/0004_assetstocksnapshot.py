@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_stock_snapshot(apps, schema_editor):
+    AssetLocationModel = apps.get_model('assets_location', 'AssetLocationModel')
+    AssetStockSnapshot = apps.get_model('assets_location', 'AssetStockSnapshot')
+
+    totals = (
+        AssetLocationModel.objects.filter(is_active=True)
+        .values('asset_id', 'quantity_type')
+        .annotate(total=models.Sum('amount'))
+        .order_by()
+    )
+    AssetStockSnapshot.objects.bulk_create(
+        [
+            AssetStockSnapshot(
+                asset_id=row['asset_id'],
+                quantity_type=row['quantity_type'],
+                total=row['total'],
+            )
+            for row in totals
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0002_initial'),
+        ('assets_location', '0003_alter_assetlocationmodel_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetStockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity_type', models.CharField(choices=[('U', 'Units'), ('B', 'Boxes')], max_length=255, verbose_name='quantity type')),
+                ('total', models.BigIntegerField(default=0, verbose_name='total')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='updated')),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assetlocation_stocksnapshot_asset', to='assets.assetmodel', verbose_name='Asset')),
+            ],
+            options={
+                'verbose_name': 'Stock Snapshot',
+                'verbose_name_plural': 'Stock Snapshots',
+                'db_table': 'apps_assets_location_stocksnapshot',
+                'ordering': ['asset', 'quantity_type'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='assetstocksnapshot',
+            constraint=models.UniqueConstraint(fields=('asset', 'quantity_type'), name='uniq_stocksnapshot_asset_quantity_type'),
+        ),
+        migrations.RunPython(populate_stock_snapshot, migrations.RunPython.noop),
+    ]
@@ -5,12 +5,17 @@ import uuid
 
 from auditlog.registry import auditlog
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Sum
+from django.db.models.signals import post_delete
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.common.utils.models import TimeStampedModel
 from apps.project.specific.assets_management.assets.models import AssetModel
 
+from .signals import discount_stock_snapshot_on_delete
+
 UserModel = get_user_model()
 
 
@@ -198,6 +203,30 @@ class AssetLocationModel(TimeStampedModel):
         null=True
     )
 
+    def stock_contribution(self):
+        """(asset_id, quantity_type, amount) que este registro aporta a AssetStockSnapshot."""
+        return self.asset_id, self.quantity_type, (self.amount or 0) if self.is_active else 0
+
+    def save(self, *args, **kwargs):
+        # El snapshot se ajusta en la misma transacción que el registro
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = (
+                    AssetLocationModel.objects
+                    .select_for_update()
+                    .filter(pk=self.pk)
+                    .only('asset_id', 'quantity_type', 'amount', 'is_active')
+                    .first()
+                )
+
+            super(AssetLocationModel, self).save(*args, **kwargs)
+
+            AssetStockSnapshot.objects.apply_change(
+                previous.stock_contribution() if previous else None,
+                self.stock_contribution(),
+            )
+
     def asset_name(self):
         return self.asset.asset_name.es_name if self.asset and self.asset.asset_name else _("No Asset")
     
@@ -228,6 +257,139 @@ class AssetLocationModel(TimeStampedModel):
         ]
 
 
+class AssetStockSnapshotManager(models.Manager):
+    def apply_delta(self, asset_id, quantity_type, delta):
+        """Suma delta al total (asset, quantity_type) con un UPDATE atómico."""
+        if not delta:
+            return
+
+        if delta > 0:
+            # Solo se crea la fila al sumar; al restar debe existir (o el activo
+            # se está eliminando en cascada y no hay nada que actualizar).
+            self.get_or_create(asset_id=asset_id, quantity_type=quantity_type)
+
+        self.filter(asset_id=asset_id, quantity_type=quantity_type).update(
+            total=F('total') + delta,
+            updated=timezone.now(),
+        )
+
+    def apply_change(self, old, new):
+        """
+        Aplica el cambio entre dos aportes (asset_id, quantity_type, amount).
+        old es None al crear y new es None al eliminar.
+        """
+        deltas = {}
+        if old:
+            deltas[old[:2]] = deltas.get(old[:2], 0) - old[2]
+        if new:
+            deltas[new[:2]] = deltas.get(new[:2], 0) + new[2]
+
+        for (asset_id, quantity_type), delta in deltas.items():
+            self.apply_delta(asset_id, quantity_type, delta)
+
+    def live_totals(self, asset_ids=None):
+        """Totales recalculados desde los registros activos: {(asset_id, quantity_type): total}."""
+        qs = AssetLocationModel.objects.filter(is_active=True)
+        if asset_ids is not None:
+            qs = qs.filter(asset_id__in=asset_ids)
+
+        return {
+            (row['asset_id'], row['quantity_type']): row['total']
+            for row in qs.values('asset_id', 'quantity_type').annotate(total=Sum('amount')).order_by()
+        }
+
+    def drift(self, asset_ids=None):
+        """
+        Lista de (asset_id, quantity_type, expected, actual) donde el snapshot
+        no coincide con la suma de los registros activos.
+        """
+        expected = self.live_totals(asset_ids)
+
+        qs = self.all()
+        if asset_ids is not None:
+            qs = qs.filter(asset_id__in=asset_ids)
+        actual = {
+            (row['asset_id'], row['quantity_type']): row['total']
+            for row in qs.values('asset_id', 'quantity_type', 'total')
+        }
+
+        drifted = []
+        for key in expected.keys() | actual.keys():
+            if expected.get(key, 0) != actual.get(key, 0):
+                drifted.append((*key, expected.get(key, 0), actual.get(key, 0)))
+        return drifted
+
+    @transaction.atomic
+    def rebuild(self, asset_ids=None):
+        """Reconstruye el snapshot desde cero (o solo para asset_ids). Devuelve filas escritas."""
+        stale = self.all()
+        if asset_ids is not None:
+            stale = stale.filter(asset_id__in=asset_ids)
+        stale.delete()
+
+        rows = [
+            AssetStockSnapshot(asset_id=asset_id, quantity_type=quantity_type, total=total)
+            for (asset_id, quantity_type), total in self.live_totals(asset_ids).items()
+        ]
+        self.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+
+class AssetStockSnapshot(models.Model):
+    """
+    Total desnormalizado por activo y tipo de cantidad de los registros activos
+    de AssetLocationModel. Se mantiene en AssetLocationModel.save() y post_delete.
+    """
+    asset = models.ForeignKey(
+        AssetModel,
+        on_delete=models.CASCADE,
+        related_name="assetlocation_stocksnapshot_asset",
+        verbose_name=_("Asset")
+    )
+
+    quantity_type = models.CharField(
+        _("quantity type"),
+        max_length=255,
+        choices=AssetLocationModel.QuantityTypeChoices.choices,
+    )
+
+    total = models.BigIntegerField(
+        _("total"),
+        default=0
+    )
+
+    updated = models.DateTimeField(
+        _("updated"),
+        auto_now=True
+    )
+
+    objects = AssetStockSnapshotManager()
+
+    def __str__(self) -> str:
+        return "{} - {} - {}".format(
+            self.asset,
+            self.get_quantity_type_display(),
+            self.total,
+        )
+
+    class Meta:
+        db_table = "apps_assets_location_stocksnapshot"
+        verbose_name = _("Stock Snapshot")
+        verbose_name_plural = _("Stock Snapshots")
+        ordering = ["asset", "quantity_type"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["asset", "quantity_type"],
+                name="uniq_stocksnapshot_asset_quantity_type",
+            ),
+        ]
+
+
+post_delete.connect(
+    discount_stock_snapshot_on_delete,
+    sender=AssetLocationModel
+)
+
 auditlog.register(
     AssetCountryModel,
     serialize_data=True
@@ -0,0 +1,5 @@
+def discount_stock_snapshot_on_delete(sender, instance, *args, **kwargs):
+    """Descuenta del snapshot el aporte de un registro eliminado físicamente."""
+    from .models import AssetStockSnapshot
+
+    AssetStockSnapshot.objects.apply_change(instance.stock_contribution(), None)
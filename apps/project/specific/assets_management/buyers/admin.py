@@ -1,17 +1,124 @@
 # apps.project.specific.assets_management.buyers.admin.py
-from django.contrib import admin
+import logging
+
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django.utils.safestring import mark_safe
-from django.utils.translation import gettext_lazy as _
+from django.utils.translation import get_language, gettext_lazy as _
 from import_export.admin import ImportExportActionModelAdmin
 
+from apps.common.utils.images import rendition_url
 from apps.project.common.users.models import UserModel
 from apps.project.specific.assets_management.buyers.models import (
-    OfferModel, ServiceOrderRecipient)
+    OfferDocumentCache, OfferModel, OfferMonthlyRollup, ServiceOrderRecipient)
+from apps.project.specific.assets_management.buyers.pdf_export import \
+    stream_offer_documents_zip
+from apps.project.specific.assets_management.buyers.transitions import (
+    apply_bulk_transition, user_can_apply)
+
+logger = logging.getLogger(__name__)
+
+
+def bulk_transition_action(*, transition: str, label: str, name: str):
+    """
+    Factory de acciones de admin que aplican una transición a las órdenes
+    seleccionadas con apply_bulk_transition (un UPDATE, una transacción).
+    """
+    def _action(modeladmin, request, queryset):
+        if not user_can_apply(request.user, transition):
+            messages.error(request, _("You don't have permission to perform this action."))
+            return
+
+        try:
+            report = apply_bulk_transition(
+                queryset.values_list("pk", flat=True), transition, request.user
+            )
+        except ValidationError as ve:
+            messages.error(request, " ".join(ve.messages))
+            return
+
+        if report.applied:
+            messages.success(request, _("%(count)s purchase orders updated: %(label)s.") % {
+                "count": len(report.applied), "label": label})
+
+        # Conflictos agrupados por motivo, con los primeros IDs de cada grupo
+        by_error = {}
+        for result in report.conflicts:
+            by_error.setdefault(result.error, []).append(str(result.offer_id)[:8])
+        for error, ids in by_error.items():
+            shown = ", ".join(ids[:10]) + ("…" if len(ids) > 10 else "")
+            messages.warning(request, f"{error} ({len(ids)}): {shown}")
+
+    _action.__name__ = name
+    _action.short_description = label
+    return _action
+
+
+action_review = bulk_transition_action(
+    transition="REVIEW", label=_("Mark as reviewed"), name="action_review")
+action_approve = bulk_transition_action(
+    transition="APPROVE", label=_("Approve"), name="action_approve")
+action_so_send = bulk_transition_action(
+    transition="SO_SEND", label=_("Mark service order sent"), name="action_so_send")
+action_pay_create = bulk_transition_action(
+    transition="PAY_CREATE", label=_("Mark payment order created"), name="action_pay_create")
+action_pay_send = bulk_transition_action(
+    transition="PAY_SEND", label=_("Mark payment order sent"), name="action_pay_send")
+action_possession = bulk_transition_action(
+    transition="POSSESSION", label=_("Mark asset in possession"), name="action_possession")
+action_asset_send = bulk_transition_action(
+    transition="ASSET_SEND", label=_("Mark asset sent"), name="action_asset_send")
+action_profit_create = bulk_transition_action(
+    transition="PROFIT_CREATE", label=_("Mark profitability created"), name="action_profit_create")
+action_profit_pay = bulk_transition_action(
+    transition="PROFIT_PAY", label=_("Mark profitability paid"), name="action_profit_pay")
+
+
+@admin.action(description=_("Export purchase/service order PDFs (ZIP)"))
+def export_documents_zip(modeladmin, request, queryset):
+    """
+    Descarga un ZIP con la OC y la OS de cada orden seleccionada. Se entrega en
+    streaming mientras se generan los PDF; el avance queda en el log.
+    """
+    total = queryset.count()
+    step = max(1, (total * 2) // 10)
+
+    def _progress(done, expected):
+        if done % step == 0 or done == expected:
+            logger.info("PDF export for %s: %s/%s documents", request.user, done, expected)
+
+    response = StreamingHttpResponse(
+        stream_offer_documents_zip(
+            queryset,
+            user=request.user,
+            language=(get_language() or "es")[:2],
+            on_progress=_progress,
+        ),
+        content_type="application/zip",
+    )
+    filename = f"purchase_orders_{timezone.localtime():%Y%m%d_%H%M}.zip"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
 
 
 @admin.register(OfferModel)
 class OfferModelAdmin(ImportExportActionModelAdmin, admin.ModelAdmin):
+    actions = [
+        action_review,
+        action_approve,
+        action_so_send,
+        action_pay_create,
+        action_pay_send,
+        action_possession,
+        action_asset_send,
+        action_profit_create,
+        action_profit_pay,
+        export_documents_zip,
+    ]
+
     autocomplete_fields = (
         "created_by",
         "asset",
@@ -37,6 +144,7 @@ class OfferModelAdmin(ImportExportActionModelAdmin, admin.ModelAdmin):
         "offer_type",
         "quantity_type",
         "offer_quantity",
+        "status_code",
         "is_active",
         "display",
         "is_approved",
@@ -48,6 +156,7 @@ class OfferModelAdmin(ImportExportActionModelAdmin, admin.ModelAdmin):
     )
 
     list_filter = (
+        "status_code",
         "is_active",
         "display",
         "is_approved",
@@ -78,6 +187,8 @@ class OfferModelAdmin(ImportExportActionModelAdmin, admin.ModelAdmin):
         # base timestamps
         "created",
         "updated",
+        # persisted workflow status
+        "status_code",
         # approval / review timestamps
         "approved_by_timestamp",
         "reviewed_by_timestamp",
@@ -96,6 +207,7 @@ class OfferModelAdmin(ImportExportActionModelAdmin, admin.ModelAdmin):
         "propensiones_mark_at",
         # thumb img
         "image_thumb",
+        "processing_state",
     )
 
     fieldsets = (
@@ -114,6 +226,7 @@ class OfferModelAdmin(ImportExportActionModelAdmin, admin.ModelAdmin):
         (_("Thumbnail"), {
             "fields": (
                 "image_thumb",
+                "processing_state",
             ),
         }),
         (_("Descriptions & Observations"), {
@@ -133,6 +246,7 @@ class OfferModelAdmin(ImportExportActionModelAdmin, admin.ModelAdmin):
                 "reviewed_by_timestamp",
                 "is_approved",
                 "reviewed",
+                "status_code",
             ),
         }),
         (_("Service Order"), {
@@ -279,8 +393,10 @@ class OfferModelAdmin(ImportExportActionModelAdmin, admin.ModelAdmin):
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
     def image_thumb(self, obj):
-        if obj.offer_img:
-            return mark_safe(f'<img src="{obj.offer_img.url}" style="max-width:180px; border-radius:8px;" />')
+        # Miniatura generada en segundo plano; la original mientras no exista
+        url = rendition_url(obj, "thumb")
+        if url:
+            return mark_safe(f'<img src="{url}" style="max-width:180px; border-radius:8px;" />')
         return "-"
 
     image_thumb.short_description = "Preview"
@@ -311,3 +427,69 @@ class ServiceOrderRecipientAdmin(ImportExportActionModelAdmin, admin.ModelAdmin)
     list_filter = (
         "is_active",
     )
+
+
+@admin.register(OfferMonthlyRollup)
+class OfferMonthlyRollupAdmin(admin.ModelAdmin):
+    # Tabla derivada: se mantiene desde OfferModel, no se edita a mano
+    list_display = (
+        "month",
+        "created_count",
+        "closed_count",
+        "in_progress_count",
+        "paid_count",
+        "updated",
+    )
+
+    date_hierarchy = "month"
+    ordering = ("-month",)
+
+    readonly_fields = (
+        "month",
+        "created_count",
+        "closed_count",
+        "in_progress_count",
+        "paid_count",
+        "updated",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(OfferDocumentCache)
+class OfferDocumentCacheAdmin(admin.ModelAdmin):
+    # PDF generados: se crean al enviar/descargar y se pueden borrar para forzar un nuevo render
+    list_display = (
+        "offer",
+        "kind",
+        "size",
+        "hits",
+        "created",
+        "last_accessed",
+    )
+
+    list_filter = ("kind",)
+    search_fields = ("offer__id", "fingerprint")
+    list_select_related = ("offer__asset__asset_name", "offer__buyer_country")
+    date_hierarchy = "last_accessed"
+
+    readonly_fields = (
+        "offer",
+        "kind",
+        "fingerprint",
+        "file",
+        "size",
+        "hits",
+        "created",
+        "last_accessed",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,4 +4,9 @@ from django.apps import AppConfig
 class BuyersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.project.specific.assets_management.buyers'
-    verbose_name = 'Buyers'
\ No newline at end of file
+    verbose_name = 'Buyers'
+
+    def ready(self):
+        # Imágenes fijas y estilos de los PDF de OC/OS: se cargan una vez por proceso
+        from .functions.pdf_resources import pdf_resources
+        pdf_resources.load()
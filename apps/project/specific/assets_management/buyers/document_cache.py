@@ -0,0 +1,152 @@
+# apps/project/specific/assets_management/buyers/document_cache.py
+"""
+Caché direccionada por contenido de los PDF de Orden de Compra (PO) y Orden de Servicio (SO).
+
+Clave: tipo + orden + sha256 de los valores que aparecen en el documento
+(más el idioma y DOCUMENT_LAYOUT_VERSION). El PDF se guarda en el storage
+(OfferDocumentCache.file) y los reenvíos / descargas reutilizan esos bytes.
+
+- Si cambia cualquier campo de DOCUMENT_SOURCE_FIELDS, la señal post_save de
+  OfferModel borra las entradas de la orden (on_commit).
+- Cambios fuera de la orden (p.ej. el nombre del activo) cambian la huella: la
+  siguiente lectura es un fallo y la entrada vieja deja de usarse.
+- `manage.py prune_offer_documents` elimina las entradas sin acceso reciente.
+
+Si se modifica el diseño de los PDF, incrementar DOCUMENT_LAYOUT_VERSION.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import get_language
+
+from apps.common.utils.models import ImageProcessingState
+
+from .models import OfferDocumentCache
+from .pdf_pool import render_pdf
+
+Kind = OfferDocumentCache.KindChoices
+
+DOCUMENT_LAYOUT_VERSION = 1
+
+# Campos de OfferModel que aparecen en algún documento (invalidación en post_save)
+DOCUMENT_SOURCE_FIELDS = (
+    "created", "asset", "quantity_type", "offer_quantity",
+    "es_observation", "en_observation", "es_description", "en_description",
+    "offer_img",
+)
+
+FILENAMES = {
+    Kind.PURCHASE_ORDER: "purchase_order_{id}.pdf",
+    Kind.SERVICE_ORDER: "orden_servicio_{ID}.pdf",
+}
+
+
+def _max_age() -> timedelta:
+    return timedelta(days=getattr(settings, "BUYERS_DOCUMENT_CACHE_MAX_AGE_DAYS", 30))
+
+
+def document_filename(kind: str, offer) -> str:
+    return FILENAMES[kind].format(id=offer.id, ID=str(offer.id).upper())
+
+
+def document_source(kind: str, offer, user) -> dict:
+    """Valores que el generador de `kind` imprime en el PDF."""
+    source = {
+        "layout": DOCUMENT_LAYOUT_VERSION,
+        "language": (get_language() or "es")[:2],
+        "id": str(offer.id),
+        "created": offer.created.isoformat() if offer.created else "",
+        "asset": offer.asset_display_name,
+        "quantity_type": str(offer.get_quantity_type_display()),
+        "quantity": offer.offer_quantity,
+        "es_observation": offer.es_observation or "",
+        "es_description": offer.es_description or "",
+        "offer_img": offer.offer_img.name if offer.offer_img else "",
+        # Con la versión de impresión lista el PDF se vuelve a generar con ella
+        "offer_img_ready": offer.processing_state == ImageProcessingState.READY,
+    }
+    if kind == Kind.PURCHASE_ORDER:
+        # La OC imprime además los textos en inglés y quién la autoriza
+        source.update({
+            "en_observation": offer.en_observation or "",
+            "en_description": offer.en_description or "",
+            "authorized_by": user.get_full_name() if user else "",
+        })
+    return source
+
+
+def document_fingerprint(kind: str, offer, user) -> str:
+    raw = json.dumps(document_source(kind, offer, user), sort_keys=True, default=str)
+    return hashlib.sha256(f"{kind}|{raw}".encode()).hexdigest()
+
+
+def _lookup(kind: str, offer, user) -> dict:
+    return {"offer_id": offer.pk, "kind": kind, "fingerprint": document_fingerprint(kind, offer, user)}
+
+
+def find_offer_document(kind: str, offer, user, *, lookup: dict = None):
+    """Entrada vigente del PDF `kind` de la orden, o None (no genera nada)."""
+    lookup = lookup or _lookup(kind, offer, user)
+    entry = OfferDocumentCache.objects.filter(**lookup).first()
+    if entry is None:
+        return None
+    if not (entry.file and entry.file.storage.exists(entry.file.name)):
+        entry.delete()
+        return None
+    OfferDocumentCache.objects.filter(pk=entry.pk).update(
+        hits=F("hits") + 1, last_accessed=timezone.now()
+    )
+    return entry
+
+
+def get_offer_document(kind: str, offer, user) -> OfferDocumentCache:
+    """
+    Entrada de caché del PDF `kind` de la orden; lo genera y guarda si no existe
+    (o si su archivo desapareció del storage).
+    """
+    lookup = _lookup(kind, offer, user)
+    entry = find_offer_document(kind, offer, user, lookup=lookup)
+    if entry is not None:
+        return entry
+
+    # Render en el pool de procesos (puede lanzar PdfRenderError)
+    pdf_bytes = render_pdf(kind, offer, user)
+    entry = OfferDocumentCache(size=len(pdf_bytes), **lookup)
+    entry.file.save(f"{kind.lower()}.pdf", ContentFile(pdf_bytes), save=False)
+    try:
+        with transaction.atomic():
+            entry.save()
+    except IntegrityError:
+        # Otro proceso generó el mismo documento a la vez: se usa el suyo
+        entry.file.storage.delete(entry.file.name)
+        entry = OfferDocumentCache.objects.get(**lookup)
+    return entry
+
+
+def get_offer_document_bytes(kind: str, offer, user) -> bytes:
+    entry = get_offer_document(kind, offer, user)
+    with entry.file.open("rb") as fh:
+        return fh.read()
+
+
+def invalidate_offer_documents(*offer_ids):
+    """Borra (al confirmar la transacción) los PDF cacheados de las órdenes indicadas."""
+    offer_ids = [pk for pk in offer_ids if pk]
+    if offer_ids:
+        transaction.on_commit(
+            lambda: OfferDocumentCache.objects.filter(offer_id__in=offer_ids).delete()
+        )
+
+
+def prune_offer_documents(max_age: timedelta = None) -> int:
+    """Elimina las entradas sin acceso en `max_age` (BUYERS_DOCUMENT_CACHE_MAX_AGE_DAYS). Devuelve cuántas."""
+    cutoff = timezone.now() - (max_age if max_age is not None else _max_age())
+    deleted, _by_model = OfferDocumentCache.objects.filter(last_accessed__lt=cutoff).delete()
+    return deleted
@@ -6,6 +6,7 @@ from django_select2 import forms as s2forms
 
 from apps.project.specific.assets_management.assets.models import AssetModel
 
+from .fragment_cache import invalidate_offer_fragments
 from .models import OfferModel, ServiceOrderRecipient
 
 UserModel = get_user_model()
@@ -142,3 +143,5 @@ class ServiceOrderRecipientsForm(forms.Form):
             objs.append(ServiceOrderRecipient(offer=offer, user_type=ut, added_by=added_by))
         if objs:
             ServiceOrderRecipient.objects.bulk_create(objs, ignore_conflicts=True)
+            # bulk_create no emite post_save: invalidación explícita
+            invalidate_offer_fragments(offer.pk)
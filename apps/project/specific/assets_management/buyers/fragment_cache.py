@@ -0,0 +1,101 @@
+# apps/project/specific/assets_management/buyers/fragment_cache.py
+"""
+Caché de fragmentos HTML del wizard de aprobación y del timeline de una orden.
+
+Clave: offer.pk + offer.updated + versión de la orden + idioma + huella de permisos.
+
+- `offer.updated` cambia con cada transición (single y bulk), incluso entre procesos.
+- La versión de la orden vive en la caché y se invalida explícitamente en cada
+  transición y en cada cambio de destinatarios de la OS (on_commit).
+- El HTML se guarda con un marcador en lugar del token CSRF y se sustituye por
+  el token de la petición al servirlo: nunca se comparte el token de otro usuario.
+
+Para que la invalidación por destinatarios llegue a todos los workers, CACHES
+debe apuntar a un backend compartido (Redis/Memcached); con LocMemCache cada
+proceso depende del TTL (BUYERS_FRAGMENT_CACHE_TIMEOUT).
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.translation import get_language
+
+WIZARD_TEMPLATE = "dashboard/pages/buyers/wizard/partials/_offer_approval_wizard.html"
+TIMELINE_TEMPLATE = "dashboard/pages/buyers/partials/timeline/_timeline_wrapper.html"
+
+CSRF_PLACEHOLDER = "__gea_fragment_csrf_token__"
+KEY_PREFIX = "buyers:offer-fragment"
+
+
+def _timeout() -> int:
+    return getattr(settings, "BUYERS_FRAGMENT_CACHE_TIMEOUT", 300)
+
+
+def _version_key(offer_id) -> str:
+    return f"{KEY_PREFIX}:version:{offer_id}"
+
+
+def get_offer_version(offer_id) -> str:
+    """
+    Versión actual de los fragmentos de la orden.
+    Si no existe (o fue invalidada) se crea una nueva, así las claves antiguas quedan huérfanas.
+    """
+    key = _version_key(offer_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key) or uuid.uuid4().hex
+    return version
+
+
+def invalidate_offer_fragments(*offer_ids):
+    """
+    Descarta los fragmentos cacheados de las órdenes indicadas.
+    Se ejecuta al confirmar la transacción para no re-cachear datos aún no visibles.
+    """
+    keys = [_version_key(pk) for pk in offer_ids if pk]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def permission_fingerprint(user) -> str:
+    """Huella del conjunto de permisos/roles que usan las plantillas (perms.*, is_buyer, is_superuser)."""
+    if user.is_superuser:
+        return "su"
+    perms = sorted(user.get_all_permissions())
+    raw = "|".join([f"buyer={int(bool(getattr(user, 'is_buyer', False)))}", *perms])
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def fragment_key(kind: str, request, offer) -> str:
+    lang = (getattr(request, "LANGUAGE_CODE", None) or get_language() or "en")[:2]
+    updated = offer.updated.timestamp() if offer.updated else 0
+    return ":".join([
+        KEY_PREFIX,
+        kind,
+        str(offer.pk),
+        f"{updated:.6f}",
+        get_offer_version(offer.pk),
+        lang,
+        permission_fingerprint(request.user),
+    ])
+
+
+def render_offer_fragment(kind: str, request, offer, template_name: str, build_context) -> str:
+    """
+    Devuelve el HTML del fragmento `kind` desde la caché o lo renderiza con
+    `build_context()` (solo se evalúa en un fallo de caché).
+    """
+    key = fragment_key(kind, request, offer)
+    html = cache.get(key)
+    if html is None:
+        ctx = dict(build_context())
+        ctx["csrf_token"] = CSRF_PLACEHOLDER
+        html = render_to_string(template_name, ctx, request=request)
+        cache.set(key, html, _timeout())
+    return html.replace(CSRF_PLACEHOLDER, get_token(request))
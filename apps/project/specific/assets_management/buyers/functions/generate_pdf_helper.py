@@ -1,20 +1,92 @@
 import io
 
+from PIL import Image as PILImage
+from PIL import ImageOps
+from reportlab.lib.pagesizes import A4
 from reportlab.platypus import Image, Spacer
 
+# Marco de la imagen de la oferta en los PDF de OC/OS (A4 con márgenes de 20pt)
+OFFER_IMAGE_FRAME_WIDTH = A4[0] - 40
+OFFER_IMAGE_MAX_HEIGHT = 200
 
-def build_offer_image_story(offer, doc, max_height=200):
+# Resolución de la versión de impresión de offer_img (rendition "print")
+OFFER_IMAGE_PRINT_DPI = 200
+OFFER_IMAGE_PRINT_QUALITY = 85
+
+
+def offer_image_frame(iw, ih, frame_width=OFFER_IMAGE_FRAME_WIDTH, max_height=OFFER_IMAGE_MAX_HEIGHT):
+    """
+    Tamaño (ancho, alto) en puntos con el que se dibuja una imagen de iw x ih:
+    ajustada al ancho del documento manteniendo proporción y con altura limitada.
+    """
+    scale = frame_width / float(iw)
+    new_width = frame_width
+    new_height = ih * scale
+
+    # limitar altura si es muy grande
+    if new_height > max_height:
+        factor = max_height / new_height
+        new_width *= factor
+        new_height *= factor
+
+    return new_width, new_height
+
+
+def build_offer_print_image(file):
+    """
+    JPEG de la imagen de la oferta al tamaño exacto del marco del PDF
+    (a OFFER_IMAGE_PRINT_DPI). Reportlab lo incrusta tal cual (DCT), sin
+    decodificar ni reescalar en cada render. Devuelve bytes o None.
+    """
+    file.seek(0)
+    img = ImageOps.exif_transpose(PILImage.open(file))
+    iw, ih = img.size
+    if not iw or not ih:
+        return None
+
+    width_pt, height_pt = offer_image_frame(iw, ih)
+    size = (
+        max(1, round(width_pt / 72 * OFFER_IMAGE_PRINT_DPI)),
+        max(1, round(height_pt / 72 * OFFER_IMAGE_PRINT_DPI)),
+    )
+
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        # JPEG no tiene transparencia: se aplana sobre blanco
+        img = img.convert("RGBA")
+        background = PILImage.new("RGB", img.size, "white")
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    if size[0] < iw:
+        img = img.resize(size, PILImage.Resampling.LANCZOS)
+
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=OFFER_IMAGE_PRINT_QUALITY, optimize=True)
+    return out.getvalue()
+
+
+def build_offer_image_story(offer, doc, max_height=OFFER_IMAGE_MAX_HEIGHT):
     """
     Devuelve una lista de Flowables (Imagen + Spacer) con la imagen de la oferta,
     ajustada al ancho del documento, o lista vacía si no hay imagen.
+    Usa la versión de impresión (rendition "print") si existe.
     """
-    if not offer.offer_img:
+    source = None
+    if hasattr(offer, "renditions"):
+        # Import local: los procesos del pool importan este módulo antes de django.setup()
+        # (y reciben un OfferSnapshot con la imagen ya resuelta)
+        from apps.common.utils.images import rendition_file
+        source = rendition_file(offer, "print")
+    source = source or offer.offer_img
+    if not source:
         return []
 
     try:
         # Abrir el archivo desde el storage
-        offer.offer_img.open('rb')
-        img_bytes = offer.offer_img.read()
+        source.open('rb')
+        img_bytes = source.read()
     except Exception:
         return []
 
@@ -27,18 +99,7 @@ def build_offer_image_story(offer, doc, max_height=200):
     if iw == 0 or ih == 0:
         return []
 
-    scale = doc.width / float(iw)
-    new_width = doc.width
-    new_height = ih * scale
-
-    # limitar altura si es muy grande
-    if new_height > max_height:
-        factor = max_height / new_height
-        new_width *= factor
-        new_height *= factor
-
-    img.drawWidth = new_width
-    img.drawHeight = new_height
+    img.drawWidth, img.drawHeight = offer_image_frame(iw, ih, doc.width, max_height)
     img.hAlign = "CENTER"
 
     return [img, Spacer(1, 10)]
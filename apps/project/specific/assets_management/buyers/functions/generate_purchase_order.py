@@ -3,12 +3,12 @@ import io
 from reportlab.graphics.barcode import code128
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import mm
-from reportlab.platypus import (Image, Paragraph, SimpleDocTemplate, Spacer,
-                                Table, TableStyle)
+from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer, Table,
+                                TableStyle)
 
 from .generate_pdf_helper import build_offer_image_story
+from .pdf_resources import pdf_resources
 
 
 def generate_purchase_order_pdf(offer, user):
@@ -22,14 +22,11 @@ def generate_purchase_order_pdf(offer, user):
         bottomMargin=30
     )
     elements = []
-    styles = getSampleStyleSheet()
+    # Estilos e imágenes precargados una vez por proceso (sin red)
+    styles = pdf_resources.styles
 
     # ---------------- LOGOS ----------------
-    logo_header = Image(
-        "https://geausa.propensionesabogados.com/public/static/assets/imgs/logos/ipcon_brands_po_so.webp",
-        width=doc.width,
-        height=80
-    )
+    logo_header = pdf_resources.image("header_logo", width=doc.width, height=80)
     logo_header.hAlign = "CENTER"  # Centra la imagen en el PDF
 
     elements.append(logo_header)
@@ -53,9 +50,7 @@ def generate_purchase_order_pdf(offer, user):
     elements.append(barcode_table)
 
     # Texto debajo del código de barras centrado
-    centered_style = ParagraphStyle(
-        name="Centered", parent=styles["Normal"], alignment=1
-    )
+    centered_style = styles["Centered"]
 
     elements.append(Paragraph(barcode_value, centered_style))
     elements.append(Spacer(1, 20))
@@ -64,13 +59,7 @@ def generate_purchase_order_pdf(offer, user):
     fecha = offer.created
 
     # Columna izquierda (Purchase Order ID con estilo rojo y grande)
-    id_style = ParagraphStyle(
-        name="IdStyle",
-        parent=styles["Normal"],
-        textColor=colors.red,
-        fontSize=12,       # más grande
-        leading=16,        # interlineado para que respire
-    )
+    id_style = styles["IdStyle"]
 
     left_cell = Table(
         [[
@@ -206,11 +195,7 @@ def generate_purchase_order_pdf(offer, user):
     elements.append(Spacer(1, 30))
 
     # ---------------- FOOTER ----------------
-    footer_img = Image(
-        "https://geausa.propensionesabogados.com/public/static/assets/imgs/purchase_order/stamp_mitch.webp",
-        width=80,
-        height=80
-    )
+    footer_img = pdf_resources.image("stamp_mitch", width=80, height=80)
 
     contacto = "\nmitch@recoveryrepatriationfoundation.com\n+1 609 342 71 06"
 
@@ -230,11 +215,7 @@ def generate_purchase_order_pdf(offer, user):
 
     # Footer completo: bloque contacto a la izquierda + firma a la derecha
     # Sello izquierdo (Mitch)
-    stamp_left = Image(
-        "https://geausa.propensionesabogados.com/public/static/assets/imgs/purchase_order/stamp_mitch.webp",
-        width=80,
-        height=80
-    )
+    stamp_left = pdf_resources.image("stamp_mitch", width=80, height=80)
 
     contacto_left = Paragraph(
         "mitch@recoveryrepatriationfoundation.com<br/>+1 609 342 71 06",
@@ -257,11 +238,7 @@ def generate_purchase_order_pdf(offer, user):
 
 
     # Sello derecho (Propensiones)
-    stamp_right = Image(
-        "https://geausa.propensionesabogados.com/public/static/assets/imgs/purchase_order/stamp_propensiones.webp",
-        width=80,
-        height=80
-    )
+    stamp_right = pdf_resources.image("stamp_propensiones", width=80, height=80)
 
     contacto_right = Paragraph(
         "director@propensionesabogados.com<br/>+57 3012283818",
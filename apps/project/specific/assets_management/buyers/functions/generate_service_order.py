@@ -3,12 +3,12 @@ import io
 from reportlab.graphics.barcode import code128
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import mm
-from reportlab.platypus import (Image, Paragraph, SimpleDocTemplate, Spacer,
-                                Table, TableStyle)
+from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer, Table,
+                                TableStyle)
 
 from .generate_pdf_helper import build_offer_image_story
+from .pdf_resources import pdf_resources
 
 
 def generate_service_order_pdf(offer, user):
@@ -22,14 +22,11 @@ def generate_service_order_pdf(offer, user):
         bottomMargin=30
     )
     elements = []
-    styles = getSampleStyleSheet()
+    # Estilos e imágenes precargados una vez por proceso (sin red)
+    styles = pdf_resources.styles
 
     # ---------------- LOGOS ----------------
-    logo_header = Image(
-        "https://geausa.propensionesabogados.com/public/static/assets/imgs/logos/ipcon_brands_po_so.webp",
-        width=doc.width,
-        height=80
-    )
+    logo_header = pdf_resources.image("header_logo", width=doc.width, height=80)
     logo_header.hAlign = "CENTER"  # Centra la imagen en el PDF
 
     elements.append(logo_header)
@@ -53,9 +50,7 @@ def generate_service_order_pdf(offer, user):
     elements.append(barcode_table)
 
     # Texto debajo del código de barras centrado
-    centered_style = ParagraphStyle(
-        name="Centered", parent=styles["Normal"], alignment=1
-    )
+    centered_style = styles["Centered"]
 
     elements.append(Paragraph(barcode_value, centered_style))
     elements.append(Spacer(1, 20))
@@ -64,13 +59,7 @@ def generate_service_order_pdf(offer, user):
     fecha = offer.created
 
     # Columna izquierda (Purchase Order ID con estilo rojo y grande)
-    id_style = ParagraphStyle(
-        name="IdStyle",
-        parent=styles["Normal"],
-        textColor=colors.red,
-        fontSize=12,       # más grande
-        leading=16,        # interlineado para que respire
-    )
+    id_style = styles["IdStyle"]
 
     left_cell = Table(
         [[
@@ -204,17 +193,9 @@ def generate_service_order_pdf(offer, user):
     elements.append(Spacer(1, 30))
 
     # ---------------- FOOTER ----------------
-    footer_img = Image(
-        "https://geausa.propensionesabogados.com/public/static/assets/imgs/purchase_order/stamp_propensiones.webp",
-        width=90,
-        height=90
-    )
+    footer_img = pdf_resources.image("stamp_propensiones", width=90, height=90)
     
-    centered_text = ParagraphStyle(
-        name="CenteredText",
-        parent=styles["Normal"],
-        alignment=1
-    )
+    centered_text = styles["Centered"]
 
     contacto = Paragraph(
         "director@propensionesabogados.com<br/>+57 318 328 01 76",
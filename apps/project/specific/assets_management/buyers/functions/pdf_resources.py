@@ -0,0 +1,134 @@
+"""
+Recursos compartidos de los PDF de Orden de Compra / Orden de Servicio.
+
+Las imágenes fijas (logo de cabecera y sellos) se leen una sola vez por proceso
+desde staticfiles y quedan decodificadas en un `ImageReader`; los estilos de
+párrafo se construyen una sola vez. Así generar un PDF no hace ninguna petición
+de red ni vuelve a decodificar las imágenes.
+
+    pdf_resources.image("stamp_mitch", width=80, height=80)
+    pdf_resources.styles["Centered"]
+"""
+
+import io
+import logging
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image, Spacer
+
+logger = logging.getLogger(__name__)
+
+# Streams binarios (Flate/DCT) sin envoltura ASCII85: el codificador ASCII85 en
+# Python puro era la mayor parte del tiempo de render de las imágenes.
+rl_config.useA85 = 0
+
+# nombre -> ruta relativa a static (se puede ampliar con settings.PDF_STATIC_IMAGES)
+DEFAULT_PDF_IMAGES = {
+    "header_logo": "assets/imgs/logos/ipcon_brands_po_so.webp",
+    "stamp_mitch": "assets/imgs/purchase_order/stamp_mitch.webp",
+    "stamp_propensiones": "assets/imgs/purchase_order/stamp_propensiones.webp",
+}
+
+
+def build_pdf_styles():
+    """Hoja de estilos base + estilos propios de las órdenes."""
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name="Centered", parent=styles["Normal"], alignment=1
+    ))
+    styles.add(ParagraphStyle(
+        name="IdStyle",
+        parent=styles["Normal"],
+        textColor=colors.red,
+        fontSize=12,
+        leading=16,
+    ))
+    return styles
+
+
+@dataclass(frozen=True)
+class PdfImage:
+    name: str
+    path: str
+    content: bytes
+    reader: ImageReader
+
+
+class CachedImage(Image):
+    """Flowable Image sobre un ImageReader ya decodificado (no lo vuelve a leer)."""
+
+    def __init__(self, pdf_image: PdfImage, width=None, height=None, **kwargs):
+        # Con _img ya asignado, Image no abre ni decodifica el archivo
+        self._img = pdf_image.reader
+        super().__init__(io.BytesIO(pdf_image.content), width=width, height=height, **kwargs)
+
+
+class PdfResourceRegistry:
+    def __init__(self, images: dict):
+        self._paths = dict(images)
+        self._images = {}
+        self._styles = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> dict:
+        """Lee y decodifica todas las imágenes registradas. Las faltantes se registran en el log."""
+        with self._lock:
+            images = {}
+            for name, path in self._paths.items():
+                found = finders.find(path)
+                if not found:
+                    logger.warning("PDF image '%s' not found in static files: %s", name, path)
+                    continue
+                with open(found, "rb") as fh:
+                    content = fh.read()
+
+                reader = ImageReader(io.BytesIO(content))
+                # Decodifica ahora: los renders posteriores solo leen los datos ya calculados
+                reader.getRGBData()
+                if reader._dataA is not None:
+                    reader._dataA.getRGBData()
+                images[name] = PdfImage(name, path, content, reader)
+
+            self._images = images
+            self._styles = build_pdf_styles()
+            self._loaded = True
+            return images
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    @property
+    def styles(self):
+        self._ensure_loaded()
+        return self._styles
+
+    def get(self, name: str):
+        """PdfImage registrada bajo `name`, o None si no existe / no se encontró."""
+        self._ensure_loaded()
+        return self._images.get(name)
+
+    def image(self, name: str, width=None, height=None, **kwargs):
+        """
+        Flowable con la imagen `name` al tamaño indicado.
+        Si la imagen no está disponible se devuelve un espacio del mismo tamaño
+        (el PDF se genera igual, sin la imagen).
+        """
+        pdf_image = self.get(name)
+        if pdf_image is None:
+            return Spacer(width or 0, height or 0)
+        return CachedImage(pdf_image, width=width, height=height, **kwargs)
+
+
+pdf_resources = PdfResourceRegistry({
+    **DEFAULT_PDF_IMAGES,
+    **getattr(settings, "PDF_STATIC_IMAGES", {}),
+})
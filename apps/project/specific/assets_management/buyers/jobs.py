@@ -0,0 +1,125 @@
+# apps/project/specific/assets_management/buyers/jobs.py
+"""
+Trabajos en segundo plano de compradores (ver apps.common.utils.jobs).
+"""
+
+import logging
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.template.loader import render_to_string
+from django.utils.html import escape
+from django.utils.translation import gettext as _
+from django.utils.translation import override
+
+from apps.common.utils.email_builder import EmailBuilder
+from apps.common.utils.jobs import job
+from apps.common.utils.outbox import queue_email
+
+from .document_cache import document_filename, get_offer_document_bytes
+from .models import OfferDocumentCache, OfferModel
+from .transitions import apply_transition
+
+logger = logging.getLogger(__name__)
+
+UserModel = get_user_model()
+
+SERVICE_ORDER_NOTIFICATION_JOB = "buyers.send_service_order_notification"
+
+
+def resolve_so_emails(offer):
+    # Usuarios seleccionados explícitos
+    user_ids = list(
+        offer.so_recipients.filter(user__isnull=False)
+        .values_list('user_id', flat=True)
+    )
+    # Tipos seleccionados
+    type_codes = list(
+        offer.so_recipients.filter(user_type__isnull=False)
+             .values_list('user_type', flat=True)
+    )
+
+    qs_users = UserModel.objects.filter(is_active=True)
+    emails = set()
+
+    if user_ids:
+        for email in qs_users.filter(id__in=user_ids).values_list('email', flat=True):
+            if email:
+                emails.add(email)
+
+    if type_codes:
+        for email in qs_users.filter(user_type__in=type_codes).values_list('email', flat=True):
+            if email:
+                emails.add(email)
+
+    return sorted(set(emails))
+
+
+@job(SERVICE_ORDER_NOTIFICATION_JOB)
+def send_service_order_notification(offer_id, user_id, review_url, language="es",
+                                    notification_id=None):
+    """
+    Deja la Orden de Servicio (HTML + PDF) en la bandeja de salida para los
+    destinatarios de la orden y la marca como enviada (SO_SEND). Se encola desde
+    el paso SO_NOTIFY del wizard; `notification_id` identifica ese envío, así un
+    reintento del trabajo no duplica el correo.
+    """
+    offer = (
+        OfferModel.objects
+        .select_related("asset__asset_name", "buyer_country")
+        .get(pk=offer_id)
+    )
+    user = UserModel.objects.get(pk=user_id)
+
+    recipients = resolve_so_emails(offer)
+    if not recipients:
+        logger.warning("Service order %s: no recipients to notify", offer.pk)
+        return
+
+    with override(language):
+        safe_data = {
+            "po_short": str(offer.id)[:8],
+            "asset_es": escape(getattr(offer.asset.asset_name, "es_name", "")),
+            "tipo_cantidad_es": escape(offer.get_quantity_type_display()),
+            "cantidad": offer.offer_quantity,
+            "pais_comprador_es": escape(str(offer.buyer_country or "")),
+            "obs_es": escape(offer.es_observation or ""),
+            "desc_es": escape(offer.es_description or ""),
+            "created": offer.service_order_created_at or offer.created,
+            "sent_at": offer.service_order_sent_at,
+            "review_url": review_url,
+            "user_name": escape(user.get_full_name()),
+            "user_email": escape(user.email),
+            "logo_cid": "gea_logo",
+        }
+
+        subject = _("Service Order Notification for OC: %(po)s") % {
+            "po": str(offer.id)}
+        html_content = render_to_string(
+            "email/service_order_email_template.html", safe_data)
+
+        builder = EmailBuilder(
+            subject,
+            "Orden de Servicio adjunta",
+            html=html_content,
+            from_email="no-reply@propensionesabogados.com",
+            bcc=recipients,
+        )
+        # Logo inline desde el registro en memoria (sin red)
+        builder.inline_asset("gea_logo")
+
+        # Adjuntar PDF (reenvíos sin cambios reutilizan el PDF cacheado)
+        kind = OfferDocumentCache.KindChoices.SERVICE_ORDER
+        pdf_bytes = get_offer_document_bytes(kind, offer, user)
+        builder.attach(document_filename(kind, offer), pdf_bytes, "application/pdf")
+        email = builder.build()
+
+    queue_email(
+        email,
+        idempotency_key=f"so-notify:{offer.pk}:{notification_id or uuid.uuid4()}",
+        category="buyers.service_order",
+    )
+
+    if not offer.service_order_sent_at:
+        # Si otra persona ya la marcó como enviada, el conflicto se ignora
+        apply_transition(offer, "SO_SEND", user)
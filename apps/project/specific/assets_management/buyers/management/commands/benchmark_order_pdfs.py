@@ -0,0 +1,75 @@
+# apps/project/specific/assets_management/buyers/management/commands/benchmark_order_pdfs.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.project.specific.assets_management.buyers.functions import (
+    generate_purchase_order_pdf, generate_service_order_pdf)
+from apps.project.specific.assets_management.buyers.functions.pdf_resources import \
+    pdf_resources
+from apps.project.specific.assets_management.buyers.models import OfferModel
+
+GENERATORS = {
+    "po": generate_purchase_order_pdf,
+    "so": generate_service_order_pdf,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide cuántos PDF de Orden de Compra / Orden de Servicio se generan por segundo: "
+        "'cold' recarga imágenes y estilos en cada render (comportamiento anterior, sin "
+        "contar la descarga por red); 'warm' usa los recursos precargados."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--offer",
+            help="ID de la orden a renderizar (default: la más reciente).",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Renders por documento y modo (default: 20).",
+        )
+        parser.add_argument(
+            "--kind",
+            choices=["po", "so", "both"],
+            default="both",
+            help="Documento a medir (default: both).",
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+
+        offers = OfferModel.objects.select_related("asset__asset_name", "created_by")
+        offer = offers.filter(pk=options["offer"]).first() if options["offer"] else offers.order_by("-created").first()
+        if offer is None:
+            raise CommandError("No purchase order found to render.")
+        user = offer.created_by
+
+        kinds = ["po", "so"] if options["kind"] == "both" else [options["kind"]]
+        for kind in kinds:
+            generate = GENERATORS[kind]
+            generate(offer, user)  # calentamiento (imports, fuentes)
+
+            results = {}
+            for mode in ("cold", "warm"):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    if mode == "cold":
+                        pdf_resources.load()
+                    generate(offer, user)
+                elapsed = time.perf_counter() - start
+                results[mode] = iterations / elapsed if elapsed else 0.0
+
+            speedup = results["warm"] / results["cold"] if results["cold"] else 0.0
+            self.stdout.write(
+                f"{kind.upper()}: cold {results['cold']:.1f} renders/s, "
+                f"warm {results['warm']:.1f} renders/s (x{speedup:.2f})"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Benchmark finished for order {offer.pk} ({iterations} renders per mode)."
+        ))
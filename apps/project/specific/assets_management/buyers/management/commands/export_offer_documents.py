@@ -0,0 +1,106 @@
+# apps/project/specific/assets_management/buyers/management/commands/export_offer_documents.py
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from apps.project.specific.assets_management.buyers.models import (
+    OfferDocumentCache, OfferModel)
+from apps.project.specific.assets_management.buyers.pdf_export import \
+    stream_offer_documents_zip
+
+KINDS = {
+    "po": OfferDocumentCache.KindChoices.PURCHASE_ORDER,
+    "so": OfferDocumentCache.KindChoices.SERVICE_ORDER,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta en un ZIP los PDF de Orden de Compra / Orden de Servicio de las órdenes "
+        "indicadas (por mes, rango de fechas de creación o IDs)."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--output",
+            required=True,
+            help="Ruta del archivo ZIP a escribir.",
+        )
+        parser.add_argument(
+            "--month",
+            help="Mes de creación, formato YYYY-MM.",
+        )
+        parser.add_argument(
+            "--from",
+            dest="date_from",
+            help="Fecha de creación inicial (YYYY-MM-DD, inclusive).",
+        )
+        parser.add_argument(
+            "--to",
+            dest="date_to",
+            help="Fecha de creación final (YYYY-MM-DD, inclusive).",
+        )
+        parser.add_argument(
+            "--ids",
+            nargs="+",
+            help="IDs de órdenes concretas.",
+        )
+        parser.add_argument(
+            "--kinds",
+            nargs="+",
+            choices=sorted(KINDS),
+            default=["po", "so"],
+            help="Documentos a incluir (default: po so).",
+        )
+        parser.add_argument(
+            "--language",
+            default="es",
+            help="Idioma de los documentos (default: es).",
+        )
+
+    def _parse_date(self, value, fmt="%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(value, fmt).date()
+        except ValueError:
+            raise CommandError(f"Invalid date '{value}'.") from None
+
+    def handle(self, *args, **options):
+        offers = OfferModel.objects.all()
+
+        if options["month"]:
+            start = self._parse_date(options["month"], "%Y-%m")
+            end = (start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+            offers = offers.filter(created__date__gte=start, created__date__lt=end)
+        if options["date_from"]:
+            offers = offers.filter(created__date__gte=self._parse_date(options["date_from"]))
+        if options["date_to"]:
+            offers = offers.filter(created__date__lte=self._parse_date(options["date_to"]))
+        if options["ids"]:
+            offers = offers.filter(pk__in=options["ids"])
+
+        kinds = [KINDS[kind] for kind in options["kinds"]]
+        total = offers.count() * len(kinds)
+        if not total:
+            raise CommandError("No purchase orders match the given filters.")
+
+        step = max(1, total // 20)
+
+        def _progress(done, expected):
+            if done % step == 0 or done == expected:
+                self.stdout.write(f"  {done}/{expected} documents ({done * 100 // expected}%)")
+
+        started = timezone.now()
+        written = 0
+        with open(options["output"], "wb") as fh:
+            for chunk in stream_offer_documents_zip(
+                offers, kinds, language=options["language"], on_progress=_progress,
+            ):
+                fh.write(chunk)
+                written += len(chunk)
+
+        elapsed = (timezone.now() - started).total_seconds()
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {total} documents to {options['output']} "
+            f"({written / 1024 / 1024:.1f} MB in {elapsed:.1f}s). See manifest.csv for errors."
+        ))
@@ -0,0 +1,31 @@
+# apps/project/specific/assets_management/buyers/management/commands/prune_offer_documents.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.project.specific.assets_management.buyers.document_cache import \
+    prune_offer_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Elimina los PDF de OC/OS cacheados que no se usan hace más de N días "
+        "(default: settings.BUYERS_DOCUMENT_CACHE_MAX_AGE_DAYS, 30)."
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Antigüedad máxima (días desde el último acceso).",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+        deleted = prune_offer_documents(
+            timedelta(days=days) if days is not None else None
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Cached offer documents pruned: {deleted} deleted."
+        ))
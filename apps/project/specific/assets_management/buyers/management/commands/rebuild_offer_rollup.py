@@ -0,0 +1,15 @@
+# apps/project/specific/assets_management/buyers/management/commands/rebuild_offer_rollup.py
+from django.core.management.base import BaseCommand
+
+from apps.project.specific.assets_management.buyers.models import \
+    OfferMonthlyRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild OfferMonthlyRollup (monthly purchase order counts) from OfferModel."
+
+    def handle(self, *args, **options):
+        written = OfferMonthlyRollup.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Offer monthly rollup rebuilt: {written} rows written."
+        ))
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:37
+
+from django.db import migrations, models
+from django.db.models import Case, Q, Value, When
+
+
+def backfill_status_code(apps, schema_editor):
+    # Misma precedencia que OfferModel.compute_status_code(), resuelta en un UPDATE
+    OfferModel = apps.get_model('buyers', 'OfferModel')
+
+    OfferModel.objects.update(
+        status_code=Case(
+            When(
+                Q(profitability_paid_at__isnull=False,
+                  recovery_repatriation_foundation_paid=True,
+                  pay_master_service_paid=True,
+                  propensiones_paid=True),
+                then=Value('PROFIT_PAID')
+            ),
+            When(profitability_created_at__isnull=False, then=Value('PROFIT_CREATED')),
+            When(asset_sent_at__isnull=False, then=Value('ASSET_SENT')),
+            When(asset_in_possession_at__isnull=False, then=Value('POSSESSION')),
+            When(payment_order_sent_at__isnull=False, then=Value('PAY_SENT')),
+            When(payment_order_created_at__isnull=False, then=Value('PAY_CREATED')),
+            When(service_order_sent_at__isnull=False, then=Value('SO_SENT')),
+            When(service_order_created_at__isnull=False, then=Value('SO_CREATED')),
+            When(is_approved=True, reviewed=True, then=Value('APPROVED')),
+            When(is_approved=False, reviewed=True, then=Value('NOT_APPROVED')),
+            When(is_approved=False, reviewed=False, is_active=True, then=Value('PENDING_APPROVAL')),
+            default=Value('UNDER_REVIEW'),
+            output_field=models.CharField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0007_alter_offermodel_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offermodel',
+            name='status_code',
+            field=models.CharField(choices=[('UNDER_REVIEW', 'Under review'), ('PENDING_APPROVAL', 'Pending for Approval'), ('NOT_APPROVED', 'NOT Approved'), ('APPROVED', 'Approved'), ('SO_CREATED', 'Service Order Created'), ('SO_SENT', 'Service Order Sent'), ('PAY_CREATED', 'Payment Order Created'), ('PAY_SENT', 'Payment Order Sent'), ('POSSESSION', 'Asset In Possession'), ('ASSET_SENT', 'Asset Sent'), ('PROFIT_CREATED', 'Profitability Created'), ('PROFIT_PAID', 'Profitability Paid'), ('COMPLETED', 'Completed')], db_index=True, default='UNDER_REVIEW', editable=False, max_length=20, verbose_name='Status'),
+        ),
+        migrations.RunPython(backfill_status_code, migrations.RunPython.noop),
+    ]
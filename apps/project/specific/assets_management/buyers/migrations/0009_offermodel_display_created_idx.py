@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0008_offermodel_status_code'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offermodel',
+            index=models.Index(fields=['display', 'created', 'id'], name='offer_display_created_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.30 on 2026-10-17 00:51
+
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+
+def _month_of(value):
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date().replace(day=1)
+
+
+def populate_offer_rollup(apps, schema_editor):
+    OfferModel = apps.get_model('buyers', 'OfferModel')
+    OfferMonthlyRollup = apps.get_model('buyers', 'OfferMonthlyRollup')
+
+    all_paid = models.Q(
+        recovery_repatriation_foundation_paid=True,
+        pay_master_service_paid=True,
+        propensiones_paid=True,
+    )
+    rows = {}
+    created_qs = (
+        OfferModel.objects
+        .annotate(m=TruncMonth('created'))
+        .values('m')
+        .annotate(created=models.Count('id'), paid=models.Count('id', filter=all_paid))
+        .order_by()
+    )
+    for row in created_qs:
+        rows[_month_of(row['m'])] = OfferMonthlyRollup(
+            month=_month_of(row['m']),
+            created_count=row['created'],
+            paid_count=row['paid'],
+            in_progress_count=row['created'] - row['paid'],
+        )
+
+    closed_qs = (
+        OfferModel.objects
+        .filter(profitability_paid_at__isnull=False)
+        .annotate(m=TruncMonth('profitability_paid_at'))
+        .values('m')
+        .annotate(closed=models.Count('id'))
+        .order_by()
+    )
+    for row in closed_qs:
+        month = _month_of(row['m'])
+        rows.setdefault(month, OfferMonthlyRollup(month=month)).closed_count = row['closed']
+
+    OfferMonthlyRollup.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0009_offermodel_display_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True, verbose_name='month')),
+                ('created_count', models.PositiveIntegerField(default=0, verbose_name='created')),
+                ('closed_count', models.PositiveIntegerField(default=0, verbose_name='closed')),
+                ('in_progress_count', models.PositiveIntegerField(default=0, verbose_name='in progress')),
+                ('paid_count', models.PositiveIntegerField(default=0, verbose_name='paid')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='updated')),
+            ],
+            options={
+                'verbose_name': 'Purchase order monthly rollup',
+                'verbose_name_plural': 'Purchase orders monthly rollup',
+                'db_table': 'apps_buyers_offer_monthly_rollup',
+                'ordering': ['month'],
+            },
+        ),
+        migrations.RunPython(populate_offer_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:01
+
+import apps.project.specific.assets_management.buyers.models
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0010_offer_monthly_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferDocumentCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('PO', 'Purchase order'), ('SO', 'Service order')], max_length=2, verbose_name='kind')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='fingerprint')),
+                ('file', models.FileField(max_length=255, upload_to=apps.project.specific.assets_management.buyers.models.offer_document_cache_path, verbose_name='file')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='size (bytes)')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='hits')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('last_accessed', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='last accessed')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cached_documents', to='buyers.offermodel', verbose_name='Purchase order')),
+            ],
+            options={
+                'verbose_name': 'Cached purchase order document',
+                'verbose_name_plural': 'Cached purchase order documents',
+                'db_table': 'apps_buyers_offer_document_cache',
+                'ordering': ['-last_accessed'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='offerdocumentcache',
+            constraint=models.UniqueConstraint(fields=('offer', 'kind', 'fingerprint'), name='uniq_offer_document_cache'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:07
+
+import apps.project.specific.assets_management.buyers.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0011_offer_document_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offermodel',
+            name='offer_img_print',
+            field=models.ImageField(blank=True, editable=False, max_length=255, null=True, upload_to=apps.project.specific.assets_management.buyers.models.OfferModel.offer_image_upload_path, verbose_name='print image'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0012_offer_img_print'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offermodel',
+            name='translation_pending',
+            field=models.BooleanField(default=False, editable=False, verbose_name='translation pending'),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:26
+
+import apps.common.utils.models
+from django.conf import settings
+from django.db import migrations, models, transaction
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def queue_existing_images(apps, schema_editor):
+    # Las imágenes ya subidas no tienen versiones: se marcan PENDING y se encola
+    # su procesamiento (lo mismo que build_image_renditions)
+    OfferModel = apps.get_model('buyers', 'OfferModel')
+    BackgroundJobModel = apps.get_model('utils', 'BackgroundJobModel')
+
+    rows = OfferModel.objects.exclude(offer_img='').exclude(offer_img__isnull=True)
+    pks = list(rows.values_list('pk', flat=True))
+    rows.update(processing_state='pending')
+
+    now = django.utils.timezone.now()
+    max_attempts = getattr(settings, 'BACKGROUND_JOBS_MAX_ATTEMPTS', 5)
+    BackgroundJobModel.objects.bulk_create([
+        BackgroundJobModel(
+            name='utils.process_image',
+            payload={'model': 'buyers.offermodel', 'pk': str(pk)},
+            dedupe_key=f'image:buyers.offermodel:{pk}',
+            run_after=now,
+            max_attempts=max_attempts,
+        )
+        for pk in pks
+    ], batch_size=500)
+
+
+def delete_print_images(apps, schema_editor):
+    # offer_img_print se reemplaza por la versión "print": sus archivos sobran.
+    # Se borran al confirmar la migración (si falla, siguen en su lugar)
+    OfferModel = apps.get_model('buyers', 'OfferModel')
+    storage = OfferModel._meta.get_field('offer_img_print').storage
+    names = list(
+        OfferModel.objects.exclude(offer_img_print='').exclude(offer_img_print__isnull=True)
+        .values_list('offer_img_print', flat=True)
+    )
+
+    def _delete():
+        for name in names:
+            try:
+                if storage.exists(name):
+                    storage.delete(name)
+            except Exception:
+                pass
+
+    transaction.on_commit(_delete)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0013_offer_translation_pending'),
+        ('utils', '0002_background_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offermodel',
+            name='processing_state',
+            field=models.CharField(choices=[('none', 'No image'), ('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='none', editable=False, max_length=10, verbose_name='image processing state'),
+        ),
+        migrations.RunPython(queue_existing_images, migrations.RunPython.noop),
+        migrations.RunPython(delete_print_images, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='offermodel',
+            name='offer_img_print',
+        ),
+        migrations.CreateModel(
+            name='OfferImageRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(blank=True, choices=[('es', 'Spanish'), ('en', 'English')], default='es', max_length=4, null=True, verbose_name='language')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='updated')),
+                ('is_active', models.BooleanField(default=True, verbose_name='is active')),
+                ('default_order', models.PositiveIntegerField(blank=True, default=1, null=True, verbose_name='priority')),
+                ('rendition', models.CharField(choices=[('thumb', 'Thumbnail'), ('card', 'Card'), ('full', 'Full'), ('print', 'Print')], max_length=10, verbose_name='rendition')),
+                ('file', models.ImageField(max_length=255, upload_to=apps.common.utils.models.rendition_upload_path, verbose_name='file')),
+                ('source_name', models.CharField(max_length=255, verbose_name='source name')),
+                ('width', models.PositiveIntegerField(verbose_name='width')),
+                ('height', models.PositiveIntegerField(verbose_name='height')),
+                ('size', models.PositiveIntegerField(verbose_name='size (bytes)')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='buyers.offermodel', verbose_name='Purchase order')),
+            ],
+            options={
+                'verbose_name': 'Purchase order image rendition',
+                'verbose_name_plural': 'Purchase order image renditions',
+                'db_table': 'apps_buyers_offer_image_rendition',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='offerimagerendition',
+            constraint=models.UniqueConstraint(fields=('offer', 'rendition'), name='offer_image_rendition_uniq'),
+        ),
+    ]
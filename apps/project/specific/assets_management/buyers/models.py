@@ -5,32 +5,65 @@ import uuid
 from datetime import date
 
 from auditlog.registry import auditlog
+from dateutil.relativedelta import relativedelta
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import Q
-from django.db.models.signals import post_delete, pre_save
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
 from apps.common.utils.functions import sha256_hex
-from apps.common.utils.models import TimeStampedModel
+from apps.common.utils.images import (delete_rendition_file,
+                                      mark_image_pending,
+                                      queue_image_processing)
+from apps.common.utils.models import (ImageProcessingState,
+                                      ImageRenditionModel, TimeStampedModel)
+from apps.common.utils.translation import (mark_translation_pending,
+                                           queue_pending_translation)
 from apps.project.specific.assets_management.assets.models import AssetModel
 from apps.project.specific.assets_management.assets_location.models import \
     AssetCountryModel
 
-from .signals import (auto_delete_and_optimize_offer_img_on_change,
+from .functions.generate_pdf_helper import build_offer_print_image
+from .signals import (auto_delete_offer_document_file,
+                      auto_delete_offer_img_on_change,
                       auto_delete_offer_img_on_delete,
-                      auto_fill_offer_translation)
+                      discount_offer_rollup_on_delete,
+                      invalidate_offer_documents_on_change,
+                      invalidate_offer_fragments_on_recipient_change)
 
 logger = logging.getLogger(__name__)
 
 UserModel = get_user_model()
 
 
+class OfferQuerySet(models.QuerySet):
+    def with_status(self, *status_codes):
+        """Filter by the persisted workflow status (indexed column)."""
+        return self.filter(status_code__in=status_codes)
+
+    def status_counts(self) -> dict:
+        """{status_code: count} resolved with a single GROUP BY."""
+        return {
+            row['status_code']: row['total']
+            for row in self.order_by().values('status_code').annotate(total=models.Count('pk'))
+        }
+
+
 class OfferModel(TimeStampedModel):
+    # Pares es_/en_ que se traducen en segundo plano (campo base -> max_chars)
+    TRANSLATABLE_FIELDS = {"observation": 10000, "description": 10000}
+
+    # Imagen con versiones generadas en segundo plano (OfferImageRendition);
+    # la de impresión va al tamaño exacto del marco de los PDF
+    IMAGE_FIELD = "offer_img"
+    IMAGE_RENDITION_BUILDERS = {"print": build_offer_print_image}
+
     def offer_image_upload_path(instance, filename) -> str:
         """
         Generate a file path for an asset image.
@@ -144,6 +177,12 @@ class OfferModel(TimeStampedModel):
         blank=True, null=True
     )
 
+    translation_pending = models.BooleanField(
+        _("translation pending"),
+        default=False,
+        editable=False
+    )
+
     buyer_country = models.ForeignKey(
         AssetCountryModel,
         on_delete=models.CASCADE,
@@ -166,6 +205,14 @@ class OfferModel(TimeStampedModel):
         null=True
     )
 
+    processing_state = models.CharField(
+        _("image processing state"),
+        max_length=10,
+        choices=ImageProcessingState.choices,
+        default=ImageProcessingState.NONE,
+        editable=False
+    )
+
     # Purchase order approval
 
     is_approved = models.BooleanField(
@@ -353,6 +400,18 @@ class OfferModel(TimeStampedModel):
         blank=True
     )
 
+    # Estado del flujo persistido; se recalcula en save() (ver compute_status_code)
+    status_code = models.CharField(
+        _("Status"),
+        max_length=20,
+        choices=StatusChoices.choices,
+        default=StatusChoices.UNDER_REVIEW,
+        editable=False,
+        db_index=True
+    )
+
+    objects = OfferQuerySet.as_manager()
+
     @property
     def asset_display_name(self):
         lang = get_language()
@@ -368,8 +427,7 @@ class OfferModel(TimeStampedModel):
             self.propensiones_paid
         )
 
-    @property
-    def status_code(self) -> str:
+    def compute_status_code(self) -> str:
         # Del más avanzado al más básico
         if self.profitability_paid_at and self.profitability_all_paid:
             return self.StatusChoices.PROFIT_PAID
@@ -453,126 +511,47 @@ class OfferModel(TimeStampedModel):
         }
         return mapping[self.status_code]
 
-    @transaction.atomic
+    def _run_transition(self, name: str, user):
+        """
+        Ejecuta la transición como UPDATE condicional (ver buyers.transitions).
+        Lanza TransitionConflict si la precondición ya no se cumple en BD.
+        """
+        from .transitions import TransitionConflict, apply_transition
+
+        result = apply_transition(self, name, user)
+        if not result.ok:
+            raise TransitionConflict(result.error)
+        return result
+
     def mark_service_order_sent(self, user):
-        if not self.service_order_created_at:
-            raise ValidationError(
-                _("You cannot send a service order before it is created."))
-        self.service_order_sent_by = user
-        if not self.service_order_sent_at:
-            self.service_order_sent_at = timezone.now()
-        self.save(update_fields=[
-                  "service_order_sent_by", "service_order_sent_at"])
+        return self._run_transition("SO_SEND", user)
 
-    @transaction.atomic
     def mark_payment_order_created(self, user):
-        if not self.service_order_sent_at:
-            raise ValidationError(
-                _("You cannot create a payment order before service order is sent."))
-        self.payment_order_created_by = user
-        if not self.payment_order_created_at:
-            self.payment_order_created_at = timezone.now()
-        self.save(update_fields=[
-                  "payment_order_created_by", "payment_order_created_at"])
+        return self._run_transition("PAY_CREATE", user)
 
-    @transaction.atomic
     def mark_payment_order_sent(self, user):
-        if not self.payment_order_created_at:
-            raise ValidationError(
-                _("You cannot send a payment order before it is created."))
-        self.payment_order_sent_by = user
-        if not self.payment_order_sent_at:
-            self.payment_order_sent_at = timezone.now()
-        self.save(update_fields=[
-                  "payment_order_sent_by", "payment_order_sent_at"])
+        return self._run_transition("PAY_SEND", user)
 
-    @transaction.atomic
     def mark_asset_in_possession(self, user):
-        if not self.payment_order_sent_at:
-            raise ValidationError(
-                _("You cannot mark asset in possession before payment order is sent."))
-        self.asset_in_possession_by = user
-        if not self.asset_in_possession_at:
-            self.asset_in_possession_at = timezone.now()
-        self.save(update_fields=[
-                  "asset_in_possession_by", "asset_in_possession_at"])
+        return self._run_transition("POSSESSION", user)
 
-    @transaction.atomic
     def mark_asset_sent(self, user):
-        if not self.asset_in_possession_at:
-            raise ValidationError(
-                _("You cannot mark asset as sent before it is in possession."))
-        self.asset_sent_by = user
-        if not self.asset_sent_at:
-            self.asset_sent_at = timezone.now()
-        self.save(update_fields=["asset_sent_by", "asset_sent_at"])
+        return self._run_transition("ASSET_SEND", user)
 
-    @transaction.atomic
     def mark_profitability_created(self, user):
-        if not self.asset_sent_at:
-            raise ValidationError(
-                _("You cannot create profitability before asset is sent."))
-        self.profitability_created_by = user
-        if not self.profitability_created_at:
-            self.profitability_created_at = timezone.now()
-        self.save(update_fields=[
-                  "profitability_created_by", "profitability_created_at"])
+        return self._run_transition("PROFIT_CREATE", user)
 
-    @transaction.atomic
     def mark_rrf_paid(self, user, *, paid: bool = True):
-        if not self.profitability_created_at:
-            raise ValidationError(
-                _("You cannot mark sub-payments before profitability is created."))
-        self.recovery_repatriation_foundation_paid = bool(paid)
-        self.recovery_repatriation_foundation_mark_by = user if paid else None
-        self.recovery_repatriation_foundation_mark_at = timezone.now() if paid else None
-        self.save(update_fields=[
-            "recovery_repatriation_foundation_paid",
-            "recovery_repatriation_foundation_mark_by",
-            "recovery_repatriation_foundation_mark_at",
-        ])
+        return self._run_transition("RRF_PAY" if paid else "RRF_UNPAY", user)
 
-    @transaction.atomic
     def mark_paymaster_paid(self, user, *, paid: bool = True):
-        if not self.profitability_created_at:
-            raise ValidationError(
-                _("You cannot mark sub-payments before profitability is created."))
-        self.pay_master_service_paid = bool(paid)
-        self.pay_master_service_mark_by = user if paid else None
-        self.pay_master_service_mark_at = timezone.now() if paid else None
-        self.save(update_fields=[
-            "pay_master_service_paid",
-            "pay_master_service_mark_by",
-            "pay_master_service_mark_at",
-        ])
+        return self._run_transition("AMPRO_PAY" if paid else "AMPRO_UNPAY", user)
 
-    @transaction.atomic
     def mark_prop_paid(self, user, *, paid: bool = True):
-        if not self.profitability_created_at:
-            raise ValidationError(
-                _("You cannot mark sub-payments before profitability is created."))
-        self.propensiones_paid = bool(paid)
-        self.propensiones_mark_by = user if paid else None
-        self.propensiones_mark_at = timezone.now() if paid else None
-        self.save(update_fields=[
-            "propensiones_paid",
-            "propensiones_mark_by",
-            "propensiones_mark_at",
-        ])
+        return self._run_transition("PROP_PAY" if paid else "PROP_UNPAY", user)
 
-    @transaction.atomic
     def mark_profitability_paid(self, user):
-        if not self.profitability_created_at:
-            raise ValidationError(
-                _("You cannot pay profitability before it is created."))
-        if not self.profitability_all_paid:
-            raise ValidationError(
-                _("All profitability sub-payments must be marked as paid first."))
-        self.profitability_paid_by = user
-        if not self.profitability_paid_at:
-            self.profitability_paid_at = timezone.now()
-        self.save(update_fields=[
-                  "profitability_paid_by", "profitability_paid_at"])
+        return self._run_transition("PROFIT_PAY", user)
 
     def offers_directory_path(instance, filename) -> str:
         """
@@ -715,25 +694,42 @@ class OfferModel(TimeStampedModel):
         if errors:
             raise ValidationError(errors)
 
+    # Campos que save() compara con su valor previo (timestamps *_by/*_at y rollup)
+    SAVE_STATE_FIELDS = (
+        "is_approved", "approved_by", "approved_by_timestamp",
+        "reviewed", "reviewed_by", "reviewed_by_timestamp",
+        "service_order_created_at", "service_order_created_by",
+        "service_order_sent_by", "service_order_sent_at",
+        "payment_order_created_by", "payment_order_created_at",
+        "payment_order_sent_by", "payment_order_sent_at",
+        "asset_in_possession_by", "asset_in_possession_at",
+        "asset_sent_by", "asset_sent_at",
+        "profitability_created_by", "profitability_created_at",
+        "profitability_paid_by", "profitability_paid_at",
+        "recovery_repatriation_foundation_paid", "recovery_repatriation_foundation_mark_by",
+        "pay_master_service_paid", "pay_master_service_mark_by",
+        "propensiones_paid", "propensiones_mark_by",
+        "created",
+    )
+
     def save(self, *args, **kwargs):
+        # El estado previo se lee de la BD con bloqueo, no de los valores cargados:
+        # la instancia puede estar desactualizada (transiciones, otras escrituras) y
+        # ese estado decide el delta del rollup mensual y los timestamps *_at.
+        with transaction.atomic():
+            old = None
+            if not self._state.adding and self.pk:
+                old = (
+                    OfferModel.objects
+                    .select_for_update()
+                    .filter(pk=self.pk)
+                    .values(*(self._meta.get_field(name).attname for name in self.SAVE_STATE_FIELDS))
+                    .first()
+                )
+            self._save_with_state(old, *args, **kwargs)
+
+    def _save_with_state(self, old, *args, **kwargs):
         is_new = self._state.adding
-        old = None
-        if not is_new and self.pk:
-            old = OfferModel.objects.filter(pk=self.pk).only(
-                "is_approved", "approved_by", "approved_by_timestamp",
-                "reviewed", "reviewed_by", "reviewed_by_timestamp",
-                "service_order_created_at", "service_order_created_by",
-                "service_order_sent_by", "service_order_sent_at",
-                "payment_order_created_by", "payment_order_created_at",
-                "payment_order_sent_by", "payment_order_sent_at",
-                "asset_in_possession_by", "asset_in_possession_at",
-                "asset_sent_by", "asset_sent_at",
-                "profitability_created_by", "profitability_created_at",
-                "profitability_paid_by", "profitability_paid_at",
-                "recovery_repatriation_foundation_paid", "recovery_repatriation_foundation_mark_by",
-                "pay_master_service_paid", "pay_master_service_mark_by",
-                "propensiones_paid", "propensiones_mark_by",
-            ).first()
 
         # -------- Normalización previa (auto y cascadas) --------
         def clear(*names):
@@ -845,23 +841,24 @@ class OfferModel(TimeStampedModel):
         # -------- Timestamps “by/timestamp” coherentes --------
         # Aprobación
         if self.is_approved and self.approved_by:
-            if is_new or not self.approved_by_timestamp or (old and old.approved_by_id != self.approved_by_id):
+            if is_new or not self.approved_by_timestamp or (old and old["approved_by_id"] != self.approved_by_id):
                 self.approved_by_timestamp = timezone.now()
         else:
             self.approved_by_timestamp = None
 
         # Revisión
         if self.reviewed and self.reviewed_by:
-            if is_new or not self.reviewed_by_timestamp or (old and old.reviewed_by_id != self.reviewed_by_id):
+            if is_new or not self.reviewed_by_timestamp or (old and old["reviewed_by_id"] != self.reviewed_by_id):
                 self.reviewed_by_timestamp = timezone.now()
         else:
             self.reviewed_by_timestamp = None
 
         # Auto-set genérico para *_by -> *_at (cuando cambie la persona)
         def auto_ts(field_by, field_at):
-            by_val = getattr(self, field_by)
+            # Compara los *_id: no carga los usuarios relacionados
+            by_val = getattr(self, f"{field_by}_id")
             at_val = getattr(self, field_at)
-            old_by_val = getattr(old, field_by) if old else None
+            old_by_val = old[f"{field_by}_id"] if old else None
             if by_val:
                 if is_new or not at_val or (old and old_by_val != by_val):
                     setattr(self, field_at, timezone.now())
@@ -882,7 +879,18 @@ class OfferModel(TimeStampedModel):
         auto_ts("pay_master_service_mark_by", "pay_master_service_mark_at")
         auto_ts("propensiones_mark_by", "propensiones_mark_at")
 
+        # Estado persistido: siempre se guarda junto con los campos que lo determinan
+        self.status_code = self.compute_status_code()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status_code" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "status_code"]
+
+        # El rollup mensual se ajusta en la misma transacción que la orden (ver save())
         super().save(*args, **kwargs)
+        OfferMonthlyRollup.objects.apply_change(
+            rollup_state(old) if old else None,
+            rollup_state(self),
+        )
 
     def __str__(self) -> str:
         return f"{self.asset.asset_name.en_name} - {self.buyer_country} - {self.offer_quantity}"
@@ -892,6 +900,13 @@ class OfferModel(TimeStampedModel):
         verbose_name = _("Purchase order")
         verbose_name_plural = _("Purchase orders")
         ordering = ["default_order", "-created"]
+        indexes = [
+            # Paginación keyset de la tabla de órdenes (display, created, id)
+            models.Index(
+                fields=["display", "created", "id"],
+                name="offer_display_created_idx",
+            ),
+        ]
         permissions = [
             ("can_approve_offer",             _("Can approve purchase orders")),
             ("can_review_offer",              _("Can review purchase orders")),
@@ -1028,8 +1043,321 @@ class ServiceOrderRecipient(TimeStampedModel):
         ]
 
 
+# Campos de OfferModel que determinan su aporte a OfferMonthlyRollup
+ROLLUP_STATE_FIELDS = (
+    "created",
+    "recovery_repatriation_foundation_paid",
+    "pay_master_service_paid",
+    "propensiones_paid",
+    "profitability_paid_at",
+)
+
+
+def rollup_state(offer) -> dict:
+    """Estado relevante para el rollup de una instancia (o de un dict de .values())."""
+    if isinstance(offer, dict):
+        return {field: offer.get(field) for field in ROLLUP_STATE_FIELDS}
+    return {field: getattr(offer, field) for field in ROLLUP_STATE_FIELDS}
+
+
+def _month_of(value):
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date().replace(day=1)
+
+
+def rollup_contribution(state) -> dict:
+    """
+    {(month, column): 1} que aporta una orden:
+    - creada en su mes de `created` (en curso o pagada según los 3 subpagos)
+    - cerrada en su mes de `profitability_paid_at`
+    """
+    if not state or not state.get("created"):
+        return {}
+
+    created_month = _month_of(state["created"])
+    all_paid = all(state.get(f) for f in (
+        "recovery_repatriation_foundation_paid",
+        "pay_master_service_paid",
+        "propensiones_paid",
+    ))
+    contribution = {
+        (created_month, "created_count"): 1,
+        (created_month, "paid_count" if all_paid else "in_progress_count"): 1,
+    }
+    if state.get("profitability_paid_at"):
+        key = (_month_of(state["profitability_paid_at"]), "closed_count")
+        contribution[key] = contribution.get(key, 0) + 1
+    return contribution
+
+
+class OfferMonthlyRollupManager(models.Manager):
+    COLUMNS = ("created_count", "closed_count",
+               "in_progress_count", "paid_count")
+
+    def apply_delta(self, deltas: dict):
+        """Suma {(month, column): delta} con un UPDATE atómico por mes."""
+        by_month = {}
+        for (month, column), delta in deltas.items():
+            if delta:
+                by_month.setdefault(month, {})[column] = delta
+        if not by_month:
+            return
+
+        # Crea los meses que falten; si otro proceso se adelantó, la restricción única lo ignora
+        self.bulk_create(
+            [OfferMonthlyRollup(month=month) for month in by_month],
+            ignore_conflicts=True,
+        )
+        now = timezone.now()
+        for month, columns in by_month.items():
+            self.filter(month=month).update(
+                updated=now,
+                **{column: F(column) + delta for column, delta in columns.items()},
+            )
+
+    def apply_change(self, old_state, new_state):
+        """Aplica la diferencia entre dos estados (None al crear / eliminar)."""
+        self.apply_changes([(old_state, new_state)])
+
+    def apply_changes(self, changes):
+        """Como apply_change para muchas órdenes: iterable de (old_state, new_state)."""
+        deltas = {}
+        for old_state, new_state in changes:
+            for key, value in rollup_contribution(old_state).items():
+                deltas[key] = deltas.get(key, 0) - value
+            for key, value in rollup_contribution(new_state).items():
+                deltas[key] = deltas.get(key, 0) + value
+        self.apply_delta(deltas)
+
+    def live_rows(self) -> dict:
+        """{month: {column: count}} recalculado desde OfferModel (dos GROUP BY)."""
+        rows = {}
+        created_qs = (
+            OfferModel.objects
+            .annotate(m=TruncMonth("created"))
+            .values("m")
+            .annotate(
+                created=Count("id"),
+                paid=Count("id", filter=Q(
+                    recovery_repatriation_foundation_paid=True,
+                    pay_master_service_paid=True,
+                    propensiones_paid=True,
+                )),
+            )
+            .order_by()
+        )
+        for row in created_qs:
+            month = _month_of(row["m"])
+            rows.setdefault(month, dict.fromkeys(self.COLUMNS, 0)).update(
+                created_count=row["created"],
+                paid_count=row["paid"],
+                in_progress_count=row["created"] - row["paid"],
+            )
+
+        closed_qs = (
+            OfferModel.objects
+            .filter(profitability_paid_at__isnull=False)
+            .annotate(m=TruncMonth("profitability_paid_at"))
+            .values("m")
+            .annotate(closed=Count("id"))
+            .order_by()
+        )
+        for row in closed_qs:
+            month = _month_of(row["m"])
+            rows.setdefault(month, dict.fromkeys(self.COLUMNS, 0))[
+                "closed_count"] = row["closed"]
+        return rows
+
+    @transaction.atomic
+    def rebuild(self) -> int:
+        """Reconstruye la tabla desde cero. Devuelve filas escritas."""
+        self.all().delete()
+        rows = [
+            OfferMonthlyRollup(month=month, **counts)
+            for month, counts in sorted(self.live_rows().items())
+        ]
+        self.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    def window(self, start_month, end_month) -> list:
+        """Una fila por mes entre start_month y end_month (inclusive); meses sin datos en cero."""
+        found = {
+            row["month"]: row
+            for row in self.filter(month__gte=start_month, month__lte=end_month)
+            .values("month", *self.COLUMNS)
+        }
+        rows = []
+        cursor = start_month
+        while cursor <= end_month:
+            rows.append(found.get(cursor) or {
+                "month": cursor, **dict.fromkeys(self.COLUMNS, 0)})
+            cursor = cursor + relativedelta(months=1)
+        return rows
+
+    def totals(self) -> dict:
+        """Totales históricos de todas las columnas (suma sobre las filas mensuales)."""
+        totals = self.aggregate(**{column: Sum(column) for column in self.COLUMNS})
+        return {column: totals[column] or 0 for column in self.COLUMNS}
+
+
+class OfferMonthlyRollup(models.Model):
+    """
+    Conteos mensuales de órdenes de compra para los gráficos/KPIs de rentabilidad.
+    Se mantiene en OfferModel.save(), en las transiciones y en post_delete;
+    `manage.py rebuild_offer_rollup` lo reconstruye.
+    """
+    month = models.DateField(
+        _("month"),
+        unique=True
+    )
+
+    created_count = models.PositiveIntegerField(
+        _("created"),
+        default=0
+    )
+
+    closed_count = models.PositiveIntegerField(
+        _("closed"),
+        default=0
+    )
+
+    in_progress_count = models.PositiveIntegerField(
+        _("in progress"),
+        default=0
+    )
+
+    paid_count = models.PositiveIntegerField(
+        _("paid"),
+        default=0
+    )
+
+    updated = models.DateTimeField(
+        _("updated"),
+        auto_now=True
+    )
+
+    objects = OfferMonthlyRollupManager()
+
+    def __str__(self) -> str:
+        return f"{self.month:%Y-%m}: {self.created_count} / {self.closed_count}"
+
+    class Meta:
+        db_table = "apps_buyers_offer_monthly_rollup"
+        verbose_name = _("Purchase order monthly rollup")
+        verbose_name_plural = _("Purchase orders monthly rollup")
+        ordering = ["month"]
+
+
+def offer_document_cache_path(instance, filename) -> str:
+    """
+    Path format: offer/documents/{offer_id}/{kind}-{fingerprint}.pdf
+    """
+    return os.path.join(
+        "offer", "documents", str(instance.offer_id),
+        f"{instance.kind.lower()}-{instance.fingerprint}.pdf"
+    )
+
+
+class OfferDocumentCache(models.Model):
+    """
+    PDF de OC/OS ya generado, direccionado por contenido: (orden, tipo, huella de
+    los campos que aparecen en el documento). Ver buyers/document_cache.py;
+    `manage.py prune_offer_documents` elimina las entradas sin uso reciente.
+    """
+    class KindChoices(models.TextChoices):
+        PURCHASE_ORDER = "PO", _("Purchase order")
+        SERVICE_ORDER = "SO", _("Service order")
+
+    offer = models.ForeignKey(
+        OfferModel,
+        on_delete=models.CASCADE,
+        related_name="cached_documents",
+        verbose_name=_("Purchase order")
+    )
+
+    kind = models.CharField(
+        _("kind"),
+        max_length=2,
+        choices=KindChoices.choices
+    )
+
+    fingerprint = models.CharField(
+        _("fingerprint"),
+        max_length=64
+    )
+
+    file = models.FileField(
+        _("file"),
+        max_length=255,
+        upload_to=offer_document_cache_path
+    )
+
+    size = models.PositiveIntegerField(
+        _("size (bytes)"),
+        default=0
+    )
+
+    hits = models.PositiveIntegerField(
+        _("hits"),
+        default=0
+    )
+
+    created = models.DateTimeField(
+        _("created"),
+        default=timezone.now,
+        editable=False
+    )
+
+    last_accessed = models.DateTimeField(
+        _("last accessed"),
+        default=timezone.now,
+        db_index=True
+    )
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} {str(self.offer_id)[:8].upper()} ({self.fingerprint[:12]})"
+
+    class Meta:
+        db_table = "apps_buyers_offer_document_cache"
+        verbose_name = _("Cached purchase order document")
+        verbose_name_plural = _("Cached purchase order documents")
+        ordering = ["-last_accessed"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["offer", "kind", "fingerprint"],
+                name="uniq_offer_document_cache",
+            ),
+        ]
+
+
+class OfferImageRendition(ImageRenditionModel):
+    offer = models.ForeignKey(
+        OfferModel,
+        on_delete=models.CASCADE,
+        related_name="renditions",
+        verbose_name=_("Purchase order")
+    )
+
+    class Meta:
+        db_table = "apps_buyers_offer_image_rendition"
+        verbose_name = _("Purchase order image rendition")
+        verbose_name_plural = _("Purchase order image renditions")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["offer", "rendition"],
+                name="offer_image_rendition_uniq",
+            ),
+        ]
+
+
 pre_save.connect(
-    auto_fill_offer_translation,
+    mark_translation_pending,
+    sender=OfferModel
+)
+
+post_save.connect(
+    queue_pending_translation,
     sender=OfferModel
 )
 
@@ -1038,11 +1366,51 @@ post_delete.connect(
     sender=OfferModel
 )
 
+post_delete.connect(
+    discount_offer_rollup_on_delete,
+    sender=OfferModel
+)
+
 pre_save.connect(
-    auto_delete_and_optimize_offer_img_on_change,
+    auto_delete_offer_img_on_change,
     sender=OfferModel
 )
 
+pre_save.connect(
+    mark_image_pending,
+    sender=OfferModel
+)
+
+post_save.connect(
+    queue_image_processing,
+    sender=OfferModel
+)
+
+post_save.connect(
+    invalidate_offer_documents_on_change,
+    sender=OfferModel
+)
+
+post_delete.connect(
+    auto_delete_offer_document_file,
+    sender=OfferDocumentCache
+)
+
+post_delete.connect(
+    delete_rendition_file,
+    sender=OfferImageRendition
+)
+
+post_save.connect(
+    invalidate_offer_fragments_on_recipient_change,
+    sender=ServiceOrderRecipient
+)
+
+post_delete.connect(
+    invalidate_offer_fragments_on_recipient_change,
+    sender=ServiceOrderRecipient
+)
+
 auditlog.register(
     OfferModel,
     serialize_data=True
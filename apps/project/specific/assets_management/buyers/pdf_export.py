@@ -0,0 +1,151 @@
+# apps/project/specific/assets_management/buyers/pdf_export.py
+"""
+Exportación en un ZIP de los PDF de OC/OS de varias órdenes (p.ej. un mes para auditoría).
+
+    for chunk in stream_offer_documents_zip(queryset, user=request.user):
+        ...
+
+- El ZIP se escribe en un flujo sin seek y se entrega por trozos: en memoria solo
+  están los PDF de la ventana en curso, no el archivo completo.
+- Los PDF salen de la caché de documentos si existen; los demás se generan en
+  paralelo en pdf_pool (ventana de BUYERS_PDF_EXPORT_WINDOW renders en vuelo).
+- Los errores de render no cortan la exportación: quedan en manifest.csv.
+"""
+
+import csv
+import io
+import logging
+import zipfile
+from collections import deque
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import override
+
+from .document_cache import document_filename, find_offer_document
+from .models import OfferDocumentCache
+from .pdf_pool import PdfRenderError, pdf_pool
+
+logger = logging.getLogger(__name__)
+
+Kind = OfferDocumentCache.KindChoices
+
+DEFAULT_KINDS = (Kind.PURCHASE_ORDER, Kind.SERVICE_ORDER)
+
+
+class _ZipSink:
+    """Destino de escritura sin seek: acumula lo escrito hasta que se vacía."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _window() -> int:
+    default = max(1, pdf_pool.workers) * 2
+    return max(1, getattr(settings, "BUYERS_PDF_EXPORT_WINDOW", default))
+
+
+def archive_path(kind: str, offer) -> str:
+    """Ruta dentro del ZIP: <fecha>_<id corto>/<archivo>.pdf"""
+    folder = f"{offer.created:%Y-%m-%d}_{str(offer.id)[:8].upper()}"
+    return f"{folder}/{document_filename(kind, offer)}"
+
+
+def _document_user(kind: str, offer, user):
+    # La OC se imprime a nombre de quien la creó (igual que el correo y la descarga)
+    return offer.created_by if kind == Kind.PURCHASE_ORDER else user
+
+
+def iter_offer_documents(offers, kinds=DEFAULT_KINDS, user=None):
+    """
+    Genera (offer, kind, pdf_bytes, error) en el orden de `offers`, con hasta
+    _window() renders en paralelo. `error` es un texto o "" si salió bien.
+    """
+    pending = deque()
+
+    def _resolve(item):
+        offer, kind, source = item
+        if isinstance(source, bytes):
+            return offer, kind, source, ""
+        if isinstance(source, Exception):
+            return offer, kind, None, str(source) or source.__class__.__name__
+        try:
+            return offer, kind, pdf_pool.result(source), ""
+        except Exception as exc:  # PdfRenderError o fallo del generador
+            logger.warning("Export: %s PDF for %s failed: %s", kind, offer.pk, exc)
+            return offer, kind, None, str(exc) or exc.__class__.__name__
+
+    for offer in offers.iterator(chunk_size=200):
+        for kind in kinds:
+            render_user = _document_user(kind, offer, user)
+            entry = find_offer_document(kind, offer, render_user)
+            if entry is not None:
+                with entry.file.open("rb") as fh:
+                    source = fh.read()
+            else:
+                try:
+                    source = pdf_pool.submit(
+                        kind, offer, render_user,
+                        wait=getattr(settings, "BUYERS_PDF_RENDER_TIMEOUT", 30),
+                    )
+                except PdfRenderError as exc:
+                    source = exc
+            pending.append((offer, kind, source))
+
+            while len(pending) >= _window():
+                yield _resolve(pending.popleft())
+
+    while pending:
+        yield _resolve(pending.popleft())
+
+
+def stream_offer_documents_zip(offers, kinds=DEFAULT_KINDS, user=None, *,
+                               language="es", on_progress=None):
+    """
+    Trozos (bytes) de un ZIP con los PDF `kinds` de `offers` y un manifest.csv.
+    `on_progress(done, total)` se llama tras cada documento.
+    """
+    offers = (
+        offers.select_related("asset__asset_name", "created_by")
+        .prefetch_related("renditions")
+        .order_by("created", "pk")
+    )
+    total = offers.count() * len(kinds)
+
+    sink = _ZipSink()
+    manifest = io.StringIO()
+    writer = csv.writer(manifest)
+    writer.writerow(["offer_id", "kind", "file", "size", "error"])
+
+    with override(language), zipfile.ZipFile(sink, mode="w") as archive:
+        done = 0
+        for offer, kind, pdf_bytes, error in iter_offer_documents(offers, kinds, user):
+            path = archive_path(kind, offer) if pdf_bytes else ""
+            if pdf_bytes:
+                info = zipfile.ZipInfo(path, date_time=timezone.localtime().timetuple()[:6])
+                # Los streams del PDF ya van comprimidos
+                archive.writestr(info, pdf_bytes, compress_type=zipfile.ZIP_STORED)
+            writer.writerow([offer.pk, kind, path, len(pdf_bytes or b""), error])
+
+            done += 1
+            if on_progress:
+                on_progress(done, total)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+        archive.writestr("manifest.csv", manifest.getvalue(), compress_type=zipfile.ZIP_DEFLATED)
+
+    yield sink.drain()
@@ -0,0 +1,276 @@
+# apps/project/specific/assets_management/buyers/pdf_pool.py
+"""
+Servicio de render de los PDF de OC/OS en procesos aparte.
+
+Reportlab (tablas, code128, imágenes) es trabajo de CPU en Python puro; en el
+hilo del worker web bloquea la petición. Aquí se mantiene un pool persistente
+de procesos ya calentados (Django configurado, imágenes/estilos de
+pdf_resources cargados y un render de prueba hecho):
+
+    pdf_bytes = render_pdf(OfferDocumentCache.KindChoices.SERVICE_ORDER, offer, user)
+
+- Los procesos se crean en el primer submit() de cada proceso web (no al importar:
+  el master de gunicorn --preload no los necesita y tras el fork no sirven).
+- Al proceso se le envía una instantánea de la orden (valores planos + bytes de
+  la imagen), no la instancia del ORM.
+- La cola es acotada (BUYERS_PDF_POOL_QUEUE_SIZE): si está llena se lanza
+  PdfRenderQueueFull en lugar de esperar.
+- Cada trabajo tiene un tiempo máximo (BUYERS_PDF_RENDER_TIMEOUT); al vencer se
+  lanza PdfRenderTimeout y el hueco se libera cuando el proceso termina.
+- BUYERS_PDF_POOL_WORKERS = 0 renderiza en el mismo proceso (desarrollo/tests).
+"""
+
+import atexit
+import datetime
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from .functions import generate_purchase_order_pdf, generate_service_order_pdf
+
+logger = logging.getLogger(__name__)
+
+# Códigos de OfferDocumentCache.KindChoices (sin importar modelos en los procesos hijos)
+PURCHASE_ORDER = "PO"
+SERVICE_ORDER = "SO"
+
+RENDERERS = {
+    PURCHASE_ORDER: generate_purchase_order_pdf,
+    SERVICE_ORDER: generate_service_order_pdf,
+}
+
+
+class PdfRenderError(Exception):
+    """No se pudo generar el PDF en el pool."""
+
+
+class PdfRenderQueueFull(PdfRenderError):
+    """La cola de render está llena."""
+
+
+class PdfRenderTimeout(PdfRenderError):
+    """El render superó BUYERS_PDF_RENDER_TIMEOUT."""
+
+
+def _setting(name, default):
+    return getattr(settings, f"BUYERS_PDF_{name}", default)
+
+
+# ---------------- Instantáneas (lo que los generadores leen) ----------------
+class StoredImage:
+    """Bytes de la imagen de la orden con la interfaz que usa build_offer_image_story."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def __bool__(self):
+        return bool(self._data)
+
+    def open(self, mode="rb"):
+        return self
+
+    def read(self):
+        return self._data
+
+
+@dataclass
+class OfferSnapshot:
+    id: str
+    created: datetime.datetime
+    asset_display_name: str
+    quantity_type_display: str
+    offer_quantity: int
+    es_observation: str
+    en_observation: str
+    es_description: str
+    en_description: str
+    offer_img: StoredImage
+
+    def get_quantity_type_display(self):
+        return self.quantity_type_display
+
+    @classmethod
+    def from_offer(cls, offer):
+        from apps.common.utils.images import rendition_file
+
+        # Versión de impresión si existe (JPEG ya al tamaño del marco); si no, la original
+        image = rendition_file(offer, "print") or offer.offer_img
+        img_bytes = b""
+        if image:
+            try:
+                image.open("rb")
+                img_bytes = image.read()
+            except Exception as e:
+                logger.error(f"Error reading offer image for PDF '{image.name}': {e}")
+        return cls(
+            id=str(offer.id),
+            created=offer.created,
+            asset_display_name=offer.asset_display_name,
+            quantity_type_display=str(offer.get_quantity_type_display()),
+            offer_quantity=offer.offer_quantity,
+            es_observation=offer.es_observation or "",
+            en_observation=offer.en_observation or "",
+            es_description=offer.es_description or "",
+            en_description=offer.en_description or "",
+            offer_img=StoredImage(img_bytes),
+        )
+
+
+@dataclass
+class UserSnapshot:
+    full_name: str
+
+    def get_full_name(self):
+        return self.full_name
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(full_name=user.get_full_name() if user else "")
+
+
+# ---------------- Procesos del pool ----------------
+def _render(kind: str, offer: OfferSnapshot, user: UserSnapshot) -> bytes:
+    return RENDERERS[kind](offer, user)
+
+
+def _init_worker():
+    """Inicializa cada proceso: Django, recursos de PDF y un render de calentamiento."""
+    import django
+    django.setup()
+
+    from .functions.pdf_resources import pdf_resources
+    pdf_resources.load()
+
+    sample = OfferSnapshot(
+        id="00000000-0000-0000-0000-000000000000",
+        created=datetime.datetime(2000, 1, 1),
+        asset_display_name="-",
+        quantity_type_display="-",
+        offer_quantity=0,
+        es_observation="",
+        en_observation="",
+        es_description="",
+        en_description="",
+        offer_img=StoredImage(b""),
+    )
+    for kind in RENDERERS:
+        _render(kind, sample, UserSnapshot("-"))
+
+
+def _ping():
+    return os.getpid()
+
+
+class PdfRenderPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._pid = None
+
+    @property
+    def workers(self) -> int:
+        return _setting("POOL_WORKERS", 2)
+
+    def _get_executor(self):
+        with self._lock:
+            # Tras un fork (p.ej. gunicorn --preload) el pool del padre no sirve en el hijo
+            if self._executor is None or self._pid != os.getpid():
+                context = multiprocessing.get_context(_setting("POOL_START_METHOD", "spawn"))
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                )
+                self._slots = threading.BoundedSemaphore(
+                    self.workers + _setting("POOL_QUEUE_SIZE", 8)
+                )
+                self._pid = os.getpid()
+            return self._executor, self._slots
+
+    def start(self, wait: bool = False):
+        """Arranca y calienta los procesos. Con wait=True espera a que estén listos."""
+        if self.workers <= 0:
+            return
+        executor, _slots = self._get_executor()
+        futures = [executor.submit(_ping) for _ in range(self.workers)]
+        if wait:
+            for future in futures:
+                future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, kind: str, offer, user, *, wait: float = 0) -> Future:
+        """
+        Encola el render del PDF `kind` y devuelve un Future con los bytes.
+        `wait`: segundos que se espera por un hueco en la cola (0 = no espera).
+        """
+        kind = str(kind)
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown PDF kind '{kind}'.")
+
+        offer_snapshot = OfferSnapshot.from_offer(offer)
+        user_snapshot = UserSnapshot.from_user(user)
+        if self.workers <= 0:
+            future = Future()
+            try:
+                future.set_result(_render(kind, offer_snapshot, user_snapshot))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+
+        executor, slots = self._get_executor()
+        acquired = slots.acquire(timeout=wait) if wait else slots.acquire(blocking=False)
+        if not acquired:
+            raise PdfRenderQueueFull("The PDF render queue is full.")
+
+        try:
+            future = executor.submit(_render, kind, offer_snapshot, user_snapshot)
+        except Exception:
+            slots.release()
+            self._reset(executor)
+            raise
+        # El hueco se libera cuando el proceso termina, aunque quien esperaba ya se haya ido
+        future.add_done_callback(lambda _f: slots.release())
+        future.pool_executor = executor
+        return future
+
+    def result(self, future: Future, *, timeout: float = None) -> bytes:
+        """Bytes de un render encolado con submit(), con el tiempo máximo por trabajo."""
+        try:
+            return future.result(timeout=timeout or _setting("RENDER_TIMEOUT", 30))
+        except FutureTimeoutError:
+            future.cancel()
+            raise PdfRenderTimeout("Rendering the PDF took too long.") from None
+        except BrokenProcessPool as exc:
+            self._reset(future.pool_executor)
+            raise PdfRenderError("The PDF render pool stopped unexpectedly.") from exc
+
+    def render(self, kind: str, offer, user, *, timeout: float = None) -> bytes:
+        """Genera el PDF `kind` de la orden en el pool y devuelve los bytes."""
+        return self.result(self.submit(kind, offer, user), timeout=timeout)
+
+
+pdf_pool = PdfRenderPool()
+atexit.register(pdf_pool.shutdown)
+
+
+def render_pdf(kind: str, offer, user, *, timeout: float = None) -> bytes:
+    return pdf_pool.render(kind, offer, user, timeout=timeout)
@@ -1,70 +1,10 @@
-import io
 import logging
-import os
 
-from django.core.files.base import ContentFile
-from django.utils.translation import gettext_lazy as _
-from PIL import Image, ImageOps
+from apps.common.utils.signals import fields_changed
 
-from apps.common.utils.functions.chatgpt_api import ChatGPTAPI
+from .fragment_cache import invalidate_offer_fragments
 
 logger = logging.getLogger(__name__)
-translator = ChatGPTAPI()
-
-# =============== OPTIMIZACIÓN ===============
-
-
-def _optimize_image(file, *, max_w=1600, max_h=1600, quality=85, to_webp=True):
-    """
-    Optimiza una imagen:
-    - Aplica orientación por EXIF
-    - Limita tamaño a max_w x max_h manteniendo proporciones
-    - Convierte a RGB si hace falta
-    - Comprime y (opcional) convierte a WebP
-    Devuelve: (bytes, new_ext)  -> bytes de la imagen optimizada y extensión sugerida ('.webp' o original).
-    """
-    try:
-        file.seek(0)
-        img = Image.open(file)
-
-        # 1) Corrige orientación por EXIF
-        img = ImageOps.exif_transpose(img)
-
-        # 2) Asegura modo compatible
-        if img.mode not in ("RGB", "RGBA"):
-            img = img.convert("RGB")
-
-        # 3) Resize si excede límites
-        img.thumbnail((max_w, max_h), Image.Resampling.LANCZOS)
-
-        # 4) Salida
-        out = io.BytesIO()
-        if to_webp:
-            # Si tiene alpha, guarda con lossless para preservar transparencia
-            save_kwargs = {"format": "WEBP",
-                           "quality": quality, "optimize": True}
-            if img.mode == "RGBA":
-                save_kwargs["lossless"] = True
-            img.save(out, **save_kwargs)
-            new_ext = ".webp"
-        else:
-            # Mantén formato original si no convertimos a WebP
-            fmt = (img.format or "JPEG").upper()
-            if fmt == "PNG" and img.mode == "RGBA":
-                # PNG con alpha, sin pérdida
-                img.save(out, format="PNG", optimize=True)
-                new_ext = ".png"
-            else:
-                img.save(out, format="JPEG", quality=quality,
-                         optimize=True, progressive=True)
-                new_ext = ".jpg"
-
-        out.seek(0)
-        return out.read(), new_ext
-    except Exception as e:
-        logger.error(f"Image optimization error: {e}")
-        # Si falla, devuelve None para no bloquear el guardado
-        return None, None
 
 
 def _is_new_file_uploaded(instance, sender, field_name: str) -> tuple[bool, str | None]:
@@ -72,18 +12,24 @@ def _is_new_file_uploaded(instance, sender, field_name: str) -> tuple[bool, str
     Determina si hay un archivo NUEVO cargado para el campo de imagen.
     Retorna (is_new, old_name)
     """
-    if not instance.pk:
+    if not instance.pk or instance._state.adding:
         # Creación: si trae archivo, es nuevo; no hay "viejo"
         return bool(getattr(instance, field_name, None)), None
 
-    try:
-        old_instance = sender.objects.get(pk=instance.pk)
-    except sender.DoesNotExist:
-        return bool(getattr(instance, field_name, None)), None
+    if instance.is_tracking_changes():
+        # Sin consultas: compara contra el valor cargado desde la BD
+        old_name = instance.get_loaded_value(field_name)
+        if not instance.has_changed(field_name):
+            return False, old_name
+    else:
+        try:
+            old_instance = sender.objects.only(field_name).get(pk=instance.pk)
+        except sender.DoesNotExist:
+            return bool(getattr(instance, field_name, None)), None
+        old_f = getattr(old_instance, field_name, None)
+        old_name = getattr(old_f, "name", None) if old_f else None
 
-    old_f = getattr(old_instance, field_name, None)
     new_f = getattr(instance, field_name, None)
-    old_name = getattr(old_f, "name", None) if old_f else None
     new_name = getattr(new_f, "name", None) if new_f else None
 
     # Si no hay nuevo, no es reemplazo
@@ -94,46 +40,29 @@ def _is_new_file_uploaded(instance, sender, field_name: str) -> tuple[bool, str
     return (old_name != new_name), old_name
 
 
-# =============== DELETE EN REEMPLAZO + OPTIMIZACIÓN PRE-SAVE ===============
-def auto_delete_and_optimize_offer_img_on_change(sender, instance, **kwargs):
+# =============== DELETE EN REEMPLAZO PRE-SAVE ===============
+def auto_delete_offer_img_on_change(sender, instance, **kwargs):
     """
-    1) Si suben una nueva imagen (reemplazo), borra el archivo anterior del storage.
-    2) Optimiza la imagen NUEVA (EXIF, resize, compresión, opcional WebP).
+    Si suben una nueva imagen (reemplazo), borra el archivo anterior del storage.
+    La nueva se guarda tal cual; sus versiones (miniatura, tarjeta, completa,
+    impresión) las genera el trabajo de apps.common.utils.images.
     """
     field_name = "offer_img"
 
-    is_new, old_name = _is_new_file_uploaded(instance, sender, field_name)
+    # Guardados que no tocan la imagen (transiciones, update_fields, ediciones de texto)
+    if not fields_changed(instance, kwargs, field_name):
+        return
 
-    # 1) Si hay reemplazo, elimina el archivo anterior del storage
-    if is_new and old_name:
-        try:
-            storage = getattr(getattr(sender.objects.get(
-                pk=instance.pk), field_name), "storage", None)
-            if storage and storage.exists(old_name):
-                storage.delete(old_name)
-        except Exception as e:
-            logger.error(f"Error deleting old offer image '{old_name}': {e}")
-
-    # 2) Optimiza la imagen nueva (si es que viene)
-    f = getattr(instance, field_name, None)
-    if not f:
+    is_new, old_name = _is_new_file_uploaded(instance, sender, field_name)
+    if not (is_new and old_name):
         return
 
     try:
-        # Evita re-optimizar si el archivo ya es pequeño y .webp con tu pipeline;
-        # aún así es seguro optimizar siempre.
-        optimized_bytes, new_ext = _optimize_image(
-            f.file, max_w=1600, max_h=1600, quality=85, to_webp=True)
-        if optimized_bytes and new_ext:
-            base_name, _ext = os.path.splitext(f.name or "image")
-            # Renombra al mismo nombre base + nueva extensión
-            new_name = f"{base_name}{new_ext}"
-            content = ContentFile(optimized_bytes)
-            # Reasigna el archivo optimizado al field
-            getattr(instance, field_name).save(new_name, content, save=False)
+        storage = sender._meta.get_field(field_name).storage
+        if storage.exists(old_name):
+            storage.delete(old_name)
     except Exception as e:
-        logger.error(
-            f"Error optimizing image for OfferModel(pk={getattr(instance, 'pk', None)}): {e}")
+        logger.error(f"Error deleting old offer image '{old_name}': {e}")
 
 
 # =============== DELETE EN BORRADO DEL OBJETO POST DELETE ===============
@@ -152,30 +81,36 @@ def auto_delete_offer_img_on_delete(sender, instance, **kwargs):
             f"Error deleting offer image on delete '{getattr(f, 'name', None)}': {e}")
 
 
-def auto_fill_offer_translation(sender, instance, **kwargs):
+def invalidate_offer_fragments_on_recipient_change(sender, instance, **kwargs):
     """
-    Autocompleta traducciones de description/observation EN<->ES si falta el par.
+    Alta/baja/edición de un destinatario de la OS: el wizard cacheado de la orden queda obsoleto.
     """
-    try:
-        # --- Observation ---
-        if instance.es_observation and not instance.en_observation:
-            instance.en_observation = translator.translate(
-                instance.es_observation, src="es", dst="en", max_chars=10000
-            )
-        elif instance.en_observation and not instance.es_observation:
-            instance.es_observation = translator.translate(
-                instance.en_observation, src="en", dst="es", max_chars=10000
-            )
-
-        # --- Description ---
-        if instance.es_description and not instance.en_description:
-            instance.en_description = translator.translate(
-                instance.es_description, src="es", dst="en", max_chars=10000
-            )
-        elif instance.en_description and not instance.es_description:
-            instance.es_description = translator.translate(
-                instance.en_description, src="en", dst="es", max_chars=10000
-            )
+    invalidate_offer_fragments(instance.offer_id)
+
+
+def discount_offer_rollup_on_delete(sender, instance, **kwargs):
+    """Descuenta del rollup mensual el aporte de una orden eliminada físicamente."""
+    from .models import OfferMonthlyRollup, rollup_state
+
+    OfferMonthlyRollup.objects.apply_change(rollup_state(instance), None)
+
+
+def invalidate_offer_documents_on_change(sender, instance, created=False, **kwargs):
+    """Cambió algún campo que aparece en la OC/OS: los PDF cacheados de la orden quedan obsoletos."""
+    from .document_cache import DOCUMENT_SOURCE_FIELDS, invalidate_offer_documents
+
+    if not created and fields_changed(instance, kwargs, *DOCUMENT_SOURCE_FIELDS):
+        invalidate_offer_documents(instance.pk)
 
+
+def auto_delete_offer_document_file(sender, instance, **kwargs):
+    """Elimina del storage el PDF de una entrada de caché borrada."""
+    f = instance.file
+    if not f:
+        return
+    try:
+        if f.name and f.storage.exists(f.name):
+            f.storage.delete(f.name)
     except Exception as e:
-        logger.exception(_(f"Error filling offer translation fields: {e}"))
+        logger.error(
+            f"Error deleting cached offer document '{getattr(f, 'name', None)}': {e}")
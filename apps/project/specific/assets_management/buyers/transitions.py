@@ -0,0 +1,486 @@
+# apps.project.specific.assets_management.buyers.transitions.py
+"""
+Motor de transiciones compare-and-set para OfferModel.
+
+Cada cambio de etapa se ejecuta como un único
+``UPDATE ... WHERE pk = <id> AND <precondición>``: si la fila ya no cumple la
+precondición (otra persona avanzó la orden, o la etapa previa no está lista)
+el UPDATE no afecta filas y se reporta un conflicto, sin pasar por
+OfferModel.save() (re-lectura, normalización, full_clean y señales pre_save).
+Las CheckConstraints de OfferModel siguen siendo la red de seguridad.
+"""
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from auditlog.cid import get_cid
+from auditlog.models import LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .fragment_cache import invalidate_offer_fragments
+from .models import (ROLLUP_STATE_FIELDS, OfferModel, OfferMonthlyRollup,
+                     rollup_state)
+
+Status = OfferModel.StatusChoices
+
+ALL_SUBPAYMENTS_PAID = Q(
+    recovery_repatriation_foundation_paid=True,
+    pay_master_service_paid=True,
+    propensiones_paid=True,
+)
+
+
+class TransitionConflict(ValidationError):
+    """La precondición de la transición no se cumplió al momento del UPDATE."""
+
+
+@dataclass(frozen=True)
+class Transition:
+    name: str
+    # Estado requerido en BD para aplicar la transición
+    precondition: Q
+    # Estado en BD que indica que la transición ya fue aplicada
+    done: Q
+    # Campos a escribir: (user, now) -> {campo: valor}
+    values: Callable
+    # Nuevo status_code, o None si la transición no cambia de etapa
+    status: Optional[str]
+    not_ready_message: str
+    done_message: str
+    # Codename de OfferModel.Meta.permissions requerido para ejecutarla
+    permission: str
+
+    def update_values(self, user, now) -> dict:
+        values = dict(self.values(user, now))
+        if self.status:
+            values["status_code"] = self.status
+        values["updated"] = now
+        return values
+
+
+@dataclass
+class TransitionResult:
+    offer_id: object
+    transition: str
+    ok: bool
+    error: str = ""
+
+    @property
+    def conflict(self) -> bool:
+        return not self.ok
+
+
+def _stage(prev_at: str, at: str, by: str, status, permission, not_ready, done):
+    """Etapa secuencial: requiere prev_at y que at aún no esté marcado."""
+    return dict(
+        permission=permission,
+        precondition=Q(**{f"{prev_at}__isnull": False, f"{at}__isnull": True}),
+        done=Q(**{f"{at}__isnull": False}),
+        values=lambda user, now: {by: user, at: now},
+        status=status,
+        not_ready_message=not_ready,
+        done_message=done,
+    )
+
+
+def _subpayment(paid: str, by: str, at: str, *, pay: bool):
+    """Marca/desmarca uno de los tres subpagos de rentabilidad."""
+    # El codename del permiso coincide con el nombre del campo booleano
+    if pay:
+        return dict(
+            permission=paid,
+            precondition=Q(**{"profitability_created_at__isnull": False, paid: False}),
+            done=Q(**{paid: True}),
+            values=lambda user, now: {paid: True, by: user, at: now},
+            status=None,
+            not_ready_message=_(
+                "You cannot mark sub-payments before profitability is created."),
+            done_message=_("This sub-payment is already marked as paid."),
+        )
+    # Desmarcar reabre la rentabilidad (igual que la normalización de save())
+    return dict(
+        permission=paid,
+        precondition=Q(**{"profitability_created_at__isnull": False, paid: True}),
+        done=Q(**{paid: False}),
+        values=lambda user, now: {
+            paid: False, by: None, at: None,
+            "profitability_paid_by": None, "profitability_paid_at": None,
+        },
+        status=Status.PROFIT_CREATED,
+        not_ready_message=_(
+            "You cannot mark sub-payments before profitability is created."),
+        done_message=_("This sub-payment is not marked as paid."),
+    )
+
+
+TRANSITIONS = {
+    t.name: t for t in [
+        Transition(
+            name="REVIEW",
+            precondition=Q(reviewed=False, is_approved=False),
+            done=Q(reviewed=True),
+            values=lambda user, now: {
+                "reviewed": True,
+                "reviewed_by": user,
+                "reviewed_by_timestamp": now,
+            },
+            status=Status.NOT_APPROVED,
+            permission="can_review_offer",
+            not_ready_message=_("This purchase order cannot be reviewed."),
+            done_message=_("This purchase order is already reviewed."),
+        ),
+        # Aprobar crea la orden de servicio en el mismo UPDATE (como hace save())
+        Transition(
+            name="APPROVE",
+            precondition=Q(reviewed=True, is_approved=False),
+            done=Q(is_approved=True),
+            values=lambda user, now: {
+                "is_approved": True,
+                "approved_by": user,
+                "approved_by_timestamp": now,
+                "service_order_created_by": user,
+                "service_order_created_at": now,
+            },
+            status=Status.SO_CREATED,
+            permission="can_approve_offer",
+            not_ready_message=_(
+                "You cannot approve before the purchase order is reviewed."),
+            done_message=_("This purchase order is already approved."),
+        ),
+        Transition(name="SO_SEND", **_stage(
+            "service_order_created_at", "service_order_sent_at", "service_order_sent_by",
+            Status.SO_SENT, "can_send_service_order",
+            _("You cannot send a service order before it is created."),
+            _("The service order was already sent."),
+        )),
+        Transition(name="PAY_CREATE", **_stage(
+            "service_order_sent_at", "payment_order_created_at", "payment_order_created_by",
+            Status.PAY_CREATED, "can_create_payment_order",
+            _("You cannot create a payment order before service order is sent."),
+            _("The payment order was already created."),
+        )),
+        Transition(name="PAY_SEND", **_stage(
+            "payment_order_created_at", "payment_order_sent_at", "payment_order_sent_by",
+            Status.PAY_SENT, "can_send_payment_order",
+            _("You cannot send a payment order before it is created."),
+            _("The payment order was already sent."),
+        )),
+        Transition(name="POSSESSION", **_stage(
+            "payment_order_sent_at", "asset_in_possession_at", "asset_in_possession_by",
+            Status.POSSESSION, "can_set_asset_possession",
+            _("You cannot mark asset in possession before payment order is sent."),
+            _("The asset is already marked in possession."),
+        )),
+        Transition(name="ASSET_SEND", **_stage(
+            "asset_in_possession_at", "asset_sent_at", "asset_sent_by",
+            Status.ASSET_SENT, "can_send_asset",
+            _("You cannot mark asset as sent before it is in possession."),
+            _("The asset is already marked as sent."),
+        )),
+        Transition(name="PROFIT_CREATE", **_stage(
+            "asset_sent_at", "profitability_created_at", "profitability_created_by",
+            Status.PROFIT_CREATED, "can_set_profitability",
+            _("You cannot create profitability before asset is sent."),
+            _("Profitability was already created."),
+        )),
+        Transition(name="RRF_PAY", **_subpayment(
+            "recovery_repatriation_foundation_paid",
+            "recovery_repatriation_foundation_mark_by",
+            "recovery_repatriation_foundation_mark_at",
+            pay=True,
+        )),
+        Transition(name="RRF_UNPAY", **_subpayment(
+            "recovery_repatriation_foundation_paid",
+            "recovery_repatriation_foundation_mark_by",
+            "recovery_repatriation_foundation_mark_at",
+            pay=False,
+        )),
+        Transition(name="AMPRO_PAY", **_subpayment(
+            "pay_master_service_paid",
+            "pay_master_service_mark_by",
+            "pay_master_service_mark_at",
+            pay=True,
+        )),
+        Transition(name="AMPRO_UNPAY", **_subpayment(
+            "pay_master_service_paid",
+            "pay_master_service_mark_by",
+            "pay_master_service_mark_at",
+            pay=False,
+        )),
+        Transition(name="PROP_PAY", **_subpayment(
+            "propensiones_paid",
+            "propensiones_mark_by",
+            "propensiones_mark_at",
+            pay=True,
+        )),
+        Transition(name="PROP_UNPAY", **_subpayment(
+            "propensiones_paid",
+            "propensiones_mark_by",
+            "propensiones_mark_at",
+            pay=False,
+        )),
+        Transition(
+            name="PROFIT_PAY",
+            precondition=Q(
+                profitability_created_at__isnull=False,
+                profitability_paid_at__isnull=True,
+            ) & ALL_SUBPAYMENTS_PAID,
+            done=Q(profitability_paid_at__isnull=False),
+            values=lambda user, now: {
+                "profitability_paid_by": user,
+                "profitability_paid_at": now,
+            },
+            status=Status.PROFIT_PAID,
+            permission="can_approve_pay_profitability",
+            not_ready_message=_(
+                "All profitability sub-payments must be marked as paid first."),
+            done_message=_("Profitability was already paid."),
+        ),
+    ]
+}
+
+
+def get_transition(name: str) -> Transition:
+    try:
+        return TRANSITIONS[(name or "").upper()]
+    except KeyError:
+        raise ValidationError(_("Unknown step."))
+
+
+def _conflict_message(transition: Transition, offer_id) -> str:
+    # Solo en el camino de conflicto: distinguir "ya aplicada" de "aún no corresponde"
+    if OfferModel.objects.filter(transition.done, pk=offer_id).exists():
+        return str(transition.done_message)
+    return str(transition.not_ready_message)
+
+
+def _log_transition(offer, old_values: dict, values: dict, user):
+    """
+    QuerySet.update() no dispara las señales de auditlog: se registra el cambio a mano.
+    """
+    changes = {}
+    for field, value in values.items():
+        value = getattr(value, "pk", value)  # FKs se comparan por ID
+        if field != "updated" and old_values[field] != value:
+            changes[field] = [str(old_values[field]), str(value)]
+
+    if changes:
+        LogEntry.objects.log_create(
+            offer,
+            action=LogEntry.Action.UPDATE,
+            changes=changes,
+            actor=user,
+        )
+
+
+def _touches_rollup(values: dict) -> bool:
+    return any(field in ROLLUP_STATE_FIELDS for field in values)
+
+
+def apply_transition(offer: OfferModel, name: str, user) -> TransitionResult:
+    """
+    Aplica la transición `name` a `offer` con un UPDATE condicional.
+    En éxito actualiza la instancia en memoria; en conflicto no modifica nada.
+    """
+    transition = get_transition(name)
+    now = timezone.now()
+    values = transition.update_values(user, now)
+
+    touches_rollup = _touches_rollup(values)
+
+    with transaction.atomic():
+        before = None
+        if touches_rollup:
+            # Estado actual desde la BD (la instancia puede estar desactualizada)
+            before = (
+                OfferModel.objects
+                .select_for_update()
+                .filter(pk=offer.pk)
+                .values(*ROLLUP_STATE_FIELDS)
+                .first()
+            )
+
+        updated = (
+            OfferModel.objects
+            .filter(transition.precondition, pk=offer.pk)
+            .update(**values)
+        )
+        if not updated:
+            return TransitionResult(
+                offer.pk, transition.name, False,
+                _conflict_message(transition, offer.pk),
+            )
+
+        if touches_rollup:
+            OfferMonthlyRollup.objects.apply_change(
+                rollup_state(before), rollup_state({**before, **values}))
+
+        # attname: lee el *_id de las FKs sin consultar la relación
+        old_values = {
+            field: getattr(offer, offer._meta.get_field(field).attname)
+            for field in values
+        }
+        for field, value in values.items():
+            setattr(offer, field, value)
+        # Los valores escritos pasan a ser los "cargados" (has_changed / save())
+        offer._snapshot_loaded_values(values)
+        _log_transition(offer, old_values, values, user)
+        invalidate_offer_fragments(offer.pk)
+
+    return TransitionResult(offer.pk, transition.name, True)
+
+
+def user_can_apply(user, name: str) -> bool:
+    """Superusers/staff, o el permiso de la transición (igual que el wizard)."""
+    if user.is_superuser or user.is_staff:
+        return True
+    return user.has_perm(f"buyers.{get_transition(name).permission}")
+
+
+@dataclass
+class BulkTransitionReport:
+    transition: str
+    results: list
+
+    @property
+    def applied(self) -> list:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def conflicts(self) -> list:
+        return [r for r in self.results if not r.ok]
+
+    def as_dict(self) -> dict:
+        return {
+            "transition": self.transition,
+            "applied": len(self.applied),
+            "conflicts": len(self.conflicts),
+            "results": [
+                {"id": str(r.offer_id), "ok": r.ok, "error": r.error}
+                for r in self.results
+            ],
+        }
+
+
+def _normalize_id(value) -> str:
+    """UUID canónico como str, o "" si no es un UUID válido."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return ""
+
+
+def apply_bulk_transition(offer_ids, name: str, user) -> BulkTransitionReport:
+    """
+    Aplica la transición `name` a muchas órdenes en una sola transacción:
+
+    1. Selecciona (y bloquea) en SQL las que cumplen la precondición.
+    2. Las actualiza con un único UPDATE que repite la precondición.
+    3. Clasifica el resto (ya aplicada / aún no corresponde / inexistente).
+
+    Devuelve un BulkTransitionReport con un resultado por ID recibido.
+    """
+    transition = get_transition(name)
+    ids = list(dict.fromkeys(str(pk) for pk in offer_ids))
+    normalized = {raw: _normalize_id(raw) for raw in ids}
+    valid_ids = list(dict.fromkeys(pk for pk in normalized.values() if pk))
+    now = timezone.now()
+    values = transition.update_values(user, now)
+    attnames = {
+        field: OfferModel._meta.get_field(field).attname for field in values
+    }
+    touches_rollup = _touches_rollup(values)
+    state_fields = [f for f in ROLLUP_STATE_FIELDS if f not in attnames.values()] if touches_rollup else []
+
+    with transaction.atomic():
+        eligible = {
+            str(row["pk"]): row
+            for row in (
+                OfferModel.objects
+                .select_for_update()
+                .filter(transition.precondition, pk__in=valid_ids)
+                .values("pk", *attnames.values(), *state_fields)
+            )
+        }
+
+        if eligible:
+            updated = (
+                OfferModel.objects
+                .filter(transition.precondition, pk__in=list(eligible))
+                .update(**values)
+            )
+            if updated != len(eligible):
+                # Sin bloqueo de filas (p.ej. SQLite) alguien pudo adelantarse: todo o nada
+                raise TransitionConflict(
+                    _("Some purchase orders changed during the bulk update. Please retry."))
+
+            _log_bulk_transition(eligible, attnames, values, user)
+            if touches_rollup:
+                OfferMonthlyRollup.objects.apply_changes(
+                    (rollup_state(row), rollup_state({**row, **values}))
+                    for row in eligible.values()
+                )
+            invalidate_offer_fragments(*eligible)
+
+        pending = [pk for pk in valid_ids if pk not in eligible]
+        existing, done = set(), set()
+        if pending:
+            existing = {
+                str(pk) for pk in OfferModel.objects.filter(pk__in=pending).values_list("pk", flat=True)
+            }
+            done = {
+                str(pk) for pk in
+                OfferModel.objects.filter(transition.done, pk__in=pending).values_list("pk", flat=True)
+            }
+
+    results = []
+    for raw in ids:
+        pk = normalized[raw]
+        if pk in eligible:
+            results.append(TransitionResult(pk, transition.name, True))
+        elif pk not in existing:
+            results.append(TransitionResult(
+                raw, transition.name, False, str(_("Purchase order not found."))))
+        elif pk in done:
+            results.append(TransitionResult(
+                pk, transition.name, False, str(transition.done_message)))
+        else:
+            results.append(TransitionResult(
+                pk, transition.name, False, str(transition.not_ready_message)))
+
+    return BulkTransitionReport(transition.name, results)
+
+
+def _log_bulk_transition(eligible: dict, attnames: dict, values: dict, user):
+    """Una LogEntry por orden actualizada, insertadas con bulk_create."""
+    content_type = ContentType.objects.get_for_model(OfferModel)
+    reprs = {
+        str(offer.pk): str(offer)
+        for offer in OfferModel.objects.filter(pk__in=list(eligible)).select_related(
+            "asset__asset_name", "buyer_country")
+    }
+    cid = get_cid()
+
+    entries = []
+    for pk, row in eligible.items():
+        changes = {}
+        for field, value in values.items():
+            value = getattr(value, "pk", value)
+            old = row[attnames[field]]
+            if field != "updated" and old != value:
+                changes[field] = [str(old), str(value)]
+        entries.append(LogEntry(
+            content_type=content_type,
+            object_pk=pk,
+            object_repr=reprs.get(pk, pk),
+            action=LogEntry.Action.UPDATE,
+            changes=changes,
+            actor=user,
+            cid=cid,
+        ))
+    LogEntry.objects.bulk_create(entries, batch_size=500)
@@ -6,9 +6,12 @@ from apps.project.specific.assets_management.buyers.views import (
     OfferUpdateView,
     PurchaseOrderCreateView,
     PurchaseOrdersView,
+    PurchaseOrdersDataView,
     OfferApprovalWizardPageView,
     OfferApprovalWizardPartialView,
     OfferApprovalWizardActionView,
+    OfferBulkTransitionView,
+    OfferDocumentDownloadView,
     ProfitabilityTemplateView,
     InventoryTemplateView,
     AssetCreditFormTemplateView,
@@ -39,6 +42,11 @@ urlpatterns = [
         PurchaseOrdersView.as_view(),
         name='buyer_index'
     ),
+    path(
+        'buyer/asset/purchase-orders/data/',
+        PurchaseOrdersDataView.as_view(),
+        name='buyer_index_data'
+    ),
     path(
         'buyer/asset/purchase-order/add/',
         PurchaseOrderCreateView.as_view(),
@@ -59,6 +67,16 @@ urlpatterns = [
         OfferApprovalWizardActionView.as_view(),
         name="offer_wizard_action"
     ),
+    path(
+        "po/<uuid:id>/pdf/<str:kind>/",
+        OfferDocumentDownloadView.as_view(),
+        name="offer_document_download"
+    ),
+    path(
+        "po/bulk/action/",
+        OfferBulkTransitionView.as_view(),
+        name="offer_bulk_action"
+    ),
     path(
         "profitability/",
         ProfitabilityTemplateView.as_view(),
@@ -1,25 +1,24 @@
 # apps.project.specific.assets_management.buyers.views.py
 import logging
 import os
+import uuid
 from datetime import date
-from email.mime.image import MIMEImage
 
-import requests
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import (LoginRequiredMixin,
                                         PermissionRequiredMixin)
 from django.core.exceptions import ValidationError
-from django.core.mail import EmailMultiAlternatives
-from django.db.models import Count, Sum
-from django.db.models.functions import Coalesce, TruncMonth
-from django.http import JsonResponse
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.middleware.csrf import get_token
 from django.shortcuts import get_object_or_404, redirect
 from django.template.loader import render_to_string
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.formats import date_format
 from django.utils.html import escape
 from django.utils.translation import get_language
 from django.utils.translation import gettext as _
@@ -28,15 +27,26 @@ from django.utils.translation import override
 from django.views.generic import (CreateView, DetailView, TemplateView,
                                   UpdateView, View)
 
+from apps.common.utils.email_builder import EmailBuilder, image_preview
+from apps.common.utils.images import rendition_file
+from apps.common.utils.jobs import enqueue
+from apps.common.utils.outbox import queue_email
+from apps.common.utils.translation import localized_value
 from apps.project.common.users.models import UserModel
 from apps.project.specific.assets_management.assets.models import (
     AssetCategoryModel, AssetModel)
-from apps.project.specific.assets_management.assets_location.models import \
-    AssetLocationModel
+from apps.project.specific.assets_management.assets_location.models import (
+    AssetCountryModel, AssetLocationModel, AssetStockSnapshot)
 
 from .form import OfferForm, OfferUpdateForm, ServiceOrderRecipientsForm
-from .functions import generate_purchase_order_pdf, generate_service_order_pdf
-from .models import OfferModel
+from .fragment_cache import (TIMELINE_TEMPLATE, WIZARD_TEMPLATE,
+                             render_offer_fragment)
+from .document_cache import document_filename, get_offer_document, get_offer_document_bytes
+from .jobs import SERVICE_ORDER_NOTIFICATION_JOB, resolve_so_emails
+from .models import OfferDocumentCache, OfferModel, OfferMonthlyRollup
+from .pdf_pool import PdfRenderError
+from .transitions import (TransitionConflict, apply_bulk_transition,
+                          get_transition, user_can_apply)
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +67,17 @@ def _localized_str(value, lang: str) -> str:
         return str(value) if value is not None else ""
 
 
+def _is_uuid(value: str) -> bool:
+    """
+    Indica si value es un UUID válido (IDs de OfferModel usados como cursor).
+    """
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        return False
+    return True
+
+
 def build_wizard_context(request, offer):
     # Aliases
     so_created = offer.service_order_created_at
@@ -187,32 +208,20 @@ def build_wizard_context(request, offer):
     return ctx
 
 
-def _resolve_so_emails(offer):
-    # Usuarios seleccionados explícitos
-    user_ids = list(
-        offer.so_recipients.filter(user__isnull=False)
-        .values_list('user_id', flat=True)
+def render_wizard_html(request, offer) -> str:
+    """HTML del parcial del wizard, servido desde la caché de fragmentos si la orden no cambió."""
+    return render_offer_fragment(
+        "wizard", request, offer, WIZARD_TEMPLATE,
+        lambda: build_wizard_context(request, offer),
     )
-    # Tipos seleccionados
-    type_codes = list(
-        offer.so_recipients.filter(user_type__isnull=False)
-             .values_list('user_type', flat=True)
-    )
-
-    qs_users = UserModel.objects.filter(is_active=True)
-    emails = set()
 
-    if user_ids:
-        for email in qs_users.filter(id__in=user_ids).values_list('email', flat=True):
-            if email:
-                emails.add(email)
 
-    if type_codes:
-        for email in qs_users.filter(user_type__in=type_codes).values_list('email', flat=True):
-            if email:
-                emails.add(email)
-
-    return sorted(set(emails))
+def render_timeline_html(request, offer) -> str:
+    """HTML del timeline de la orden, con la misma caché versionada que el wizard."""
+    return render_offer_fragment(
+        "timeline", request, offer, TIMELINE_TEMPLATE,
+        lambda: {"offer": offer},
+    )
 
 
 class BuyerRequiredMixin(LoginRequiredMixin):
@@ -284,9 +293,23 @@ class PurchaseOrdersView(BuyerRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        offers = OfferModel.objects.all()
-
-        context['offers'] = offers
+        # Las filas las entrega PurchaseOrdersDataView; aquí solo los filtros iniciales
+        status = self.request.GET.get('status')
+        if status not in OfferModel.StatusChoices.values:
+            status = None
+
+        context['status_filter'] = status
+        context['countries'] = AssetCountryModel.objects.filter(
+            buyers_offer_country__display=True
+        ).distinct().order_by('es_country_name')
+
+        # Conteo por estado en un solo GROUP BY (solo estados con registros)
+        status_counts = OfferModel.objects.filter(display=True).status_counts()
+        context['status_options'] = [
+            (code, label, status_counts[code])
+            for code, label in OfferModel.StatusChoices.choices
+            if status_counts.get(code)
+        ]
 
         context['categories'] = AssetCategoryModel.objects.all().order_by('es_name')
 
@@ -296,6 +319,8 @@ class PurchaseOrdersView(BuyerRequiredMixin, TemplateView):
                 is_active=True
             ).select_related(
                 'asset_name', 'category'
+            ).prefetch_related(
+                'renditions'
             ).order_by(
                 'asset_name__es_name'
             )
@@ -305,6 +330,122 @@ class PurchaseOrdersView(BuyerRequiredMixin, TemplateView):
         return context
 
 
+class PurchaseOrdersDataView(BuyerRequiredMixin, View):
+    """
+    JSON para la tabla de órdenes de compra en modo servidor.
+
+    Parámetros GET:
+        status:  código de StatusChoices (opcional)
+        country: ID de AssetCountryModel (opcional)
+        sort:    una de SORTABLE_FIELDS (por defecto "created")
+        dir:     "asc" | "desc" (por defecto "desc")
+        after:   ID de la última fila recibida (paginación keyset)
+        limit:   filas por página (máx. MAX_LIMIT)
+    """
+    SORTABLE_FIELDS = {
+        'created': 'created',
+        'quantity': 'offer_quantity',
+        'quantity_type': 'quantity_type',
+        'offer_type': 'offer_type',
+        'status': 'status_code',
+    }
+    DEFAULT_LIMIT = 25
+    MAX_LIMIT = 100
+
+    def get_queryset(self):
+        # Solo las relaciones y columnas que pinta la tabla
+        return (
+            OfferModel.objects
+            .filter(display=True)
+            .select_related('created_by', 'asset__asset_name', 'buyer_country')
+            .only(
+                'id', 'created', 'offer_quantity', 'quantity_type', 'offer_type',
+                'status_code', 'reviewed', 'is_approved', 'display',
+                'es_description', 'en_description',
+                'created_by__first_name', 'created_by__last_name',
+                'asset__asset_name__es_name', 'asset__asset_name__en_name',
+                'buyer_country__continent', 'buyer_country__es_country_name',
+            )
+        )
+
+    def get(self, request, *args, **kwargs):
+        qs = self.get_queryset()
+
+        status = request.GET.get('status')
+        if status in OfferModel.StatusChoices.values:
+            qs = qs.with_status(status)
+
+        country = request.GET.get('country')
+        if country and country.isdigit():
+            qs = qs.filter(buyer_country_id=int(country))
+
+        sort_key = request.GET.get('sort', 'created')
+        sort_field = self.SORTABLE_FIELDS.get(sort_key, 'created')
+        descending = request.GET.get('dir', 'desc') != 'asc'
+
+        try:
+            limit = int(request.GET.get('limit', self.DEFAULT_LIMIT))
+        except ValueError:
+            limit = self.DEFAULT_LIMIT
+        limit = max(1, min(limit, self.MAX_LIMIT))
+
+        # Keyset: (sort_field, id) estrictamente después de la última fila recibida
+        after = request.GET.get('after')
+        if after:
+            anchor = OfferModel.objects.filter(pk=after).values(sort_field).first() if _is_uuid(after) else None
+            if anchor is None:
+                return JsonResponse({'success': False, 'error': 'invalid cursor'}, status=400)
+            op = 'lt' if descending else 'gt'
+            value = anchor[sort_field]
+            qs = qs.filter(
+                Q(**{f'{sort_field}__{op}': value}) |
+                Q(**{sort_field: value, f'pk__{op}': after})
+            )
+
+        prefix = '-' if descending else ''
+        rows = list(qs.order_by(f'{prefix}{sort_field}', f'{prefix}pk')[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        can_see_wizard = request.user.has_perm('buyers.can_see_wizard_page')
+        lang = get_language() or 'en'
+
+        return JsonResponse({
+            'success': True,
+            'results': [self.serialize(o, lang, can_see_wizard) for o in rows],
+            'next': str(rows[-1].pk) if has_more else None,
+        })
+
+    @staticmethod
+    def serialize(offer, lang, can_see_wizard):
+        asset_name = offer.asset.asset_name
+        country = offer.buyer_country
+        return {
+            'id': str(offer.pk),
+            'created_by': (offer.created_by.get_full_name().upper() if offer.created_by else ''),
+            'asset': localized_value(asset_name, 'name', lang),
+            'description': localized_value(offer, 'description', lang),
+            'quantity_type': offer.get_quantity_type_display(),
+            'quantity': offer.offer_quantity,
+            'created': date_format(timezone.localtime(offer.created), 'DATETIME_FORMAT'),
+            'country': (
+                f"{country.get_continent_display()} - {country.es_country_name}" if country else ''
+            ),
+            'offer_type': offer.get_offer_type_display(),
+            'status': offer.status_code,
+            'status_label': str(offer.status_label),
+            'status_icon': offer.status_icon,
+            'status_color': offer.status_color,
+            'is_approved': offer.is_approved,
+            'urls': {
+                'detail': reverse('buyers:offer_details', args=[offer.pk]),
+                'update': reverse('buyers:offer_update', args=[offer.pk]) if not offer.reviewed else None,
+                'delete': reverse('buyers:offer_delete', args=[offer.pk]) if not offer.is_approved else None,
+                'wizard': reverse('buyers:offer_wizard_page', args=[offer.pk]) if can_see_wizard else None,
+            },
+        }
+
+
 class PurchaseOrderCreateView(BuyerRequiredMixin, CreateView):
     model = OfferModel
     form_class = OfferForm
@@ -349,7 +490,54 @@ class PurchaseOrderCreateView(BuyerRequiredMixin, CreateView):
             reverse("buyers:offer_details", kwargs={"id": offer_instance.id})
         )
 
-        offer_img_cid = f"offer_img_{offer_instance.id}"
+        builder = EmailBuilder(
+            subject,
+            "Orden de compra adjunta",
+            from_email="no-reply@propensionesabogados.com",
+            to=recipient_email,
+            bcc=hide_recipient_email,
+        )
+
+        # Logo inline desde el registro en memoria (sin red)
+        builder.inline_asset("gea_logo")
+
+        # Adjuntar PDF
+        # Si el pool de render está saturado el correo sale sin PDF
+        # (se puede descargar luego desde buyers:offer_document_download)
+        kind = OfferDocumentCache.KindChoices.PURCHASE_ORDER
+        try:
+            pdf_bytes = get_offer_document_bytes(
+                kind, offer_instance, self.request.user
+            )
+        except PdfRenderError as e:
+            logger.error(f"Purchase order PDF not attached for {offer_instance.id}: {e}")
+        else:
+            builder.attach(
+                document_filename(kind, offer_instance),
+                pdf_bytes,
+                "application/pdf"
+            )
+
+        # Imagen de la oferta: vista previa reducida inline (desde la versión
+        # "card" si ya existe). La original no se adjunta (ya va en el PDF); solo
+        # la versión "full" de 1600px, opcional dentro del presupuesto del correo
+        offer_img_cid = None
+        if offer_instance.offer_img and offer_instance.offer_img.name:
+            try:
+                source = rendition_file(offer_instance, "card") or offer_instance.offer_img
+                with source.open('rb') as fh:
+                    offer_img_cid = builder.inline_image(
+                        f"offer_img_{offer_instance.id}",
+                        image_preview(fh.read()),
+                        "preview.jpg",
+                    )
+
+                full = rendition_file(offer_instance, "full")
+                if full is not None:
+                    with full.open('rb') as fh:
+                        builder.attach(os.path.basename(full.name), fh.read(), optional=True)
+            except Exception as e:
+                logger.error(f"Error attaching offer image to email: {e}")
 
         safe_data = {
             "asset_es": escape(offer_instance.asset.asset_name.es_name or offer_instance.asset.asset_name.en_name or ""),
@@ -373,72 +561,19 @@ class PurchaseOrderCreateView(BuyerRequiredMixin, CreateView):
             "offer_img_cid": offer_img_cid
         }
 
-        html_content = render_to_string(
+        builder.html = render_to_string(
             "email/purchase_order_email_template.html",
             safe_data
         )
+        email = builder.build()
 
-        # Email con soporte para multipart/related
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body="Orden de compra adjunta",
-            from_email="no-reply@propensionesabogados.com",
-            to=recipient_email,
-            bcc=hide_recipient_email,
-        )
-        email.attach_alternative(html_content, "text/html")
-
-        # Adjuntar PDF
-        pdf_bytes = generate_purchase_order_pdf(
-            offer_instance, self.request.user
-        )
-        email.attach(
-            f"purchase_order_{offer_instance.id}.pdf",
-            pdf_bytes,
-            "application/pdf"
-        )
-
-        # Adjuntar logo PNG inline
-        email.mixed_subtype = "related"
-        logo_url = "https://geausa.propensionesabogados.com/public/static/assets/imgs/logos/gea_logo.webp"
-        resp = requests.get(logo_url, timeout=10)
-        if resp.status_code == 200:
-            mime_img = MIMEImage(resp.content, _subtype="webp")
-            mime_img.add_header("Content-ID", "<gea_logo>")
-            mime_img.add_header("Content-Disposition",
-                                "inline", filename="gea_logo.webp")
-            email.attach(mime_img)
-
-        # Adjuntar imagen de la oferta (desde el storage) como inline + attachment
-        if offer_instance.offer_img and offer_instance.offer_img.name:
-            try:
-                offer_instance.offer_img.open('rb')
-                img_data = offer_instance.offer_img.read()
-
-                # inline para que se muestre dentro del HTML (CID)
-                mime_offer_inline = MIMEImage(img_data)
-                mime_offer_inline.add_header(
-                    "Content-ID", f"<{offer_img_cid}>")
-                mime_offer_inline.add_header(
-                    "Content-Disposition",
-                    "inline",
-                    filename=os.path.basename(offer_instance.offer_img.name)
-                )
-                email.attach(mime_offer_inline)
-
-                mime_offer_attach = MIMEImage(img_data)
-                mime_offer_attach.add_header(
-                    "Content-Disposition",
-                    "attachment",
-                    filename=os.path.basename(offer_instance.offer_img.name)
-                )
-                email.attach(mime_offer_attach)
-
-            except Exception as e:
-                logger.error(f"Error attaching offer image to email: {e}")
-
+        # Lo entrega `send_outbox`: la respuesta no espera al servidor de correo
         if not settings.DEBUG:
-            email.send(fail_silently=False)
+            queue_email(
+                email,
+                idempotency_key=f"po-created:{offer_instance.pk}",
+                category="buyers.purchase_order",
+            )
 
 
 class OfferUpdateView(BuyerRequiredMixin, UpdateView):
@@ -541,17 +676,17 @@ class OfferApprovalWizardPageView(BuyerRequiredMixin, PermissionRequiredMixin, T
         return ctx
 
 
-class OfferApprovalWizardPartialView(BuyerRequiredMixin, PermissionRequiredMixin, TemplateView):
+class OfferApprovalWizardPartialView(BuyerRequiredMixin, PermissionRequiredMixin, View):
     """
     Devuelve SOLO el HTML del wizard (parcial) para ser inyectado por fetch().
+    Mientras la orden no cambie se sirve desde la caché de fragmentos.
     """
-    template_name = "dashboard/pages/buyers/wizard/partials/_offer_approval_wizard.html"
+    http_method_names = ["get"]
     permission_required = ("buyers.can_see_wizard_page",)
 
-    def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        offer = get_object_or_404(OfferModel, id=self.kwargs.get("id"))
-        return build_wizard_context(self.request, offer)
+    def get(self, request, *args, **kwargs):
+        offer = get_object_or_404(OfferModel, id=kwargs.get("id"))
+        return HttpResponse(render_wizard_html(request, offer))
 
 
 class OfferApprovalWizardActionView(BuyerRequiredMixin, PermissionRequiredMixin, View):
@@ -580,12 +715,7 @@ class OfferApprovalWizardActionView(BuyerRequiredMixin, PermissionRequiredMixin,
             if q:
                 offer.so_recipients.filter(q).delete()
 
-            ctx = build_wizard_context(request, offer)
-            html = render_to_string(
-                "dashboard/pages/buyers/wizard/partials/_offer_approval_wizard.html",
-                ctx, request=request
-            )
-            return JsonResponse({"ok": True, "html": html})
+            return JsonResponse({"ok": True, "html": render_wizard_html(request, offer)})
 
         # --- recipients: add ---
         if step == "SO_ADD_RECIPIENTS":
@@ -596,17 +726,12 @@ class OfferApprovalWizardActionView(BuyerRequiredMixin, PermissionRequiredMixin,
             else:
                 return JsonResponse({"ok": False, "errors": sum(form.errors.values(), [])}, status=400)
 
-            ctx = build_wizard_context(request, offer)
-            html = render_to_string(
-                "dashboard/pages/buyers/wizard/partials/_offer_approval_wizard.html",
-                ctx, request=request
-            )
-            return JsonResponse({"ok": True, "html": html})
+            return JsonResponse({"ok": True, "html": render_wizard_html(request, offer)})
 
         # --- service order: notify (sends email + pdf) ---
         if step == "SO_NOTIFY":
             self._require_perm(request.user, "can_send_service_order")
-            recipients = _resolve_so_emails(offer)
+            recipients = resolve_so_emails(offer)
             if not recipients:
                 return JsonResponse(
                     {"ok": False, "errors": [_("No recipients to notify.")]},
@@ -616,70 +741,31 @@ class OfferApprovalWizardActionView(BuyerRequiredMixin, PermissionRequiredMixin,
             review_url = request.build_absolute_uri(
                 reverse("buyers:offer_details", kwargs={"id": offer.id})
             )
-            safe_data = {
-                "po_short": str(offer.id)[:8],
-                "asset_es": escape(getattr(offer.asset.asset_name, "es_name", "")),
-                "tipo_cantidad_es": escape(offer.get_quantity_type_display()),
-                "cantidad": offer.offer_quantity,
-                "pais_comprador_es": escape(str(offer.buyer_country or "")),
-                "obs_es": escape(offer.es_observation or ""),
-                "desc_es": escape(offer.es_description or ""),
-                "created": offer.service_order_created_at or offer.created,
-                "sent_at": offer.service_order_sent_at,
-                "review_url": review_url,
-                "user_name": escape(request.user.get_full_name()),
-                "user_email": escape(request.user.email),
-                "logo_cid": "gea_logo",
-            }
-
-            subject = _("Service Order Notification for OC: %(po)s") % {
-                "po": str(offer.id)}
-            html_content = render_to_string(
-                "email/service_order_email_template.html", safe_data)
-
-            email = EmailMultiAlternatives(
-                subject=subject,
-                body="Orden de Servicio adjunta",
-                from_email="no-reply@propensionesabogados.com",
-                to=[],
-                bcc=recipients,
-            )
-            email.attach_alternative(html_content, "text/html")
-
-            # Adjuntar PDF
-            pdf_bytes = generate_service_order_pdf(offer, request.user)
-            email.attach(
-                f"orden_servicio_{str(offer.id).upper()}.pdf", pdf_bytes, "application/pdf"
+            # El correo (PDF + SMTP) lo envía un worker: la respuesta no espera al servidor de correo
+            enqueue(
+                SERVICE_ORDER_NOTIFICATION_JOB,
+                {
+                    "offer_id": str(offer.pk),
+                    "user_id": str(request.user.pk),
+                    "review_url": review_url,
+                    "language": get_language() or "es",
+                    "notification_id": uuid.uuid4().hex,
+                },
+                dedupe_key=f"so-notify:{offer.pk}",
             )
 
-            # Adjuntar logo PNG desde la URL
-            email.mixed_subtype = "related"  # importante para HTML + inline
-            logo_url = "https://geausa.propensionesabogados.com/public/static/assets/imgs/logos/gea_logo.webp"
-            resp = requests.get(logo_url, timeout=10)
-            if resp.status_code == 200:
-                mime_img = MIMEImage(resp.content, _subtype="webp")
-                mime_img.add_header("Content-ID", "<gea_logo>")
-                mime_img.add_header("Content-Disposition",
-                                    "inline", filename="gea_logo.webp")
-                email.attach(mime_img)
-
-            email.send(fail_silently=False)
-
-            if not offer.service_order_sent_at:
-                offer.service_order_sent_at = timezone.now()
-                offer.save(update_fields=["service_order_sent_at"])
-
-            ctx = build_wizard_context(request, offer)
-            html = render_to_string(
-                "dashboard/pages/buyers/wizard/partials/_offer_approval_wizard.html",
-                ctx,
-                request=request,
-            )
-            return JsonResponse({"ok": True, "html": html})
+            return JsonResponse({
+                "ok": True,
+                "queued": True,
+                "message": _("Notification queued. Recipients will receive it shortly."),
+                "html": render_wizard_html(request, offer),
+            })
 
         # --- DEFAULT: apply model transition for all other steps (REVIEW, APPROVE, SO_SEND, PAY_CREATE, ...) ---
         try:
             self._apply_step(offer, request.user, step)
+        except TransitionConflict as tc:
+            return JsonResponse({"ok": False, "conflict": True, "errors": tc.messages}, status=409)
         except ValidationError as ve:
             return JsonResponse({"ok": False, "errors": [str(e) for e in ve.error_list]}, status=400)
         except PermissionError as pe:
@@ -687,19 +773,12 @@ class OfferApprovalWizardActionView(BuyerRequiredMixin, PermissionRequiredMixin,
         except Exception as e:
             return JsonResponse({"ok": False, "errors": [str(e)]}, status=400)
 
-        # Re-render: wizard + timeline
-        ctx = build_wizard_context(request, offer)
-        wizard_html = render_to_string(
-            "dashboard/pages/buyers/wizard/partials/_offer_approval_wizard.html",
-            ctx,
-            request=request,
-        )
-        timeline_html = render_to_string(
-            "dashboard/pages/buyers/partials/timeline/_timeline_wrapper.html",
-            {"offer": offer},
-            request=request,
-        )
-        return JsonResponse({"ok": True, "html": wizard_html, "timeline_html": timeline_html})
+        # Re-render: wizard + timeline (la transición cambió `updated`: nueva clave de caché)
+        return JsonResponse({
+            "ok": True,
+            "html": render_wizard_html(request, offer),
+            "timeline_html": render_timeline_html(request, offer),
+        })
 
     # ---- Helpers de permisos y transición ----
 
@@ -716,64 +795,87 @@ class OfferApprovalWizardActionView(BuyerRequiredMixin, PermissionRequiredMixin,
 
     def _apply_step(self, offer: OfferModel, user, step: str):
         """
-        Mapea el 'step' pedido desde el front con la transición del modelo.
+        Mapea el 'step' pedido desde el front con la transición compare-and-set.
+        Lanza TransitionConflict si otra persona ya avanzó la orden.
         """
-        step = step.upper()
+        transition = get_transition(step)
+        self._require_perm(user, transition.permission)
+        offer._run_transition(transition.name, user)
 
-        if step == "REVIEW":
-            self._require_perm(user, "can_review_offer")
-            offer.reviewed = True
-            offer.reviewed_by = user
-            offer.save()
 
-        elif step == "APPROVE":
-            self._require_perm(user, "can_approve_offer")
-            offer.is_approved = True
-            offer.approved_by = user
-            offer.save()
+class OfferBulkTransitionView(BuyerRequiredMixin, PermissionRequiredMixin, View):
+    """
+    Aplica una transición a muchas órdenes a la vez.
 
-        elif step == "SO_SEND":
-            self._require_perm(user, "can_send_service_order")
-            offer.mark_service_order_sent(user)
+    POST: step=<nombre de la transición>, ids=<uuid> (repetible)
+    Respuesta: reporte por orden (ver BulkTransitionReport.as_dict).
+    """
+    http_method_names = ["post"]
+    permission_required = ("buyers.can_see_wizard_page",)
+    MAX_IDS = 1000
 
-        elif step == "PAY_CREATE":
-            self._require_perm(user, "can_create_payment_order")
-            offer.mark_payment_order_created(user)
+    def post(self, request, *args, **kwargs):
+        step = (request.POST.get("step") or "").strip().upper()
+        ids = request.POST.getlist("ids")
 
-        elif step == "PAY_SEND":
-            self._require_perm(user, "can_send_payment_order")
-            offer.mark_payment_order_sent(user)
+        if not ids:
+            return JsonResponse({"ok": False, "errors": [_("No purchase orders selected.")]}, status=400)
+        if len(ids) > self.MAX_IDS:
+            return JsonResponse(
+                {"ok": False, "errors": [_("Too many purchase orders in one request.")]}, status=400)
 
-        elif step == "POSSESSION":
-            self._require_perm(user, "can_set_asset_possession")
-            offer.mark_asset_in_possession(user)
+        try:
+            if not user_can_apply(request.user, step):
+                return JsonResponse(
+                    {"ok": False, "errors": [_("You don't have permission to perform this action.")]},
+                    status=403
+                )
+            report = apply_bulk_transition(ids, step, request.user)
+        except TransitionConflict as tc:
+            return JsonResponse({"ok": False, "conflict": True, "errors": tc.messages}, status=409)
+        except ValidationError as ve:
+            return JsonResponse({"ok": False, "errors": ve.messages}, status=400)
 
-        elif step == "ASSET_SEND":
-            self._require_perm(user, "can_send_asset")
-            offer.mark_asset_sent(user)
+        return JsonResponse({"ok": True, **report.as_dict()})
 
-        elif step == "PROFIT_CREATE":
-            self._require_perm(user, "can_set_profitability")
-            offer.mark_profitability_created(user)
 
-        elif step == "RRF_PAY":
-            self._require_perm(user, "recovery_repatriation_foundation_paid")
-            offer.mark_rrf_paid(user)
+class OfferDocumentDownloadView(BuyerRequiredMixin, View):
+    """
+    Descarga el PDF de la Orden de Compra (po) o de Servicio (so) desde la caché
+    de documentos; solo se genera si no existe uno con el contenido actual.
+    """
+    KINDS = {
+        "po": OfferDocumentCache.KindChoices.PURCHASE_ORDER,
+        "so": OfferDocumentCache.KindChoices.SERVICE_ORDER,
+    }
 
-        elif step == "AMPRO_PAY":
-            self._require_perm(user, "pay_master_service_paid")
-            offer.mark_paymaster_paid(user)
+    def get(self, request, *args, **kwargs):
+        kind = self.KINDS.get(kwargs.get("kind"))
+        if kind is None:
+            raise Http404
 
-        elif step == "PROP_PAY":
-            self._require_perm(user, "propensiones_paid")
-            offer.mark_prop_paid(user)
+        if kind == OfferDocumentCache.KindChoices.SERVICE_ORDER and not request.user.has_perm("buyers.can_see_wizard_page"):
+            return HttpResponse(status=403)
 
-        elif step == "PROFIT_PAY":
-            self._require_perm(user, "can_approve_pay_profitability")
-            offer.mark_profitability_paid(user)
+        offer = get_object_or_404(
+            OfferModel.objects.select_related("asset__asset_name", "created_by"),
+            id=kwargs.get("id"),
+        )
+        # La OC se imprime a nombre de quien la creó (igual que en el correo original)
+        user = offer.created_by if kind == OfferDocumentCache.KindChoices.PURCHASE_ORDER else request.user
 
-        else:
-            raise ValidationError(_("Unknown step."))
+        try:
+            entry = get_offer_document(kind, offer, user)
+        except PdfRenderError as e:
+            logger.warning(f"PDF download unavailable for {offer.id}: {e}")
+            return HttpResponse(_("The document is being generated, please try again in a moment."), status=503)
+
+        return FileResponse(
+            entry.file.open("rb"),
+            as_attachment=True,
+            filename=document_filename(kind, offer),
+            content_type="application/pdf",
+        )
 
 
 class ProfitabilityTemplateView(BuyerRequiredMixin, TemplateView):
@@ -787,120 +889,62 @@ class ProfitabilityTemplateView(BuyerRequiredMixin, TemplateView):
             profitability_created_at__isnull=False
         ).order_by('-created')
 
-        ctx['in_progress_value'] = OfferModel.objects.exclude(
-            recovery_repatriation_foundation_paid=True,
-            pay_master_service_paid=True,
-            propensiones_paid=True
-        ).count()
-
-        ctx['paid_value'] = OfferModel.objects.filter(
-            recovery_repatriation_foundation_paid=True,
-            pay_master_service_paid=True,
-            propensiones_paid=True
-        ).count()
+        # KPIs y barras desde el rollup mensual precalculado (OfferMonthlyRollup)
+        totals = OfferMonthlyRollup.objects.totals()
+        ctx['in_progress_value'] = totals['in_progress_count']
+        ctx['paid_value'] = totals['paid_count']
 
-        # === NUEVO: barras por mes (últimos 12 meses, incluyendo el mes actual) ===
-        tz_now = timezone.now()
+        # === Barras por mes (últimos 12 meses, incluyendo el mes actual) ===
+        tz_now = timezone.localtime()
         end_month = date(tz_now.year, tz_now.month, 1)
         start_month = (end_month - relativedelta(months=11))
+        rows = OfferMonthlyRollup.objects.window(start_month, end_month)
 
-        # Eje de meses normalizado
-        months = []
-        cursor = start_month
-        while cursor <= end_month:
-            months.append(cursor)
-            cursor = (cursor + relativedelta(months=1))
-
-        # Creadas por mes (por campo created)
-        created_qs = (
-            OfferModel.objects
-            .filter(created__date__gte=start_month, created__date__lt=end_month + relativedelta(months=1))
-            .annotate(m=TruncMonth('created'))
-            .values('m')
-            .annotate(c=Count('id'))
-        )
-        created_map = {row['m'].date(): row['c'] for row in created_qs}
-
-        # Cerradas por mes (por campo profitability_paid_at)
-        closed_qs = (
-            OfferModel.objects
-            .filter(
-                profitability_paid_at__isnull=False,
-                profitability_paid_at__date__gte=start_month,
-                profitability_paid_at__date__lt=end_month +
-                relativedelta(months=1),
-            )
-            .annotate(m=TruncMonth('profitability_paid_at'))
-            .values('m')
-            .annotate(c=Count('id'))
-        )
-        closed_map = {row['m'].date(): row['c'] for row in closed_qs}
-
-        labels = [m.strftime('%b %Y') for m in months]
-        created_counts = [created_map.get(m, 0) for m in months]
-        closed_counts = [closed_map.get(m, 0) for m in months]
+        labels = [row['month'].strftime('%b %Y') for row in rows]
+        created_counts = [row['created_count'] for row in rows]
+        closed_counts = [row['closed_count'] for row in rows]
 
         ctx['po_month_labels'] = labels
         ctx['po_created_counts'] = created_counts
         ctx['po_closed_counts'] = closed_counts
 
         # === Tabla de Activos con totales y tokens de filtro ===
+        # Una sola consulta: nombres localizados y totales por tipo resueltos en SQL
         lang = get_language()
         assets_qs = (
             AssetModel.objects
-            .select_related('asset_name', 'category')
+            .with_localized_names(lang)
+            .with_stock_totals()
+            .filter(stock_total__gt=0)
             .order_by('asset_name__es_name', 'asset_name__en_name')
+            .values(
+                'asset_img',
+                'display_name',
+                'display_category',
+                'display_description',
+                'display_observations',
+                'stock_boxes',
+                'stock_units',
+            )
         )
 
         asset_rows = []
         for a in assets_qs:
-            # Localización de nombres
-            if lang == 'es':
-                asset_name = a.asset_name.es_name or a.asset_name.en_name or ''
-                category_name = (getattr(a.category, 'es_name', None)
-                                 or getattr(a.category, 'en_name', '') or '')
-                observations = (getattr(a, 'es_observations', None)
-                                or getattr(a, 'en_observations', '') or '')
-                description = (getattr(a, 'es_description', None)
-                               or getattr(a, 'en_description', '') or '')
-            else:
-                asset_name = a.asset_name.en_name or a.asset_name.es_name or ''
-                category_name = (getattr(a.category, 'en_name', None)
-                                 or getattr(a.category, 'es_name', '') or '')
-                observations = (getattr(a, 'en_observations', None)
-                                or getattr(a, 'es_observations', '') or '')
-                description = (getattr(a, 'en_description', None)
-                               or getattr(a, 'es_description', '') or '')
-
-            # Totales por tipo (intenta con claves comunes: 'B'/'U' o 'boxes'/'units')
-            qty_by_type = a.asset_total_quantity_by_type() or {}
-
-            def pick(qmap, *keys, default=0):
-                for k in keys:
-                    if k in qmap and qmap[k] is not None:
-                        return qmap[k]
-                return default
-
-            total_boxes = pick(qty_by_type, "Boxes", "Box",
-                               "Cajas", "B", default=0)
-            total_units = pick(qty_by_type, "Units", "Unit",
-                               "Unidades", "U", default=0)
-
-            if (int(total_boxes) if total_boxes else 0) == 0 and (int(total_units) if total_units else 0) == 0:
-                continue
+            total_boxes = int(a['stock_boxes'] or 0)
+            total_units = int(a['stock_units'] or 0)
 
             # Tokens para filtros
-            zero_yes = (int(total_boxes) + int(total_units) == 0)
-            has_image = bool(getattr(a, 'asset_img', None))
+            zero_yes = (total_boxes + total_units == 0)
+            has_image = bool(a['asset_img'])
 
             qty_tokens = []
 
             qty_tokens.append(
                 'zero:yes') if zero_yes else qty_tokens.append('zero:no')
 
-            if int(total_units) > 0:
+            if total_units > 0:
                 qty_tokens.append('qty:U')
-            if int(total_boxes) > 0:
+            if total_boxes > 0:
                 qty_tokens.append('qty:B')
 
             # Si no hay stock en ningún tipo, deja sin qty:* (los filtros funcionarán por zero:yes)
@@ -911,12 +955,12 @@ class ProfitabilityTemplateView(BuyerRequiredMixin, TemplateView):
             ]
 
             asset_rows.append({
-                'name': asset_name,
-                'category': category_name,
+                'name': a['display_name'],
+                'category': a['display_category'],
                 'total_boxes': total_boxes,
                 'total_units': total_units,
-                'observations': observations,
-                'description': description,
+                'observations': a['display_observations'],
+                'description': a['display_description'],
                 'tokens': tokens,
             })
 
@@ -935,58 +979,44 @@ class InventoryTemplateView(BuyerRequiredMixin, TemplateView):
         lang = get_language() or 'en'
 
         # ===== Inventario por activo =====
+        # Una sola consulta: nombres localizados y totales por tipo resueltos en SQL
         assets_qs = (
             AssetModel.objects
-            .select_related('asset_name', 'category')
+            .with_localized_names(lang)
+            .with_stock_totals()
             .order_by('asset_name__es_name', 'asset_name__en_name')
+            .values(
+                'display_name',
+                'display_category',
+                'display_description',
+                'stock_boxes',
+                'stock_units',
+                'stock_total',
+            )
         )
 
         asset_rows = []
         for a in assets_qs:
-            # nombres/descr según idioma
-            if lang.startswith('es'):
-                asset_name = (
-                    a.asset_name.es_name or a.asset_name.en_name or '').strip()
-                category_name = (getattr(a.category, 'es_name', None) or getattr(
-                    a.category, 'en_name', '') or '').strip()
-                description = (getattr(a, 'es_description', None) or getattr(
-                    a, 'en_description', '') or '').strip()
-            else:
-                asset_name = (
-                    a.asset_name.en_name or a.asset_name.es_name or '').strip()
-                category_name = (getattr(a.category, 'en_name', None) or getattr(
-                    a.category, 'es_name', '') or '').strip()
-                description = (getattr(a, 'en_description', None) or getattr(
-                    a, 'es_description', '') or '').strip()
-
-            qty_by_type = a.asset_total_quantity_by_type() or {}
-            # intenta mapear ambas variantes
-            total_boxes = int(qty_by_type.get('Boxes') or qty_by_type.get(
-                'Box') or qty_by_type.get('Cajas') or qty_by_type.get('B') or 0)
-            total_units = int(qty_by_type.get('Units') or qty_by_type.get(
-                'Unit') or qty_by_type.get('Unidades') or qty_by_type.get('U') or 0)
-            total_all = total_boxes + total_units
-
             # opcional: omitir activos sin stock
-            # if total_all == 0:
+            # if not a['stock_total']:
             #     continue
 
             asset_rows.append({
-                'name': asset_name,
-                'category': category_name,
-                'total': total_all,
-                'boxes': total_boxes,
-                'units': total_units,
-                'description': description,
+                'name': a['display_name'].strip(),
+                'category': a['display_category'].strip(),
+                'total': int(a['stock_total'] or 0),
+                'boxes': int(a['stock_boxes'] or 0),
+                'units': int(a['stock_units'] or 0),
+                'description': a['display_description'].strip(),
             })
 
         ctx['asset_rows'] = asset_rows
 
         # ===== Inventario por categoría (suma de todas las cantidades) =====
-        # Sumamos "amount" de AssetLocationModel agrupando por categoría
+        # Sumamos los totales de AssetStockSnapshot agrupando por categoría
         cat_qs = (
-            AssetLocationModel.objects.filter(
-                is_active=True, asset__is_active=True)
+            AssetStockSnapshot.objects.filter(asset__is_active=True)
+            .exclude(total=0)
             .values(
                 'asset__category',
                 'asset__category__es_name',
@@ -994,7 +1024,7 @@ class InventoryTemplateView(BuyerRequiredMixin, TemplateView):
                 'asset__category__es_description',
                 'asset__category__en_description',
             )
-            .annotate(total_qty=Coalesce(Sum('amount'), 0))
+            .annotate(total_qty=Coalesce(Sum('total'), 0))
             .order_by('asset__category__es_name', 'asset__category__en_name')
         )
 
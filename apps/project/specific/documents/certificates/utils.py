@@ -3,11 +3,12 @@
 from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.http import HttpRequest
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from apps.common.utils.outbox import queue_email
 from apps.project.common.users.models import UserModel
 
 from .functions import get_client_ip
@@ -120,10 +121,14 @@ def send_otp_email(email: str, otp: str) -> None:
         'This code expires in 10 minutes.'
     ).format(otp=otp)
 
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[email],
-        fail_silently=False,
+    # Se entrega desde la bandeja de salida (manage.py send_outbox)
+    queue_email(
+        EmailMessage(
+            subject=subject,
+            body=message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email],
+        ),
+        idempotency_key=f"certificates-otp:{email}:{otp}:{timezone.now():%Y%m%d%H%M}",
+        category="certificates.otp",
     )
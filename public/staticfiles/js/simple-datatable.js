@@ -1,10 +1,8 @@
 window.addEventListener('DOMContentLoaded', event => {
     const tableIds = [
         'profitability_po_table',
-        'offers_table',
         'locations_table',
         'asset_and_category_table',
-        'offers_table',
         'categories_table',
         'assetinline_table',
         'tblByCategory',